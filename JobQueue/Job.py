@@ -0,0 +1,64 @@
+from dataclasses import dataclass, field, asdict
+from typing import List, Dict, Any, Optional
+import time
+import uuid
+
+# ---------- Job ----------
+SCRAPE = "scrape"
+BACKFILL = "backfill"
+BATCH = "batch"
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+@dataclass
+class Job:
+    token: str
+    kind: str = SCRAPE
+    options: Dict[str, Any] = field(default_factory=dict)
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    timings: List[Dict[str, Any]] = field(default_factory=list)
+    tokens: List[str] = field(default_factory=list)  # BATCH jobs only
+    accounts: int = 0  # BATCH jobs only: len(tokens), kept once the tokens are dropped
+    results: List[Dict[str, Any]] = field(default_factory=list)  # per-token results of a BATCH job, as they complete
+    correlation_id: Optional[str] = None  # id of the request that queued the job, carried into the worker's logs
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    def drop_credentials(self) -> None:
+        """Forgets the app tokens; called once the job is finished, before it is stored for result_ttl."""
+        self.token = ""
+        self.tokens = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def to_public_dict(self) -> Dict[str, Any]:
+        """Job status as exposed over the API (never leaks the app tokens)."""
+        data = self.to_dict()
+        data.pop("token", None)
+        tokens = data.pop("tokens", None)
+        accounts = data.pop("accounts", 0)
+        if self.kind != BATCH:
+            data.pop("results", None)
+        else:
+            data["progress"] = {
+                "total": accounts or len(tokens),
+                "completed": len(self.results),
+                "failed": sum(1 for result in self.results if result["status"] == FAILED),
+            }
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        return cls(**data)
@@ -0,0 +1,109 @@
+from typing import List, Optional
+import asyncio
+import time
+from Orchestrator import Orchestrator, BatchOrchestrator
+from config.Config import BATCH_PROGRESS_INTERVAL
+from utils.Logging import get_logger, correlation_id
+from utils.Metrics import JOBS, JOB_SECONDS
+from .Job import Job, SCRAPE, BACKFILL, BATCH, RUNNING, SUCCEEDED, FAILED
+from .JobQueueBackend import JobQueueBackend
+
+logger = get_logger("JobManager")
+
+
+# ---------- Job Manager ----------
+class JobManager:
+    """Runs queued Orchestrator jobs on a bounded pool of asyncio workers."""
+
+    def __init__(self, backend: JobQueueBackend, workers: int):
+        self._backend = backend
+        self._worker_count = workers
+        self._workers: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        logger.info("Starting workers", extra={"workers": self._worker_count})
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self._worker_count)]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        await self._backend.close()
+
+    async def submit(self, token: str, kind: str = SCRAPE, **options) -> Job:
+        """Queues a job; `options` are forwarded to the Orchestrator method matching `kind`."""
+        job = Job(token=token, kind=kind, options=options, correlation_id=correlation_id.get())
+        await self._backend.enqueue(job)
+        logger.info("Queued job", extra={"job_id": job.id, "kind": kind})
+        return job
+
+    async def submit_batch(self, tokens: List[str], **options) -> Job:
+        """Queues one job that scrapes every account in `tokens`; `options` go to BatchOrchestrator.run_async."""
+        job = Job(token="", kind=BATCH, options=options, tokens=tokens, accounts=len(tokens),
+                  correlation_id=correlation_id.get())
+        await self._backend.enqueue(job)
+        logger.info("Queued batch job", extra={"job_id": job.id, "accounts": len(tokens)})
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return await self._backend.get(job_id)
+
+    async def depth(self) -> int:
+        return await self._backend.depth()
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._backend.dequeue()
+            await self._run_job(job)
+
+    async def _run_job(self, job: Job) -> None:
+        # Everything the job logs carries the id of the request that queued it (or the job id for scheduled runs).
+        context = correlation_id.set(job.correlation_id or job.id)
+        job.status = RUNNING
+        job.started_at = time.time()
+        await self._backend.save(job)
+
+        try:
+            if job.kind == BATCH:
+                await self._run_batch(job)
+            else:
+                orchestrator = await Orchestrator.Orchestrator.create(token=job.token)
+                if job.kind == BACKFILL:
+                    job.timings = await orchestrator.backfill_async(**job.options)
+                else:
+                    job.timings = await orchestrator.run_async(**job.options)
+            job.status = SUCCEEDED
+        except asyncio.CancelledError:
+            job.status = FAILED
+            job.error = "Job cancelled during shutdown"
+            raise
+        except Exception as e:
+            logger.warning("Job failed", extra={"job_id": job.id, "kind": job.kind, "error": str(e)})
+            job.status = FAILED
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            JOBS.labels(job.kind, job.status).inc()
+            JOB_SECONDS.labels(job.kind, job.status).observe(job.finished_at - job.started_at)
+            # The result outlives the run by JOB_RESULT_TTL; the app tokens must not.
+            job.drop_credentials()
+            await self._backend.save(job)
+            correlation_id.reset(context)
+
+    async def _run_batch(self, job: Job) -> None:
+        """Runs a batch job, saving its results at most every BATCH_PROGRESS_INTERVAL so pollers see progress."""
+        job.results = []
+        last_saved = time.monotonic()
+
+        async def on_result(result) -> None:
+            nonlocal last_saved
+            job.results.append(result)
+            if time.monotonic() - last_saved >= BATCH_PROGRESS_INTERVAL:
+                last_saved = time.monotonic()
+                await self._backend.save(job)
+
+        await BatchOrchestrator.BatchOrchestrator(job.tokens, on_result=on_result).run_async(**job.options)
+        failed = sum(1 for result in job.results if result["status"] == FAILED)
+        if failed:
+            job.error = f"{failed}/{job.accounts} accounts failed"
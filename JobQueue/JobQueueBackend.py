@@ -0,0 +1,124 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+import asyncio
+import json
+import time
+from exceptions.exceptions import QueueFullError
+from .Job import Job
+
+# ----- Job Queue Backend Abstraction -----
+class JobQueueBackend(ABC):
+    @abstractmethod
+    async def enqueue(self, job: Job) -> None:
+        """Stores and queues a job. Raises QueueFullError when the queue is at capacity."""
+
+    @abstractmethod
+    async def dequeue(self) -> Job:
+        """Blocks until a job is available and returns it."""
+
+    @abstractmethod
+    async def save(self, job: Job) -> None: ...
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[Job]: ...
+
+    @abstractmethod
+    async def depth(self) -> int: ...
+
+    async def close(self) -> None:
+        pass
+
+
+# ---------- In-Memory Backend ----------
+class InMemoryJobQueueBackend(JobQueueBackend):
+    """Single-process queue. Finished jobs are kept for result_ttl seconds."""
+
+    def __init__(self, max_size: int, result_ttl: int):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self._jobs: Dict[str, Job] = {}
+        # (expires_at, job_id) of finished jobs. The TTL is fixed, so appending as jobs finish keeps it sorted
+        # and eviction only ever looks at the head.
+        self._expiry: Deque[Tuple[float, str]] = deque()
+        self._result_ttl = result_ttl
+
+    async def enqueue(self, job: Job) -> None:
+        try:
+            self._queue.put_nowait(job.id)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"Job queue is full ({self._queue.maxsize} pending jobs)")
+        self._jobs[job.id] = job
+        self._evict_expired()
+
+    async def dequeue(self) -> Job:
+        while True:
+            job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return job
+
+    async def save(self, job: Job) -> None:
+        self._jobs[job.id] = job
+        if job.is_finished:
+            self._expiry.append(((job.finished_at or time.time()) + self._result_ttl, job.id))
+            self._evict_expired()
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def depth(self) -> int:
+        return self._queue.qsize()
+
+    def _evict_expired(self) -> None:
+        now = time.time()
+        while self._expiry and self._expiry[0][0] <= now:
+            _, job_id = self._expiry.popleft()
+            job = self._jobs.get(job_id)
+            if job is not None and job.is_finished:
+                del self._jobs[job_id]
+
+
+# ---------- Redis Backend ----------
+class RedisJobQueueBackend(JobQueueBackend):
+    """Queue shared by several API replicas. Requires the optional `redis` package."""
+
+    QUEUE_KEY = "scrapper:jobs:queue"
+    JOB_KEY = "scrapper:jobs:{}"
+
+    def __init__(self, url: str, max_size: int, result_ttl: int):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError:
+            raise ImportError("JOB_QUEUE_BACKEND=redis requires the 'redis' package (pip install redis)")
+
+        self._redis = redis_asyncio.from_url(url, decode_responses=True)
+        self._max_size = max_size
+        self._result_ttl = result_ttl
+
+    async def enqueue(self, job: Job) -> None:
+        # Best-effort bound: replicas may race past max_size by a few jobs.
+        if await self._redis.llen(self.QUEUE_KEY) >= self._max_size:
+            raise QueueFullError(f"Job queue is full ({self._max_size} pending jobs)")
+        await self.save(job)
+        await self._redis.lpush(self.QUEUE_KEY, job.id)
+
+    async def dequeue(self) -> Job:
+        while True:
+            _, job_id = await self._redis.brpop(self.QUEUE_KEY)
+            job = await self.get(job_id)
+            if job is not None:
+                return job
+
+    async def save(self, job: Job) -> None:
+        ttl = self._result_ttl if job.is_finished else None
+        await self._redis.set(self.JOB_KEY.format(job.id), json.dumps(job.to_dict()), ex=ttl)
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        raw = await self._redis.get(self.JOB_KEY.format(job_id))
+        return Job.from_dict(json.loads(raw)) if raw else None
+
+    async def depth(self) -> int:
+        return await self._redis.llen(self.QUEUE_KEY)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
@@ -0,0 +1,14 @@
+from .Job import Job, SCRAPE, BACKFILL, BATCH
+from .JobQueueBackend import JobQueueBackend, InMemoryJobQueueBackend, RedisJobQueueBackend
+from .JobManager import JobManager
+from config.Config import JOB_QUEUE_BACKEND, JOB_QUEUE_MAX_SIZE, JOB_RESULT_TTL, REDIS_URL
+
+
+def build_backend() -> JobQueueBackend:
+    match(JOB_QUEUE_BACKEND):
+        case "memory":
+            return InMemoryJobQueueBackend(max_size=JOB_QUEUE_MAX_SIZE, result_ttl=JOB_RESULT_TTL)
+        case "redis":
+            return RedisJobQueueBackend(url=REDIS_URL, max_size=JOB_QUEUE_MAX_SIZE, result_ttl=JOB_RESULT_TTL)
+        case _:
+            raise ValueError(f"Unknown JOB_QUEUE_BACKEND: {JOB_QUEUE_BACKEND}")
\ No newline at end of file
@@ -0,0 +1,91 @@
+from collections import defaultdict
+from typing import List, Dict, Any, Awaitable, Callable, Optional, Tuple
+import asyncio
+import time
+from config.Config import BATCH_RESOLVE_CONCURRENCY, BATCH_CONCURRENCY, BATCH_CONCURRENCY_DEFAULT
+from utils.UserDetailsCache import user_details_cache
+from utils.Logging import get_logger
+from .Orchestrator import Orchestrator
+
+ResultCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+logger = get_logger("BatchOrchestrator")
+
+
+# ---------- Batch Orchestrator ----------
+class BatchOrchestrator:
+    """
+    Scrapes many accounts in one pass. Every token is resolved up front through the user details cache,
+    then the accounts are grouped by provider and each group runs under its own concurrency cap
+    (BATCH_CONCURRENCY), so a large Facebook backlog never holds Twitter accounts back.
+
+    Results carry the token's position in the submitted list, never the token itself.
+    """
+
+    def __init__(self, tokens: List[str], on_result: Optional[ResultCallback] = None):
+        self._tokens = tokens
+        self._on_result = on_result
+        self._results: List[Dict[str, Any]] = []
+
+    async def run_async(self, incremental: bool = True) -> List[Dict[str, Any]]:
+        """Scrapes every account and returns the per-token results in completion order."""
+        logger.info("Resolving accounts", extra={"accounts": len(self._tokens)})
+        resolve_limit = asyncio.Semaphore(BATCH_RESOLVE_CONCURRENCY)
+        resolved = await asyncio.gather(
+            *(self._resolve(index, token, resolve_limit) for index, token in enumerate(self._tokens))
+        )
+
+        groups: Dict[str, List[Tuple[int, str, Dict[str, Any]]]] = defaultdict(list)
+        for account in resolved:
+            if account is not None:
+                groups[account[2]["provider"]].append(account)
+
+        logger.info("Scraping accounts", extra={"providers": {p: len(a) for p, a in groups.items()}})
+        await asyncio.gather(*(self._run_group(provider, accounts, incremental) for provider, accounts in groups.items()))
+
+        failed = sum(1 for result in self._results if result["status"] != "succeeded")
+        logger.info("Batch complete", extra={"succeeded": len(self._results) - failed, "failed": failed})
+        return self._results
+
+    # ---------- Private Helpers ----------
+    async def _resolve(self, index: int, token: str,
+                       limit: asyncio.Semaphore) -> Optional[Tuple[int, str, Dict[str, Any]]]:
+        started = time.perf_counter()
+        try:
+            async with limit:
+                details = await user_details_cache.get_or_fetch(token, Orchestrator._get_user_details)
+            return index, token, details
+        except Exception as e:
+            await self._report(index, None, started, error=str(e))
+            return None
+
+    async def _run_group(self, provider: str, accounts: List[Tuple[int, str, Dict[str, Any]]], incremental: bool) -> None:
+        limit = asyncio.Semaphore(BATCH_CONCURRENCY.get(provider, BATCH_CONCURRENCY_DEFAULT))
+
+        async def run_account(index: int, token: str, details: Dict[str, Any]) -> None:
+            async with limit:
+                started = time.perf_counter()
+                try:
+                    orchestrator = Orchestrator(token=token, user_details=details)
+                    timings = await orchestrator.run_async(incremental=incremental)
+                except Exception as e:
+                    logger.warning("Account failed", extra={"index": index, "provider": provider, "error": str(e)})
+                    await self._report(index, provider, started, error=str(e))
+                    return
+                await self._report(index, provider, started, timings=timings)
+
+        await asyncio.gather(*(run_account(*account) for account in accounts))
+
+    async def _report(self, index: int, provider: Optional[str], started: float,
+                      timings: Optional[List[Dict[str, Any]]] = None, error: Optional[str] = None) -> None:
+        result = {
+            "index": index,
+            "provider": provider,
+            "status": "failed" if error else "succeeded",
+            "error": error,
+            "timings": timings or [],
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        self._results.append(result)
+        if self._on_result is not None:
+            await self._on_result(result)
@@ -1,26 +1,71 @@
-from Scrapper import Scrapper
-from typing import List
+from typing import List, Dict, Any, Awaitable, Optional
 from config.Config import SOCIAL_AUTHENTICATOR_URL
-from SocialMediaScrapper import FacebookScrapper, TwitterScrapper, InstagramScrapper
-import requests
+from SocialMediaScrapper import SocialMediaScrapperBase, SCRAPPERS, get_scrapper_class
+from utils.HttpClient import run_sync
+from utils.RateLimiter import rate_limiter
+from utils.UserDetailsCache import user_details_cache
+from exceptions.exceptions import AuthenticationError, DependencyUnavailableError
+from utils.CheckpointStore import get_checkpoint_store
+from utils.Logging import get_logger
+from utils.Metrics import timed
+import httpx
+
+logger = get_logger("Orchestrator")
+
 
 # ---------- Orchestrator ----------
 class Orchestrator:
-    def __init__(self, token: str):
-        self.scrappers: List[Scrapper] = []
-        self._user_details = self._get_user_details(app_token=token)
+    def __init__(self, token: str, user_details: Optional[Dict[str, Any]] = None):
+        self.scrappers: List[SocialMediaScrapperBase] = []
+        self._token = token
+        if user_details is None:
+            user_details = run_sync(user_details_cache.get_or_fetch(token, self._get_user_details))
+        self._user_details = user_details
         self._init_scrappers(self._user_details, token)
 
-    def run(self):
-        print("[Orchestrator] Starting scraping workflow...")
+    @classmethod
+    async def create(cls, token: str) -> "Orchestrator":
+        """Builds an Orchestrator without blocking the running event loop."""
+        user_details = await user_details_cache.get_or_fetch(token, cls._get_user_details)
+        return cls(token=token, user_details=user_details)
+
+    def run(self, incremental: bool = True):
+        run_sync(self.run_async(incremental=incremental))
+
+    async def run_async(self, incremental: bool = True) -> List[Dict[str, Any]]:
+        """Runs every scrapper and returns per-scrapper timings."""
+        logger.info("Starting scraping workflow", extra={"scrappers": len(self.scrappers)})
+        timings = []
         for scrapper in self.scrappers:
-            print(f"[Orchestrator] Using {scrapper.__class__.__name__}...")
-            raw_data = scrapper.fetch_data()
-            print(f"[Orchestrator] Received raw data of length {len(raw_data)}")
-            scrapper.parse_data(raw_data)
-        print("[Orchestrator] Workflow complete!")
+            stats = await self._evict_on_auth_error(scrapper.scrape_async(incremental=incremental))
+            logger.info("Scrapper finished", extra={"scrapper": scrapper.__class__.__name__, "items": stats["items"],
+                                                    "batches": stats["batches"], "skipped": stats["skipped"]})
+            timings.append({"scrapper": scrapper.__class__.__name__, **stats})
+        logger.info("Workflow complete")
+        return timings
 
-    def _get_user_details(self, app_token: str):
+    async def backfill_async(self, **options) -> List[Dict[str, Any]]:
+        """Runs a full-history backfill on every scrapper and returns per-scrapper timings."""
+        logger.info("Starting backfill workflow", extra={"scrappers": len(self.scrappers)})
+        timings = []
+        for scrapper in self.scrappers:
+            stats = await self._evict_on_auth_error(scrapper.backfill_async(**options))
+            logger.info("Backfill finished", extra={"scrapper": scrapper.__class__.__name__, "items": stats["items"]})
+            timings.append({"scrapper": scrapper.__class__.__name__, **stats})
+        logger.info("Backfill complete")
+        return timings
+
+    async def _evict_on_auth_error(self, work: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+        """A platform rejecting the social token means the cached user details are stale."""
+        try:
+            return await work
+        except AuthenticationError:
+            logger.warning("Social token rejected, evicting cached user details")
+            await user_details_cache.invalidate(self._token)
+            raise
+
+    @staticmethod
+    async def _get_user_details(app_token: str):
         """
         Fetches user details from the social authenticator service using the given app token.
         Returns normalized user details with only the relevant fields.
@@ -29,10 +74,10 @@ class Orchestrator:
             url = f"{SOCIAL_AUTHENTICATOR_URL.rstrip('/')}/get_user"
             headers = {"Authorization": f"Bearer {app_token}"}
 
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-
-            data = response.json()
+            with timed("user_details", "authenticator"):
+                response = await rate_limiter.request("authenticator", "GET", url, headers=headers)
+                response.raise_for_status()
+                data = response.json()
             claims = data.get("claims", {})
 
             normalized_details = {
@@ -41,12 +86,15 @@ class Orchestrator:
                 "social_token": claims.get("social_token"),
                 "name": claims.get("name"),
                 "email": claims.get("email"),
+                "expires_at": claims.get("exp"),
             }
 
-            print(f"[Orchestrator] Retrieved user details for provider: {normalized_details['provider']}")
+            logger.info("Retrieved user details", extra={"provider": normalized_details["provider"]})
             return normalized_details
 
-        except requests.exceptions.RequestException as e:
+        except DependencyUnavailableError:
+            raise
+        except httpx.HTTPError as e:
             raise Exception(f"Failed to fetch user details: {e}")
         except Exception as e:
             raise Exception(f"Error while processing user details: {e}")
@@ -57,13 +105,9 @@ class Orchestrator:
         social_token = user_details["social_token"]
         name = user_details["name"]
         email = user_details["email"]
+        checkpoint_store = get_checkpoint_store()
 
-        match(provider):
-            case "facebook":
-                self.scrappers.append(FacebookScrapper(app_token=app_token, client_token=social_token, social_id=social_id, name=name, email=email))
-            case "twitter":
-                self.scrappers.append(TwitterScrapper(app_token=app_token, client_token=social_token, social_id=social_id, name=name, email=email))
-            case "instagram":
-                self.scrappers.append(InstagramScrapper(app_token=app_token, client_token=social_token, social_id=social_id, name=name, email=email))
-            case _:
-                raise Exception(f"Error: Provider not found")
+        if provider not in SCRAPPERS:
+            raise Exception(f"Error: Provider not found")
+        scrapper_class = get_scrapper_class(provider)
+        self.scrappers.append(scrapper_class(app_token=app_token, client_token=social_token, social_id=social_id, name=name, email=email, checkpoint_store=checkpoint_store))
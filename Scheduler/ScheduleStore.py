@@ -0,0 +1,132 @@
+from typing import List, Dict, Any, Optional
+import os
+import random
+import sqlite3
+import threading
+import time
+
+_COLUMNS = ("id", "token", "provider", "interval", "next_run_at", "job_id", "lease_until", "last_run_at",
+            "last_status", "last_error", "last_items", "activity", "idle_runs", "created_at")
+
+
+# ---------- Schedule Store ----------
+class ScheduleStore:
+    """
+    Persistent per-account schedules and last-run state, backed by SQLite.
+    A schedule with a `job_id` has a run in flight; `lease_until` bounds how long that claim holds.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS schedules ("
+            " id TEXT PRIMARY KEY,"
+            " token TEXT NOT NULL,"
+            " provider TEXT NOT NULL,"
+            " interval REAL NOT NULL,"
+            " next_run_at REAL NOT NULL,"
+            " job_id TEXT,"
+            " lease_until REAL,"
+            " last_run_at REAL,"
+            " last_status TEXT,"
+            " last_error TEXT,"
+            " last_items INTEGER NOT NULL DEFAULT 0,"
+            " activity REAL NOT NULL DEFAULT 0,"
+            " idle_runs INTEGER NOT NULL DEFAULT 0,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS schedules_due ON schedules (next_run_at)")
+        self._conn.commit()
+
+    def upsert(self, schedule_id: str, token: str, provider: str, interval: float, next_run_at: float) -> Dict[str, Any]:
+        """Creates a schedule, or changes the interval of an existing one (keeping its run history)."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO schedules (id, token, provider, interval, next_run_at, created_at) VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (id) DO UPDATE SET token = excluded.token, provider = excluded.provider,"
+                " interval = excluded.interval",
+                (schedule_id, token, provider, interval, next_run_at, time.time()),
+            )
+            self._conn.commit()
+            return self._get(schedule_id)
+
+    def get(self, schedule_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._get(schedule_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM schedules ORDER BY next_run_at").fetchall()
+        return [dict(zip(_COLUMNS, row)) for row in rows]
+
+    def delete(self, schedule_id: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM schedules WHERE id = ?", (schedule_id,))
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def due(self, now: float, limit: int) -> List[Dict[str, Any]]:
+        """Idle schedules whose next run is due, most active accounts first."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM schedules WHERE job_id IS NULL AND next_run_at <= ?"
+                " ORDER BY activity DESC, next_run_at LIMIT ?",
+                (now, limit),
+            ).fetchall()
+        return [dict(zip(_COLUMNS, row)) for row in rows]
+
+    def in_flight(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM schedules WHERE job_id IS NOT NULL"
+            ).fetchall()
+        return [dict(zip(_COLUMNS, row)) for row in rows]
+
+    def mark_dispatched(self, schedule_id: str, job_id: str, lease_until: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE schedules SET job_id = ?, lease_until = ? WHERE id = ?", (job_id, lease_until, schedule_id)
+            )
+            self._conn.commit()
+
+    def postpone(self, schedule_id: str, next_run_at: float) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE schedules SET next_run_at = ? WHERE id = ?", (next_run_at, schedule_id))
+            self._conn.commit()
+
+    def complete(self, schedule_id: str, status: str, error: Optional[str], items: int, activity: float,
+                 idle_runs: int, next_run_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE schedules SET job_id = NULL, lease_until = NULL, last_run_at = ?, last_status = ?,"
+                " last_error = ?, last_items = ?, activity = ?, idle_runs = ?, next_run_at = ? WHERE id = ?",
+                (time.time(), status, error, items, activity, idle_runs, next_run_at, schedule_id),
+            )
+            self._conn.commit()
+
+    def spread_overdue(self, now: float, spread: float) -> int:
+        """Moves idle schedules that came due while the service was down to random slots in the next `spread` seconds."""
+        with self._lock:
+            ids = [row[0] for row in self._conn.execute(
+                "SELECT id FROM schedules WHERE job_id IS NULL AND next_run_at < ?", (now,)
+            ).fetchall()]
+            self._conn.executemany(
+                "UPDATE schedules SET next_run_at = ? WHERE id = ?",
+                [(now + random.uniform(0, spread), schedule_id) for schedule_id in ids],
+            )
+            self._conn.commit()
+        return len(ids)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _get(self, schedule_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM schedules WHERE id = ?", (schedule_id,)).fetchone()
+        return dict(zip(_COLUMNS, row)) if row else None
@@ -0,0 +1,170 @@
+from collections import defaultdict
+from typing import List, Dict, Any, Optional
+import asyncio
+import hashlib
+import random
+import time
+from config.Config import (
+    SCHEDULE_DEFAULT_INTERVAL,
+    SCHEDULE_MIN_INTERVAL,
+    SCHEDULE_MAX_INTERVAL,
+    SCHEDULE_JITTER,
+    SCHEDULE_TICK,
+    SCHEDULE_BATCH,
+    SCHEDULE_STARTUP_SPREAD,
+    SCHEDULE_LEASE,
+    SCHEDULE_DISPATCH_PER_MINUTE,
+    SCHEDULE_DISPATCH_PER_MINUTE_DEFAULT,
+)
+from exceptions.exceptions import ScraperError, QueueFullError, DependencyUnavailableError
+from JobQueue import JobManager
+from JobQueue.Job import FAILED
+from Orchestrator import Orchestrator
+from utils.CircuitBreaker import get_dependency
+from utils.Logging import get_logger
+from utils.RateLimiter import TokenBucket
+from utils.UserDetailsCache import user_details_cache
+from .ScheduleStore import ScheduleStore
+
+logger = get_logger("Scheduler")
+
+# Weight of the previous activity score in the moving average of new posts per run.
+ACTIVITY_DECAY = 0.5
+# Consecutive runs without new posts double the interval up to this many times.
+MAX_IDLE_DOUBLINGS = 6
+
+
+def next_interval(base: float, activity: float, idle_runs: int) -> float:
+    """Active accounts (many new posts per run) come back sooner; dormant ones back off exponentially."""
+    interval = base * (2 ** min(idle_runs, MAX_IDLE_DOUBLINGS)) / (1.0 + activity)
+    return min(max(interval, SCHEDULE_MIN_INTERVAL), SCHEDULE_MAX_INTERVAL)
+
+
+def _jittered(seconds: float) -> float:
+    return seconds * random.uniform(1.0 - SCHEDULE_JITTER, 1.0 + SCHEDULE_JITTER)
+
+
+# ---------- Scheduler ----------
+class Scheduler:
+    """
+    Background task that queues an incremental scrape per scheduled account through the JobManager.
+
+    Due accounts are dispatched most-active first, paced per provider (SCHEDULE_DISPATCH_PER_MINUTE)
+    so runs spread evenly instead of bursting at the top of the minute. Schedules and run state live
+    in a ScheduleStore; runs that came due while the service was down are spread over
+    SCHEDULE_STARTUP_SPREAD seconds on start.
+    """
+
+    def __init__(self, store: ScheduleStore, job_manager: JobManager):
+        self._store = store
+        self._jobs = job_manager
+        self._pacers: Dict[str, TokenBucket] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        spread = await asyncio.to_thread(self._store.spread_overdue, time.time(), SCHEDULE_STARTUP_SPREAD)
+        logger.info("Starting", extra={"overdue_spread": spread, "spread_seconds": SCHEDULE_STARTUP_SPREAD})
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def add(self, token: str, interval: Optional[float] = None) -> Dict[str, Any]:
+        """Schedules (or reschedules) an account; its first run is due right away."""
+        try:
+            details = await user_details_cache.get_or_fetch(token, Orchestrator.Orchestrator._get_user_details)
+        except DependencyUnavailableError:
+            raise
+        except Exception as e:
+            raise ScraperError(f"Could not resolve the account to schedule: {e}")
+        schedule_id = hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+        row = await asyncio.to_thread(
+            self._store.upsert, schedule_id, token, details["provider"], interval or SCHEDULE_DEFAULT_INTERVAL, time.time()
+        )
+        logger.info("Scheduled account", extra={"provider": details["provider"], "schedule_id": schedule_id})
+        return self._public(row)
+
+    async def remove(self, schedule_id: str) -> bool:
+        return await asyncio.to_thread(self._store.delete, schedule_id)
+
+    async def list(self) -> List[Dict[str, Any]]:
+        return [self._public(row) for row in await asyncio.to_thread(self._store.list)]
+
+    async def tick_once(self) -> int:
+        """Records finished runs, then dispatches due ones; returns how many runs were queued."""
+        await self._reconcile()
+        due = await asyncio.to_thread(self._store.due, time.time(), SCHEDULE_BATCH)
+        by_provider: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for row in due:
+            by_provider[row["provider"]].append(row)
+        dispatched = await asyncio.gather(*(self._dispatch(provider, rows) for provider, rows in by_provider.items()))
+        return sum(dispatched)
+
+    # ---------- Private Helpers ----------
+    async def _run(self) -> None:
+        while True:
+            started = time.monotonic()
+            try:
+                dispatched = await self.tick_once()
+                if dispatched:
+                    logger.info("Queued scheduled runs", extra={"dispatched": dispatched})
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("Tick failed", extra={"error": str(e)})
+            await asyncio.sleep(max(0.0, SCHEDULE_TICK - (time.monotonic() - started)))
+
+    async def _dispatch(self, provider: str, rows: List[Dict[str, Any]]) -> int:
+        """Queues at most one tick's worth of the provider's dispatch budget, evenly paced."""
+        if get_dependency(provider).breaker.is_open:
+            # The runs would fail fast anyway; they stay due until the platform recovers.
+            return 0
+        per_second = SCHEDULE_DISPATCH_PER_MINUTE.get(provider, SCHEDULE_DISPATCH_PER_MINUTE_DEFAULT) / 60.0
+        pacer = self._pacers.get(provider)
+        if pacer is None:
+            pacer = self._pacers[provider] = TokenBucket(per_second, 1)
+
+        dispatched = 0
+        for row in rows[:max(1, int(per_second * SCHEDULE_TICK))]:
+            await pacer.acquire()
+            try:
+                job = await self._jobs.submit(token=row["token"], incremental=True)
+            except QueueFullError:
+                # The queue is saturated; leave the rest due and retry a little later.
+                await asyncio.to_thread(self._store.postpone, row["id"], time.time() + _jittered(SCHEDULE_TICK * 2))
+                break
+            await asyncio.to_thread(self._store.mark_dispatched, row["id"], job.id, time.time() + SCHEDULE_LEASE)
+            dispatched += 1
+        return dispatched
+
+    async def _reconcile(self) -> None:
+        now = time.time()
+        for row in await asyncio.to_thread(self._store.in_flight):
+            job = await self._jobs.get(row["job_id"])
+            if job is None:
+                await self._complete(row, FAILED, "Scheduled run was lost (job expired or service restarted)", 0)
+            elif job.is_finished:
+                # Only posts that were actually pushed (new or changed) count as activity.
+                items = sum(max(t.get("items", 0) - t.get("skipped", 0), 0) for t in job.timings)
+                await self._complete(row, job.status, job.error, items)
+            elif row["lease_until"] is not None and row["lease_until"] < now:
+                await self._complete(row, FAILED, f"Scheduled run exceeded {SCHEDULE_LEASE:.0f}s", 0)
+
+    async def _complete(self, row: Dict[str, Any], status: str, error: Optional[str], items: int) -> None:
+        activity = ACTIVITY_DECAY * row["activity"] + (1.0 - ACTIVITY_DECAY) * items
+        idle_runs = 0 if items else min(row["idle_runs"] + 1, MAX_IDLE_DOUBLINGS)
+        next_run_at = time.time() + _jittered(next_interval(row["interval"], activity, idle_runs))
+        await asyncio.to_thread(
+            self._store.complete, row["id"], status, error, items, activity, idle_runs, next_run_at
+        )
+
+    @staticmethod
+    def _public(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Schedule as exposed over the API (never leaks the app token)."""
+        data = dict(row)
+        data.pop("token", None)
+        data["activity"] = round(data["activity"], 3)
+        return data
@@ -0,0 +1,2 @@
+from .ScheduleStore import ScheduleStore
+from .Scheduler import Scheduler, next_interval
@@ -1,10 +1,17 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List
+from utils.HttpClient import run_sync
 
 # ----- Scrapper Abstraction -----
 class Scrapper(ABC):
     @abstractmethod
-    def fetch_data(self) -> List[Dict[str, Any]]: ...
-    
+    async def fetch_data_async(self) -> List[Dict[str, Any]]: ...
+
     @abstractmethod
-    def parse_data(self, posts: List) -> None: ...
\ No newline at end of file
+    async def parse_data_async(self, posts: List) -> Any: ...
+
+    def fetch_data(self) -> List[Dict[str, Any]]:
+        return run_sync(self.fetch_data_async())
+
+    def parse_data(self, posts: List, *args, **kwargs) -> Any:
+        return run_sync(self.parse_data_async(posts, *args, **kwargs))
\ No newline at end of file
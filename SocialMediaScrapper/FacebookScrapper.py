@@ -1,92 +1,282 @@
 from .SocialMediaScrapperBase import SocialMediaScrapperBase
-from typing import List, Dict, Any
-import requests
-from config.Config import PARSER_URL
-from exceptions.exceptions import ScraperError
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
+from urllib.parse import urlencode
+from utils.HttpClient import http_timeout
+from utils.ParserClient import parser_client
+from utils.Normalizer import normalizer
+from utils.Logging import get_logger
+from utils.Metrics import THROTTLED, timed
+from utils.RateLimiter import GRAPH_APP_THROTTLE_CODES, GRAPH_USER_THROTTLE_CODES
+from .Post import Post
+import httpx
+import asyncio
+import json
+import random
+from datetime import datetime
+from config.Config import (
+    APP_ID,
+    FACEBOOK_GRAPH_URL,
+    FACEBOOK_PAGE_SIZE,
+    FACEBOOK_COMMENTS_PAGE_SIZE,
+    FACEBOOK_MAX_COMMENT_PAGES,
+    FACEBOOK_PAGE_TIMEOUT,
+    FACEBOOK_COMMENTS_EXPAND_PAGE_SIZE,
+    FACEBOOK_BATCH_SIZE,
+    FACEBOOK_BATCH_CONCURRENCY,
+    RATE_LIMIT_MAX_RETRIES,
+    RATE_LIMIT_BACKOFF_BASE,
+    RATE_LIMIT_BACKOFF_MAX,
+)
+from exceptions.exceptions import ScraperError, AuthenticationError
+
+logger = get_logger("FacebookScrapper")
+
+COMMENT_FIELDS = "id,from,message,created_time,like_count,comment_count,reactions.summary(true)"
+# Batch item statuses worth retrying: dropped by Graph (no response), throttled, or a transient server error.
+RETRYABLE_BATCH_STATUS = {None, 429, 500, 502, 503, 504}
 
 # ----- Facebook Scrapper -----
 class FacebookScrapper(SocialMediaScrapperBase):
-    def fetch_data(self):
-        """Fetch latest 150 posts from Facebook Graph API for the authenticated user."""
+    PROVIDER = "facebook"
+    APP_KEY = APP_ID or "default"
+    GRAPH_URL = FACEBOOK_GRAPH_URL.rstrip("/")
+
+    async def fetch_data_async(self):
+        """Fetch every post from Facebook Graph API for the authenticated user."""
+        return [post async for post in self.stream_posts_async()]
+
+    async def stream_posts_async(self) -> AsyncIterator[Post]:
+        """
+        Yields posts page by page, following `paging.next` cursors.
+        Each post embeds its first page of top-level comments; posts with more comments or with replies get
+        their full comment stream fetched for the whole page at once (see _expand_comments) before yielding.
+        With a checkpoint set, only posts created after it are requested (`since=`) and yielded.
+        """
         if not self._user_id:
             raise ScraperError("Not authenticated. Please authenticate first.")
 
-        print("[FacebookScrapper] Fetching posts data from Facebook...")
+        logger.info("Fetching posts", extra={"user_id": self._user_id, "since": self._since})
 
-        url = f"https://graph.facebook.com/v23.0/{self._user_id}/posts"
-        params = {
+        url: Optional[str] = f"{self.GRAPH_URL}/{self._user_id}/posts"
+        params: Optional[Dict[str, Any]] = {
             "access_token": self._client_token,
-            "limit": 150,  # fetch 150 posts at once
+            "limit": FACEBOOK_PAGE_SIZE,
             "fields": (
                 "id,message,created_time,permalink_url,"
                 "attachments{media_type,media,url},"
                 "reactions.summary(true),"
-                "comments.summary(true){id,from,message,created_time,like_count,reactions.summary(true)}"
+                f"comments.limit({FACEBOOK_COMMENTS_PAGE_SIZE}).summary(true)"
+                f"{{{COMMENT_FIELDS}}}"
             )
         }
+        since = self._parse_time(self._since) if self._since else None
+        if since is not None:
+            params["since"] = int(since.timestamp())
 
-        try:
-            res = requests.get(url, params=params, timeout=180)
-            res.raise_for_status()
-            data = res.json()
-
+        page = 0
+        while url:
+            data = await self._get_page(url, params)
             posts = data.get("data", [])
             if not isinstance(posts, list):
-                raise ValueError("Unexpected response format: 'data' is not a list")
+                raise ScraperError("Facebook API request failed: Unexpected response format: 'data' is not a list")
 
-            print(f"[FacebookScrapper] Retrieved {len(posts)} posts ✅")
+            page += 1
+            logger.debug("Retrieved page", extra={"user_id": self._user_id, "page": page, "count": len(posts)})
 
-            # 🔍 Print raw posts data for debugging
-            for idx, post in enumerate(posts[:5], start=1):  # show only first 5 for sanity
-                print(f"\n[Post {idx}] {post}")
+            fresh = []
+            for post in posts:
+                created = self._parse_time(post.get("created_time"))
+                if since is not None and created is not None and created <= since:
+                    # `since` is inclusive on Graph; the checkpoint post itself was already pushed.
+                    continue
+                if created is not None and (self._newest is None or created > self._parse_time(self._newest)):
+                    self._newest = post["created_time"]
+                fresh.append(post)
 
-            return posts
+            await self._expand_comments(fresh)
+            for post in fresh:
+                yield Post.from_facebook(post)
 
-        except requests.RequestException as e:
-            print(f"[FacebookScrapper] Request error while fetching posts: {e}")
+            # The `next` URL already carries the cursor, access token and fields.
+            url = data.get("paging", {}).get("next")
+            params = None
+
+    # ---------- Private Helpers ----------
+    @staticmethod
+    def _parse_time(value: Optional[str]) -> Optional[datetime]:
+        """Parses Graph API timestamps such as 2024-10-16T12:58:35+0000."""
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")
+        except ValueError:
+            return None
+
+    async def _get_page(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return await self._graph_request("GET", url, dict, params=params)
+
+    async def _graph_request(self, method: str, url: str, expected: type, cost: int = 1, **kwargs) -> Any:
+        """Sends one Graph call and returns its decoded body, which must be an instance of `expected`."""
+        try:
+            with timed("fetch_http", self.PROVIDER):
+                res = await self._platform_request(method, url, cost=cost, timeout=http_timeout(FACEBOOK_PAGE_TIMEOUT),
+                                                   **kwargs)
+                res.raise_for_status()
+            with timed("fetch_decode", self.PROVIDER):
+                data = res.json()
+            if not isinstance(data, expected):
+                raise ValueError(f"Unexpected response format: body is not {'an object' if expected is dict else 'a list'}")
+            return data
+
+        except httpx.HTTPStatusError as e:
+            if self._is_token_error(e.response):
+                raise AuthenticationError(f"Facebook rejected the access token: {e.response.text}")
+            logger.error("Request error while fetching posts", extra={"user_id": self._user_id, "error": str(e)})
+            raise ScraperError(f"Facebook API request failed: {str(e)}")
+        except httpx.HTTPError as e:
+            logger.error("Request error while fetching posts", extra={"user_id": self._user_id, "error": str(e)})
             raise ScraperError(f"Facebook API request failed: {str(e)}")
         except ValueError as ve:
-            print(f"[FacebookScrapper] Data validation error: {ve}")
+            logger.error("Data validation error", extra={"user_id": self._user_id, "error": str(ve)})
             raise ScraperError(f"Facebook API request failed: {str(ve)}")
-        
-    def parse_data(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
+
+    @staticmethod
+    def _is_token_error(response: httpx.Response) -> bool:
+        """401s and Graph error 190 (expired or revoked token)."""
+        if response.status_code == 401:
+            return True
+        try:
+            return response.json().get("error", {}).get("code") == 190
+        except (ValueError, AttributeError):
+            return False
+
+    # ---------- Comment Expansion ----------
+    async def _expand_comments(self, posts: List[Dict[str, Any]]) -> None:
         """
-        Sends a batch of posts to the parse-and-push endpoint.
+        Fetches the full comment stream (replies included) of every post whose embedded page is incomplete
+        and merges it into the post. Each round requests the next page of every unfinished post through
+        Graph batch calls of FACEBOOK_BATCH_SIZE, FACEBOOK_BATCH_CONCURRENCY calls at a time; a post stops
+        after FACEBOOK_MAX_COMMENT_PAGES pages. Every batched request costs one rate-limit token, as on Graph,
+        so batches never exceed the smallest burst of the account's buckets.
         """
-        print("[FacebookScrapper] Parsing data...")
+        pending: Dict[str, Optional[str]] = {post["id"]: None for post in posts if self._needs_expansion(post)}
+        if not pending:
+            return
+        fetched: Dict[str, List[Dict[str, Any]]] = {post_id: [] for post_id in pending}
+        pages = dict.fromkeys(pending, 0)
+        attempts = dict.fromkeys(pending, 0)  # consecutive failed attempts per post
+        limit = asyncio.Semaphore(FACEBOOK_BATCH_CONCURRENCY)
+        batch_size = max(1, min(FACEBOOK_BATCH_SIZE, self._platform_max_cost()))
+
+        async def send(chunk: List[Tuple[str, Optional[str]]]) -> List[Tuple[Optional[int], Dict[str, Any]]]:
+            async with limit:
+                return await self._graph_batch([self._comments_url(post_id, after) for post_id, after in chunk])
+
+        while pending:
+            requests = list(pending.items())
+            chunks = [requests[i:i + batch_size] for i in range(0, len(requests), batch_size)]
+            responses = await asyncio.gather(*(send(chunk) for chunk in chunks))
+
+            pending, retry = {}, {}
+            for chunk, results in zip(chunks, responses):
+                for (post_id, after), (status, body) in zip(chunk, results):
+                    if status == 200:
+                        fetched[post_id].extend(body.get("data", []))
+                        pages[post_id] += 1
+                        attempts[post_id] = 0
+                        paging = body.get("paging") or {}
+                        cursor = (paging.get("cursors") or {}).get("after")
+                        if paging.get("next") and cursor and pages[post_id] < FACEBOOK_MAX_COMMENT_PAGES:
+                            pending[post_id] = cursor
+                    elif self._is_retryable(status, body) and attempts[post_id] < RATE_LIMIT_MAX_RETRIES:
+                        attempts[post_id] += 1
+                        retry[post_id] = after
+                    else:
+                        logger.warning("Comment expansion failed", extra={"post_id": post_id, "status": status,
+                                                                          "error": body.get("error")})
+
+            if retry:
+                backoff = RATE_LIMIT_BACKOFF_BASE * (2 ** (max(attempts[post_id] for post_id in retry) - 1))
+                await asyncio.sleep(random.uniform(0, min(RATE_LIMIT_BACKOFF_MAX, backoff)))
+                pending.update(retry)
 
-        normalized_posts = []
         for post in posts:
-            normalized_post = {
-                "id": post.get("id", ""),
-                "created_time": post.get("created_time", ""),
-                "permalink_url": post.get("permalink_url", ""),
-                "attachments": {"data": post.get("attachments", {}).get("data", []) if post.get("attachments") else []},
-                "reactions": {
-                    "data": post.get("reactions", {}).get("data", []),
-                    "summary": post.get("reactions", {}).get(
-                        "summary", {"total_count": 0, "viewer_reaction": "NONE"}
-                    ),
-                },
-                "comments": {
-                    "data": post.get("comments", {}).get("data", []),
-                    "summary": post.get("comments", {}).get(
-                        "summary", {"order": "chronological", "total_count": 0, "can_comment": True}
-                    ),
-                },
-            }
-            normalized_posts.append(normalized_post)
-
-        payload = {"platform": "facebook", "payload": {"data": normalized_posts}, "token": self._app_token}
+            expanded = fetched.get(post["id"])
+            if expanded:
+                # The stream supersedes the embedded page; keep embedded comments it did not reach.
+                comments = post["comments"]
+                seen = {comment.get("id") for comment in expanded}
+                comments["data"] = expanded + [c for c in comments.get("data", []) if c.get("id") not in seen]
+        logger.debug("Expanded comments", extra={"posts": len(fetched), "comments": sum(map(len, fetched.values()))})
 
-        try:
-            url = f"{PARSER_URL}/parse-and-push"
-            response = requests.post(url, json=payload, timeout=240)
-            response.raise_for_status()  # Raise exception for HTTP errors
-            result = response.json()
-            print(f"[FacebookScrapper] Result: {result}")
-            return result
-
-        except requests.RequestException as e:
-            print(f"[FacebookScrapper] Error sending data: {e}")
-            return {"error": str(e)}
\ No newline at end of file
+    async def _graph_batch(self, relative_urls: List[str]) -> List[Tuple[Optional[int], Dict[str, Any]]]:
+        """One Graph batch call; returns (status, decoded body) per request, status None when Graph dropped it."""
+        batch = json.dumps([{"method": "GET", "relative_url": url} for url in relative_urls], separators=(",", ":"))
+        items = await self._graph_request(
+            "POST", f"{self.GRAPH_URL}/", list, cost=len(relative_urls),
+            data={"access_token": self._client_token, "batch": batch, "include_headers": "false"},
+        )
+        results: List[Tuple[Optional[int], Dict[str, Any]]] = []
+        for index in range(len(relative_urls)):
+            item = items[index] if index < len(items) else None
+            if not isinstance(item, dict):
+                results.append((None, {}))
+                continue
+            try:
+                body = json.loads(item.get("body") or "{}")
+            except ValueError:
+                body = {}
+            status = item.get("code")
+            error = body.get("error") if isinstance(body, dict) else None
+            if status == 401 or (isinstance(error, dict) and error.get("code") == 190):
+                raise AuthenticationError(f"Facebook rejected the access token: {error}")
+            results.append((status, body if isinstance(body, dict) else {}))
+        return results
+
+    @staticmethod
+    def _is_retryable(status: Optional[int], body: Dict[str, Any]) -> bool:
+        code = (body.get("error") or {}).get("code")
+        if code in GRAPH_APP_THROTTLE_CODES or code in GRAPH_USER_THROTTLE_CODES or status == 429:
+            THROTTLED.labels("facebook", "429" if status == 429 else "graph").inc()
+            return True
+        return status in RETRYABLE_BATCH_STATUS
+
+    @staticmethod
+    def _needs_expansion(post: Dict[str, Any]) -> bool:
+        """More comments than the embedded page holds, or an embedded comment with replies."""
+        comments = post.get("comments") or {}
+        embedded = comments.get("data") or []
+        total = (comments.get("summary") or {}).get("total_count")
+        if isinstance(total, int) and total > len(embedded):
+            return True
+        return any(isinstance(c.get("comment_count"), int) and c["comment_count"] > 0 for c in embedded)
+
+    @staticmethod
+    def _comments_url(post_id: str, after: Optional[str]) -> str:
+        params = {"filter": "stream", "limit": FACEBOOK_COMMENTS_EXPAND_PAGE_SIZE,
+                  "fields": f"{COMMENT_FIELDS},parent{{id}}"}
+        if after:
+            params["after"] = after
+        return f"{post_id}/comments?{urlencode(params)}"
+
+    async def parse_data_async(self, posts: List[Post]) -> Dict[str, Any]:
+        """
+        Sends the new and changed posts of a batch to the parse-and-push endpoint; unchanged ones are skipped.
+        Returns the per-chunk push report; raises ParserPushError if a chunk could not be delivered.
+        """
+        with timed("normalize", self.PROVIDER):
+            columns = normalizer.columns(self.PROVIDER, posts)
+        fresh, updated, entries = await self._dedup_async(columns)
+        if not len(fresh):
+            logger.debug("All posts unchanged, nothing to push", extra={"count": len(posts)})
+            return self._skipped_report(len(posts))
+
+        with timed("serialize", self.PROVIDER):
+            normalized_posts = fresh.to_records(updated)
+        result = await parser_client.push("facebook", normalized_posts, self._app_token)
+        await self._record_pushed_async(entries)
+        result.update(skipped=len(posts) - len(fresh), updated=len(updated))
+        logger.info("Pushed posts", extra={"items": result["items"], "updated": result["updated"],
+                                           "skipped": result["skipped"], "chunks": len(result["chunks"]),
+                                           "sent_bytes": result["sent_bytes"]})
+        return result
\ No newline at end of file
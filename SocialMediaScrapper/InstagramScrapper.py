@@ -1,11 +1,15 @@
 from .SocialMediaScrapperBase import SocialMediaScrapperBase
 from typing import List, Dict, Any
+from utils.Logging import get_logger
+
+logger = get_logger("InstagramScrapper")
+
 
 # ---------- Instagram Scrapper ----------
 class InstagramScrapper(SocialMediaScrapperBase):
     def _authenticate(self, client_token: str) -> None:
-        print("[InstagramScrapper] Authenticating with Instagram API...")
+        logger.debug("Authenticating with Instagram API")
 
-    def fetch_data(self) -> List[Dict[str, Any]]:
-        print("[InstagramScrapper] Fetching data...")
+    async def fetch_data_async(self) -> List[Dict[str, Any]]:
+        logger.info("Fetching data")
         return [{"post": "Hello IG", "likes": 99}]
\ No newline at end of file
@@ -0,0 +1,152 @@
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional
+from utils.Normalizer import coerce_int
+
+_EMPTY: Dict[str, Any] = {}
+REACTIONS_SUMMARY = {"total_count": 0, "viewer_reaction": "NONE"}
+COMMENTS_SUMMARY = {"order": "chronological", "total_count": 0, "can_comment": True}
+
+
+def _int(value: Any) -> int:
+    return value if type(value) is int else coerce_int(value)
+
+
+# ---------- Post Model ----------
+# Slotted records built straight from the decoded API JSON. Strings and the few nested objects the parser
+# receives verbatim (media, reaction lists and summaries) are referenced, not copied; the rest of the raw
+# response is dropped as soon as the Post exists. Empty lists are stored as None. Post metrics are kept as
+# decoded; utils.Normalizer coerces them to int64 a whole batch column at a time, and builds the parser
+# payload and content hashes from those columns.
+
+@dataclass(slots=True)
+class Metrics:
+    retweet_count: int = 0
+    reply_count: int = 0
+    like_count: int = 0
+    quote_count: int = 0
+    bookmark_count: int = 0
+    impression_count: int = 0
+    reaction_count: int = 0
+    comment_count: int = 0
+
+
+@dataclass(slots=True)
+class Attachment:
+    media_type: Optional[str] = None
+    url: Optional[str] = None
+    media: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_graph(cls, raw: Dict[str, Any]) -> "Attachment":
+        return cls(media_type=raw.get("media_type"), url=raw.get("url"), media=raw.get("media"))
+
+    def to_payload(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {}
+        if self.media_type is not None:
+            payload["media_type"] = self.media_type
+        if self.media is not None:
+            payload["media"] = self.media
+        if self.url is not None:
+            payload["url"] = self.url
+        return payload
+
+
+@dataclass(slots=True)
+class Comment:
+    id: str
+    message: str = ""
+    created_time: str = ""
+    like_count: int = 0
+    author_id: Optional[str] = None
+    author_name: Optional[str] = None
+    reactions: Optional[List[Dict[str, Any]]] = None
+    reactions_summary: Optional[Dict[str, Any]] = None
+    parent_id: Optional[str] = None  # set on replies
+
+    @classmethod
+    def from_graph(cls, raw: Dict[str, Any]) -> "Comment":
+        author = raw.get("from") or _EMPTY
+        reactions = raw.get("reactions") or _EMPTY
+        parent = raw.get("parent") or _EMPTY
+        return cls(
+            id=raw.get("id", ""),
+            message=raw.get("message", ""),
+            created_time=raw.get("created_time", ""),
+            like_count=_int(raw.get("like_count", 0)),
+            author_id=author.get("id"),
+            author_name=author.get("name"),
+            reactions=reactions.get("data") or None,
+            reactions_summary=reactions.get("summary"),
+            parent_id=parent.get("id"),
+        )
+
+    def to_payload(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"id": self.id}
+        if self.author_id is not None or self.author_name is not None:
+            payload["from"] = {"name": self.author_name, "id": self.author_id}
+        payload.update(message=self.message, created_time=self.created_time, like_count=self.like_count)
+        if self.reactions is not None or self.reactions_summary is not None:
+            payload["reactions"] = {"data": self.reactions or [], "summary": self.reactions_summary}
+        if self.parent_id is not None:
+            payload["parent"] = {"id": self.parent_id}
+        return payload
+
+
+@dataclass(slots=True)
+class Post:
+    platform: str
+    id: str
+    created: str
+    text: str = ""
+    permalink_url: str = ""
+    metrics: Metrics = field(default_factory=Metrics)
+    attachments: Optional[List[Attachment]] = None
+    comments: Optional[List[Comment]] = None
+    reactions: Optional[List[Dict[str, Any]]] = None
+    reactions_summary: Optional[Dict[str, Any]] = None
+    comments_summary: Optional[Dict[str, Any]] = None
+    edit_history_tweet_ids: Optional[List[str]] = None
+
+    @classmethod
+    def from_twitter(cls, raw: Dict[str, Any]) -> "Post":
+        post_id = str(raw.get("id", ""))
+        m = raw.get("public_metrics") or raw.get("metrics") or _EMPTY
+        edits = raw.get("edit_history_tweet_ids")
+        return cls(
+            platform="twitter",
+            id=post_id,
+            created=raw.get("created_at") or raw.get("created_time") or "",
+            text=raw.get("text") or "",
+            metrics=Metrics(
+                retweet_count=m.get("retweet_count", 0),
+                reply_count=m.get("reply_count", 0),
+                like_count=m.get("like_count", 0),
+                quote_count=m.get("quote_count", 0),
+                bookmark_count=m.get("bookmark_count", 0),
+                impression_count=m.get("impression_count", 0),
+            ),
+            edit_history_tweet_ids=[str(x) for x in edits] if edits else [post_id],
+        )
+
+    @classmethod
+    def from_facebook(cls, raw: Dict[str, Any]) -> "Post":
+        reactions = raw.get("reactions") or _EMPTY
+        comments = raw.get("comments") or _EMPTY
+        reactions_summary = reactions.get("summary", REACTIONS_SUMMARY)
+        comments_summary = comments.get("summary", COMMENTS_SUMMARY)
+        return cls(
+            platform="facebook",
+            id=raw.get("id", ""),
+            created=raw.get("created_time", ""),
+            text=raw.get("message") or "",
+            permalink_url=raw.get("permalink_url", ""),
+            metrics=Metrics(
+                reaction_count=(reactions_summary or _EMPTY).get("total_count", 0),
+                comment_count=(comments_summary or _EMPTY).get("total_count", 0),
+            ),
+            attachments=[Attachment.from_graph(a) for a in (raw.get("attachments") or _EMPTY).get("data", [])] or None,
+            comments=[Comment.from_graph(c) for c in comments.get("data", [])] or None,
+            reactions=reactions.get("data") or None,
+            reactions_summary=reactions_summary,
+            comments_summary=comments_summary,
+        )
@@ -1,17 +1,159 @@
 from Scrapper import Scrapper
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Optional, Set, Tuple
+from config.Config import PARSER_CHUNK_SIZE, DEDUP_ENABLED
+from utils.CheckpointStore import CheckpointStore
+from utils.DedupIndex import get_dedup_index, UPDATED, UNCHANGED
+from utils.Logging import get_logger
+from utils.Metrics import ITEMS
+from utils.Normalizer import PostColumns
+from utils.RateLimiter import rate_limiter
+import httpx
+import logging
+from exceptions.exceptions import ScraperError
+from .Post import Post
+import asyncio
+import time
 
 # ----- Social Media Scrapper -----
 class SocialMediaScrapperBase(Scrapper):
-    def __init__(self, app_token, client_token: str, social_id: str, name: str, email: str):
+    PROVIDER = ""
+    APP_KEY = "default"  # rate-limit bucket shared by every user of the same platform app
+
+    def __init__(self, app_token, client_token: str, social_id: str, name: str, email: str,
+                 checkpoint_store: Optional[CheckpointStore] = None):
         self._client_token = client_token
         self._user_id = social_id
         self._name = name
         self._email = email
         self._app_token = app_token
+        self._checkpoint_store = checkpoint_store
+        # High-water marks: `_since` bounds the current fetch, `_newest` is what the fetch has seen so far.
+        self._since: Optional[str] = None
+        self._newest: Optional[str] = None
+
+    async def fetch_data_async(self) -> List[Dict[str, Any]]:
+        self._logger.info("Fetching social media data")
+        return []
+
+    async def parse_data_async(self, posts: List) -> None:
+        self._logger.info("Parsing social media data")
+
+    async def stream_posts_async(self) -> AsyncIterator[Post]:
+        """Yields Post records. Scrappers with paginated APIs override this to stream page by page."""
+        for post in await self.fetch_data_async():
+            yield post
+
+    async def scrape_async(self, incremental: bool = True) -> Dict[str, Any]:
+        """
+        Streams posts and pushes them to the parser in PARSER_CHUNK_SIZE batches.
+        One batch is pushed while the next one downloads; at most two batches are held in memory.
+
+        With `incremental`, only posts newer than the stored checkpoint are fetched. The checkpoint
+        advances only when every batch reached the parser or was spooled to the durable outbox.
+        """
+        self._since = await self._load_checkpoint() if incremental else None
+        self._newest = None
+        stats = {"items": 0, "batches": 0, "failed_batches": 0, "spooled_chunks": 0, "skipped": 0, "updated": 0,
+                 "since": self._since, "fetch_seconds": 0.0, "parse_seconds": 0.0}
+        pending: Optional[asyncio.Task] = None
+        batch: List[Post] = []
+
+        async def push(chunk: List[Post]) -> None:
+            started = time.perf_counter()
+            result = await self.parse_data_async(chunk)
+            stats["parse_seconds"] += time.perf_counter() - started
+            stats["batches"] += 1
+            if isinstance(result, dict) and "error" in result:
+                stats["failed_batches"] += 1
+            elif isinstance(result, dict):
+                ITEMS.labels(self.PROVIDER, "pushed").inc(result.get("items", 0))
+                stats["spooled_chunks"] += result.get("spooled", 0)
+                stats["skipped"] += result.get("skipped", 0)
+                stats["updated"] += result.get("updated", 0)
+
+        try:
+            started = time.perf_counter()
+            async for post in self.stream_posts_async():
+                batch.append(post)
+                stats["items"] += 1
+                if len(batch) >= PARSER_CHUNK_SIZE:
+                    stats["fetch_seconds"] += time.perf_counter() - started
+                    if pending is not None:
+                        await pending
+                    pending = asyncio.create_task(push(batch))
+                    batch = []
+                    started = time.perf_counter()
+            stats["fetch_seconds"] += time.perf_counter() - started
+        finally:
+            # Whatever was already fetched still reaches the parser, even if fetching failed midway
+            # (the checkpoint below is then skipped, so the next run fetches the rest).
+            if pending is not None:
+                await pending
+            if batch:
+                await push(batch)
+
+        if not stats["failed_batches"]:
+            await self._save_checkpoint()
+
+        ITEMS.labels(self.PROVIDER, "fetched").inc(stats["items"])
+        ITEMS.labels(self.PROVIDER, "skipped").inc(stats["skipped"])
+
+        stats["fetch_seconds"] = round(stats["fetch_seconds"], 3)
+        stats["parse_seconds"] = round(stats["parse_seconds"], 3)
+        return stats
+
+    @property
+    def _logger(self) -> logging.Logger:
+        return get_logger(self.__class__.__name__)
+
+    async def backfill_async(self, **options) -> Dict[str, Any]:
+        """Walks the account's full history. Only scrappers with a paginated history API support it."""
+        raise ScraperError(f"{self.__class__.__name__} does not support backfill")
+
+    async def _platform_request(self, method: str, url: str, cost: int = 1, **kwargs) -> httpx.Response:
+        """Calls the platform API through the shared per-platform/app/user rate limiter."""
+        return await rate_limiter.request(self.PROVIDER, method, url, app_key=self.APP_KEY,
+                                          user_key=self._user_id, cost=cost, **kwargs)
+
+    def _platform_max_cost(self) -> int:
+        """Largest request cost this account's rate-limit buckets can admit at once."""
+        return rate_limiter.max_cost(self.PROVIDER, app_key=self.APP_KEY, user_key=self._user_id)
+
+    # ---------- Deduplication ----------
+    async def _dedup_async(self, columns: PostColumns) -> Tuple[PostColumns, Set[str], List[Tuple[str, bytes]]]:
+        """
+        Drops the rows whose content is unchanged since their last push.
+        Returns (rows to push, ids of those that are updates, hashes to record once the push went through).
+        """
+        if not DEDUP_ENABLED or not len(columns):
+            return columns, set(), []
+        entries = list(zip(columns.ids, columns.content_hashes()))
+        statuses = await asyncio.to_thread(get_dedup_index().classify, self.PROVIDER, entries)
+        keep = [i for i, status in enumerate(statuses) if status != UNCHANGED]
+        updated = {columns.ids[i] for i, status in enumerate(statuses) if status == UPDATED}
+        pending = [entries[i] for i in keep]
+        fresh = columns if len(keep) == len(columns) else columns.take(keep)
+        return fresh, updated, pending
+
+    async def _record_pushed_async(self, entries: List[Tuple[str, bytes]]) -> None:
+        if entries:
+            await asyncio.to_thread(get_dedup_index().record, self.PROVIDER, entries)
+
+    @staticmethod
+    def _skipped_report(skipped: int) -> Dict[str, Any]:
+        """Push report for a batch in which every post was unchanged."""
+        return {"batch_id": None, "items": 0, "chunks": [], "spooled": 0, "bytes": 0, "sent_bytes": 0,
+                "skipped": skipped, "updated": 0}
+
+    # ---------- Checkpoints ----------
+    # The store is SQLite; its calls run in a worker thread so a busy database never stalls the event loop.
+    async def _load_checkpoint(self) -> Optional[str]:
+        if self._checkpoint_store is None or not self.PROVIDER:
+            return None
+        return await asyncio.to_thread(self._checkpoint_store.get, self.PROVIDER, self._user_id)
 
-    def fetch_data(self) -> List[Dict[str, Any]]:
-        print(f"{self.__class__.__name__}: Parsing social media data...")
-        
-    def parse_data(self, posts: List) -> None:
-        print(f"{self.__class__.__name__}: Parsing social media data...")
\ No newline at end of file
+    async def _save_checkpoint(self) -> None:
+        if self._checkpoint_store is None or not self.PROVIDER or self._newest is None:
+            return
+        await asyncio.to_thread(self._checkpoint_store.set, self.PROVIDER, self._user_id, self._newest)
+        self._logger.info("Checkpoint advanced", extra={"user_id": self._user_id, "checkpoint": self._newest})
\ No newline at end of file
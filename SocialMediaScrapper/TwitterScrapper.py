@@ -1,26 +1,232 @@
 from .SocialMediaScrapperBase import SocialMediaScrapperBase
-import requests
-from typing import List, Dict, Any, Optional
-from config.Config import PARSER_URL
-from exceptions.exceptions import ScraperError
+from utils.HttpClient import http_timeout
+from utils.ParserClient import parser_client
+from utils.Normalizer import normalizer
+from utils.Logging import get_logger
+from utils.Metrics import timed
+from .Post import Post
+import httpx
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from config.Config import (
+    PARSER_CHUNK_SIZE,
+    TWITTER_API_URL,
+    TWITTER_BACKFILL_START,
+    TWITTER_BACKFILL_WINDOWS,
+    TWITTER_BACKFILL_CONCURRENCY,
+)
+import asyncio
+import json
+import time
+from exceptions.exceptions import ScraperError, AuthenticationError
+
+logger = get_logger("TwitterScrapper")
 
 # ----- Twitter Scrapper -----
 class TwitterScrapper(SocialMediaScrapperBase):
-    def fetch_data(self):
-        """Fetch tweets for authenticated user."""
+    PROVIDER = "twitter"
+    API_URL = TWITTER_API_URL.rstrip("/")
+    PLAN_KEY = "backfill"
+    WINDOW_DONE = "done"
+    # GET /2/users/:id/tweets answers 400 to any start_time before this.
+    EARLIEST_START = datetime(2010, 11, 6, 0, 0, 1, tzinfo=timezone.utc)
+
+    async def fetch_data_async(self):
+        """Fetch tweets for authenticated user, newer than the `since_id` checkpoint when one is set."""
+        return [tweet async for tweet in self.stream_posts_async()]
+
+    async def stream_posts_async(self) -> AsyncIterator[Post]:
+        """
+        Yields tweets page by page. With a `since_id` checkpoint, follows `next_token` until every tweet
+        newer than it has been yielded; without one, only the latest page is fetched (history is backfill's job).
+        `_newest` is only a candidate: scrape_async saves it once every yielded tweet has been pushed.
+        """
+        params: Dict[str, Any] = {"since_id": self._since} if self._since else {}
+        pages = 0
+        count = 0
+        while True:
+            tweets, meta = await self._fetch_page(params)
+            pages += 1
+            count += len(tweets)
+            newest_id = meta.get("newest_id")
+            if newest_id and (self._newest is None or int(newest_id) > int(self._newest)):
+                self._newest = newest_id
+            for tweet in tweets:
+                yield tweet
+
+            next_token = meta.get("next_token")
+            if not self._since or not next_token:
+                break
+            params = {**params, "pagination_token": next_token}
+        logger.info("Retrieved tweets", extra={"user_id": self._user_id, "count": count, "pages": pages,
+                                               "newest_id": self._newest})
+
+    async def backfill_async(self, start_time: Optional[str] = None, end_time: Optional[str] = None,
+                             windows: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Walks the timeline between start_time and end_time (RFC 3339) to exhaustion via `pagination_token`.
+        The range is split into `windows` time slices fetched concurrently. Each page is pushed before its
+        cursor is saved, so calling this again after an interruption resumes every slice where it stopped.
+        """
+        if not self._user_id or not self._client_token:
+            raise ScraperError("Not authenticated. Please authenticate first.")
+
+        plan, resumed = await self._load_backfill_plan(start_time, end_time, windows)
+        slices = self._split_range(self._parse_time(plan["start"]), self._parse_time(plan["end"]), plan["windows"])
+        logger.info("Backfilling", extra={"user_id": self._user_id, "start": plan["start"], "end": plan["end"],
+                                          "windows": len(slices), "resumed": resumed})
+
+        stats = {"items": 0, "batches": 0, "failed_batches": 0, "skipped": 0, "updated": 0, "windows": len(slices),
+                 "resumed": resumed, "fetch_seconds": 0.0, "parse_seconds": 0.0}
+        semaphore = asyncio.Semaphore(TWITTER_BACKFILL_CONCURRENCY)
+
+        async def run_window(window_start: datetime, window_end: datetime) -> None:
+            async with semaphore:
+                await self._backfill_window(window_start, window_end, stats)
+
+        results = await asyncio.gather(*(run_window(s, e) for s, e in slices), return_exceptions=True)
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            # Finished windows keep their "done" marker; the next call only redoes the failed ones.
+            raise errors[0]
+
+        await self._finish_backfill(slices, plan)
+        stats["fetch_seconds"] = round(stats["fetch_seconds"], 3)
+        stats["parse_seconds"] = round(stats["parse_seconds"], 3)
+        logger.info("Backfill complete", extra={"user_id": self._user_id, "items": stats["items"]})
+        return stats
+
+    # ---------- Backfill Helpers ----------
+    async def _backfill_window(self, window_start: datetime, window_end: datetime, stats: Dict[str, Any]) -> None:
+        key = self._window_key(window_start, window_end)
+        cursor = await self._get_cursor(key)
+        if cursor == self.WINDOW_DONE:
+            return
+
+        params = {"start_time": self._format_time(window_start), "end_time": self._format_time(window_end)}
+        while True:
+            if cursor:
+                params["pagination_token"] = cursor
+
+            started = time.perf_counter()
+            tweets, meta = await self._fetch_page(params)
+            fetched = time.perf_counter()
+
+            for i in range(0, len(tweets), PARSER_CHUNK_SIZE):
+                result = await self.parse_data_async(tweets[i:i + PARSER_CHUNK_SIZE])
+                if isinstance(result, dict) and "error" in result:
+                    raise ScraperError(f"Parser rejected backfill batch: {result['error']}")
+                stats["batches"] += 1
+                stats["skipped"] += result.get("skipped", 0)
+                stats["updated"] += result.get("updated", 0)
+
+            stats["items"] += len(tweets)
+            stats["fetch_seconds"] += fetched - started
+            stats["parse_seconds"] += time.perf_counter() - fetched
+            newest_id = meta.get("newest_id")
+            if newest_id and (self._newest is None or int(newest_id) > int(self._newest)):
+                self._newest = newest_id
+
+            cursor = meta.get("next_token")
+            await self._set_cursor(key, cursor or self.WINDOW_DONE)
+            if not cursor:
+                return
+
+    async def _load_backfill_plan(self, start_time: Optional[str], end_time: Optional[str],
+                                  windows: Optional[int]) -> Tuple[Dict[str, Any], bool]:
+        """Reuses an unfinished plan when the request is compatible with it, so window keys stay stable."""
+        if start_time:
+            start_time = self._clamp_start(start_time)
+        saved = await self._get_cursor(self.PLAN_KEY)
+        if saved:
+            plan = json.loads(saved)
+            if (start_time in (None, plan["start"]) and end_time in (None, plan["end"])
+                    and windows in (None, plan["windows"])):
+                return plan, True
+            # The new plan's windows have other keys; the abandoned plan's cursors would never be cleared.
+            await asyncio.to_thread(self._delete_cursors, self._window_keys(plan))
+
+        # X rejects end_time values less than ~10 seconds in the past.
+        end = self._parse_time(end_time) if end_time else datetime.now(timezone.utc) - timedelta(seconds=30)
+        plan = {
+            "start": start_time or self._clamp_start(TWITTER_BACKFILL_START),
+            "end": end_time or self._format_time(end),
+            "windows": windows or TWITTER_BACKFILL_WINDOWS,
+            "open_ended": end_time is None,
+        }
+        await self._set_cursor(self.PLAN_KEY, json.dumps(plan))
+        return plan, False
+
+    async def _finish_backfill(self, slices: List[Tuple[datetime, datetime]], plan: Dict[str, Any]) -> None:
+        if self._checkpoint_store is None:
+            return
+        names = [self._window_key(window_start, window_end) for window_start, window_end in slices] + [self.PLAN_KEY]
+        await asyncio.to_thread(self._delete_cursors, names)
+        # A backfill up to "now" also seeds incremental scraping when it has no checkpoint yet.
+        if plan["open_ended"] and await self._load_checkpoint() is None:
+            await self._save_checkpoint()
+
+    # Cursors live in the SQLite CheckpointStore; like the checkpoint itself they are read and written off the loop.
+    async def _get_cursor(self, name: str) -> Optional[str]:
+        if self._checkpoint_store is None:
+            return None
+        return await asyncio.to_thread(self._checkpoint_store.get, self.PROVIDER, self._user_id, name)
+
+    async def _set_cursor(self, name: str, value: str) -> None:
+        if self._checkpoint_store is not None:
+            await asyncio.to_thread(self._checkpoint_store.set, self.PROVIDER, self._user_id, value, name)
+
+    def _delete_cursors(self, names: List[str]) -> None:
+        for name in names:
+            self._checkpoint_store.delete(self.PROVIDER, self._user_id, name)
+
+    @staticmethod
+    def _split_range(start: datetime, end: datetime, windows: int) -> List[Tuple[datetime, datetime]]:
+        if end <= start:
+            raise ScraperError("Backfill start_time must be before end_time")
+        step = (end - start) / max(windows, 1)
+        bounds = [start + step * i for i in range(max(windows, 1))] + [end]
+        return [(bounds[i].replace(microsecond=0), bounds[i + 1].replace(microsecond=0)) for i in range(len(bounds) - 1)]
+
+    def _window_keys(self, plan: Dict[str, Any]) -> List[str]:
+        slices = self._split_range(self._parse_time(plan["start"]), self._parse_time(plan["end"]), plan["windows"])
+        return [self._window_key(window_start, window_end) for window_start, window_end in slices]
+
+    def _window_key(self, window_start: datetime, window_end: datetime) -> str:
+        return f"backfill:{self._format_time(window_start)}/{self._format_time(window_end)}"
+
+    def _clamp_start(self, value: str) -> str:
+        return self._format_time(max(self._parse_time(value), self.EARLIEST_START))
+
+    @staticmethod
+    def _parse_time(value: str) -> datetime:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone(timezone.utc)
+        except ValueError:
+            raise ScraperError(f"Invalid RFC 3339 timestamp: {value}")
+
+    @staticmethod
+    def _format_time(value: datetime) -> str:
+        return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    async def _fetch_page(self, params: Dict[str, Any]) -> Tuple[List[Post], Dict[str, Any]]:
+        """Fetches one page of the user's timeline and returns (tweets, meta)."""
         if not self._user_id or not self._client_token:
             raise ScraperError("Not authenticated. Please authenticate first.")
 
-        url = (
-            f"https://api.x.com/2/users/{self._user_id}/tweets"
-            "?max_results=100&tweet.fields=id,text,created_at,public_metrics"
-            "&exclude=retweets,replies"
-        )
+        url = f"{self.API_URL}/users/{self._user_id}/tweets"
+        params = {
+            "max_results": 100,
+            "tweet.fields": "id,text,created_at,public_metrics",
+            "exclude": "retweets,replies",
+            **params,
+        }
         headers = {"Authorization": f"Bearer {self._client_token}"}
 
         try:
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
+            with timed("fetch_http", self.PROVIDER):
+                response = await self._platform_request("GET", url, params=params, headers=headers, timeout=http_timeout(10))
+                response.raise_for_status()
             # twitter_sample = {
             #     "data": [ 
             #         {
@@ -44,30 +250,33 @@ class TwitterScrapper(SocialMediaScrapperBase):
             #         "oldest_id": "1846536216969089037" 
             #     } 
             # }
-            payload = response.json()
+            with timed("fetch_decode", self.PROVIDER):
+                payload = response.json()
             # payload = twitter_sample
 
-            tweets = self.__validate_tweets(payload)
-            print(f"[TwitterScrapper] Retrieved {len(tweets)} tweets ✅")
-            for tweet in tweets:
-                print(f"  - {tweet['id']}: {tweet['text']}")
-
-            return tweets
+            with timed("validate", self.PROVIDER):
+                tweets = self.__validate_tweets(payload)
+            return tweets, payload.get("meta", {})
 
-        except requests.RequestException as e:
-            print(f"[TwitterScrapper] Error fetching tweets: {str(e)}")
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 401:
+                raise AuthenticationError(f"Twitter rejected the access token: {e.response.text}")
+            logger.error("Error fetching tweets", extra={"user_id": self._user_id, "error": str(e)})
+            raise ScraperError(f"Twitter API request failed: {str(e)}")
+        except httpx.HTTPError as e:
+            logger.error("Error fetching tweets", extra={"user_id": self._user_id, "error": str(e)})
             raise ScraperError(f"Twitter API request failed: {str(e)}")
         except ValueError as e:
-            print(f"[TwitterScrapper] Invalid response structure: {str(e)}")
+            logger.error("Invalid response structure", extra={"user_id": self._user_id, "error": str(e)})
             raise ScraperError(f"Twitter data parsing failed: {str(e)}")
     
         # ---------- Private Helpers ----------
-    def __verify_token(self, client_token: str) -> str:
+    async def __verify_token(self, client_token: str) -> str:
         """Verify token by calling Twitter's /2/users/me endpoint."""
-        url = "https://api.x.com/2/users/me"
+        url = f"{self.API_URL}/users/me"
         headers = {"Authorization": f"Bearer {client_token}"}
 
-        response = requests.get(url, headers=headers, timeout=10)
+        response = await self._platform_request("GET", url, headers=headers, timeout=http_timeout(10))
 
         if response.status_code != 200:
             raise ValueError(
@@ -88,108 +297,71 @@ class TwitterScrapper(SocialMediaScrapperBase):
             raise ValueError(
                 f"Could not extract user ID from response: {payload}"
             )
-    def __validate_tweets(self, payload: dict) -> List[Dict[str, Any]]:
-        """Validate and normalize tweets structure."""
+    def __validate_tweets(self, payload: dict) -> List[Post]:
+        """Validate tweets and build their Post records."""
+        if "data" not in payload and payload.get("meta", {}).get("result_count") == 0:
+            return []  # nothing newer than since_id
         if "data" not in payload or not isinstance(payload["data"], list):
             raise ValueError(f"Invalid tweets response format: {payload}")
 
         tweets = []
         for tweet in payload["data"]:
-            try:
-                tweet_id = tweet["id"]
-                text = tweet["text"]
-                created_at = tweet["created_at"]
-                metrics = tweet.get("public_metrics", {})
-
-                tweets.append(
-                    {
-                        "id": tweet_id,
-                        "text": text,
-                        "created_at": created_at,
-                        "metrics": metrics,
-                    }
-                )
-            except KeyError as e:
-                print(f"[TwitterScrapper] Skipping malformed tweet: {tweet}, error: {e}")
+            missing = [key for key in ("id", "text", "created_at") if key not in tweet]
+            if missing:
+                logger.warning("Skipping malformed tweet", extra={"tweet_id": tweet.get("id"), "missing": missing})
+                continue
+            tweets.append(Post.from_twitter(tweet))
 
         return tweets
     
-    def parse_data(self, posts: List[Dict[str, Any]], meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    async def parse_data_async(self, posts: List[Post], meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
-        Sends a batch of Twitter posts to the parse-and-push endpoint.
+        Sends the new and changed posts of a batch to the parse-and-push endpoint; unchanged ones are skipped.
 
         Args:
-            posts: List of raw Twitter post dicts
-            meta: Optional metadata dict (will be auto-generated if not provided)
+            posts: List of Twitter Post records
+            meta: Optional metadata dict (will be auto-generated per chunk if not provided)
 
         Returns:
-            Dict containing the API response or an error message.
+            Dict containing the per-chunk push report or an error message.
+
+        Raises:
+            ParserPushError: if a chunk could not be delivered after retries.
         """
 
         if not isinstance(posts, list):
             return {"error": "posts must be a list"}
 
-        def _to_int(v):
-            try:
-                return int(v)
-            except Exception:
-                return 0
-
-        normalized_posts: List[Dict[str, Any]] = []
-        for p in posts:
-            pub = p.get("public_metrics") or p.get("metrics") or {}
-            edit_ids = p.get("edit_history_tweet_ids") or []
-
-            normalized = {
-                "id": str(p.get("id", "")),
-                "text": p.get("text", "") or "",
-                "created_at": p.get("created_at", "") or p.get("created_time", ""),
-                "public_metrics": {
-                    "retweet_count": _to_int(pub.get("retweet_count", 0)),
-                    "reply_count": _to_int(pub.get("reply_count", 0)),
-                    "like_count": _to_int(pub.get("like_count", 0)),
-                    "quote_count": _to_int(pub.get("quote_count", 0)),
-                    "bookmark_count": _to_int(pub.get("bookmark_count", 0)),
-                    "impression_count": _to_int(pub.get("impression_count", 0)),
-                },
-                "edit_history_tweet_ids": [str(x) for x in edit_ids] if edit_ids else [str(p.get("id", ""))],
-            }
-
-            normalized_posts.append(normalized)
-
-        # Auto-generate meta if not provided
-        if meta is None:
-            result_count = len(normalized_posts)
-            newest_id = normalized_posts[0]["id"] if normalized_posts else ""
-            oldest_id = normalized_posts[-1]["id"] if normalized_posts else ""
-            meta = {
-                "result_count": result_count,
-                "newest_id": newest_id,
-                "oldest_id": oldest_id
-            }
-        else:
-            meta.setdefault("result_count", len(normalized_posts))
-            if "newest_id" not in meta and normalized_posts:
-                meta["newest_id"] = normalized_posts[0]["id"]
-            if "oldest_id" not in meta and normalized_posts:
-                meta["oldest_id"] = normalized_posts[-1]["id"]
-
-        payload = {"platform": "twitter", "payload": {"data": normalized_posts, "meta": meta}, "token": self._app_token}
+        with timed("normalize", self.PROVIDER):
+            columns = normalizer.columns(self.PROVIDER, posts)
+        fresh, updated, entries = await self._dedup_async(columns)
+        if not len(fresh):
+            logger.debug("All tweets unchanged, nothing to push", extra={"count": len(posts)})
+            return self._skipped_report(len(posts))
 
-        try:
-            url = f"{PARSER_URL}/parse-and-push"
-            resp = requests.post(url, json=payload, timeout=240)
-            resp.raise_for_status()
-            try:
-                return resp.json()
-            except ValueError:
+        with timed("serialize", self.PROVIDER):
+            normalized_posts = fresh.to_records(updated)
+
+        def meta_for(chunk: List[Dict[str, Any]]) -> Dict[str, Any]:
+            # Auto-generate meta if not provided
+            if meta is None:
                 return {
-                    "error": "Parser returned non-JSON response",
-                    "status_code": resp.status_code,
-                    "body": resp.text
+                    "result_count": len(chunk),
+                    "newest_id": chunk[0]["id"] if chunk else "",
+                    "oldest_id": chunk[-1]["id"] if chunk else "",
                 }
-        except requests.RequestException as exc:
-            raise RuntimeError(f'{str(exc)}')
+            chunk_meta = dict(meta)
+            chunk_meta.setdefault("result_count", len(chunk))
+            if "newest_id" not in chunk_meta and chunk:
+                chunk_meta["newest_id"] = chunk[0]["id"]
+            if "oldest_id" not in chunk_meta and chunk:
+                chunk_meta["oldest_id"] = chunk[-1]["id"]
+            return chunk_meta
+
+        result = await parser_client.push("twitter", normalized_posts, self._app_token, meta_for=meta_for)
+        await self._record_pushed_async(entries)
+        result.update(skipped=len(posts) - len(fresh), updated=len(updated))
+        return result
     
     # def parse_data(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
     #     """
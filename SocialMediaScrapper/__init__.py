@@ -1,4 +1,32 @@
-from .FacebookScrapper import FacebookScrapper
-from .TwitterScrapper import TwitterScrapper
-from .InstagramScrapper import InstagramScrapper
-from .SocialMediaScrapperBase import SocialMediaScrapperBase
\ No newline at end of file
+from typing import Type
+import importlib
+from .SocialMediaScrapperBase import SocialMediaScrapperBase
+from .Post import Post, Metrics, Comment, Attachment
+
+# ---------- Scrapper Registry ----------
+# Provider -> scrapper class name (and module of the same name). A platform's module is imported the
+# first time an account of that provider is scraped, so a worker only loads the platforms it serves.
+SCRAPPERS = {
+    "facebook": "FacebookScrapper",
+    "twitter": "TwitterScrapper",
+    "instagram": "InstagramScrapper",
+}
+
+
+def get_scrapper_class(provider: str) -> Type[SocialMediaScrapperBase]:
+    """The scrapper class for `provider`; raises KeyError for unknown providers."""
+    return _load(SCRAPPERS[provider])
+
+
+def _load(name: str) -> Type[SocialMediaScrapperBase]:
+    scrapper_class = getattr(importlib.import_module(f".{name}", __name__), name)
+    # Importing the submodule bound its name on this package to the module; point it at the class instead.
+    globals()[name] = scrapper_class
+    return scrapper_class
+
+
+def __getattr__(name: str):
+    # Keeps `from SocialMediaScrapper import FacebookScrapper` working without importing every platform up front.
+    if name in SCRAPPERS.values():
+        return _load(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,314 @@
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import httpx
+
+# Vocabulary for post texts: random words compress like real prose, a repeated character would not.
+_WORDS = ("launch", "today", "thanks", "team", "great", "new", "update", "video", "live", "event", "photo",
+          "weekend", "release", "community", "feedback", "support", "morning", "city", "music", "coffee",
+          "project", "design", "data", "travel", "story", "friends", "question", "answer", "soon", "finally")
+_TEXT_VARIANTS = 64
+_BASE_TIME = datetime(2024, 10, 16, 12, 0, tzinfo=timezone.utc)
+
+
+@dataclass
+class MockConfig:
+    pages: int = 4  # timeline pages per account
+    page_size: int = 25  # posts per page when the client does not send a limit
+    payload_bytes: int = 280  # approximate size of each post's text
+    comments: int = 5  # comments embedded in each Facebook post
+    comment_pages: int = 0  # extra comment pages behind each Facebook post's `paging.next`
+    latency_ms: float = 20.0  # Graph, X and authenticator response time
+    jitter_ms: float = 5.0
+    parser_latency_ms: float = 10.0
+    throttle_rate: float = 0.0  # fraction of Graph/X requests answered with 429 (batch items: Graph code 613)
+    retry_after: float = 1.0  # Retry-After sent with an injected 429
+    seed: int = 1
+
+    def to_args(self) -> List[str]:
+        return [arg for key, value in asdict(self).items() for arg in (f"--{key.replace('_', '-')}", str(value))]
+
+
+# ---------- Mock APIs ----------
+class MockApis:
+    """
+    ASGI stand-in for the authenticator's /get_user, Graph's /v23.0/{id}/posts, comment pages and batch
+    endpoint, X's /2/users/{id}/tweets and /2/users/me, and the parser's /parse-and-push.
+
+    Tokens look like `bench-<provider>-<n>`: the authenticator maps them to provider <provider> and social id <n>.
+    Every response is a pure function of the request and the seed, so runs against the same config are comparable.
+    GET /__stats returns request, throttle and parser byte counters; POST /__reset clears them.
+    """
+
+    def __init__(self, config: MockConfig):
+        self._config = config
+        self._random = random.Random(config.seed)
+        self._texts = [self._text(config.payload_bytes) for _ in range(_TEXT_VARIANTS)]
+        self._stats: Dict[str, Any] = {}
+        self._reset()
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            while (await receive())["type"] != "lifespan.shutdown":
+                await send({"type": "lifespan.startup.complete"})
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+        path = scope["path"]
+        query = {key: values[-1] for key, values in parse_qs(scope["query_string"].decode()).items()}
+        headers = {key.decode().lower(): value.decode() for key, value in scope["headers"]}
+        base = f"http://{headers.get('host', 'localhost')}"
+        parts = path.strip("/").split("/")
+        route = self._route(parts)
+        self._stats["requests"][route] = self._stats["requests"].get(route, 0) + 1
+
+        match(route):
+            case "parser":
+                self._stats["parser_bytes"] += len(await self._body(receive))
+                await self._sleep(self._config.parser_latency_ms, 0)
+                status, body = 200, {"status": "success"}
+            case "stats":
+                status, body = 200, self._stats
+            case "reset":
+                self._reset()
+                status, body = 200, {"status": "success"}
+            case "authenticator":
+                await self._sleep(self._config.latency_ms, self._config.jitter_ms)
+                status, body = self._user(headers.get("authorization", ""))
+            case "graph_posts" | "graph_comments" | "x_tweets" | "x_me":
+                await self._sleep(self._config.latency_ms, self._config.jitter_ms)
+                if self._random.random() < self._config.throttle_rate:
+                    self._stats["throttled"] += 1
+                    await self._respond(send, 429, {"error": {"message": "Too Many Requests"}},
+                                        [(b"retry-after", str(self._config.retry_after).encode())])
+                    return
+                status, body = self._platform(route, parts, query, headers, base)
+            case "graph_batch":
+                await self._sleep(self._config.latency_ms, self._config.jitter_ms)
+                form = {key: values[-1] for key, values in parse_qs((await self._body(receive)).decode()).items()}
+                status, body = 200, [self._batch_item(item, headers, base) for item in json.loads(form.get("batch", "[]"))]
+            case _:
+                status, body = 404, {"error": f"no mock for {path}"}
+
+        await self._respond(send, status, body)
+
+    # ---------- Routes ----------
+    @staticmethod
+    def _route(parts: List[str]) -> str:
+        match(parts):
+            case ["parse-and-push"]:
+                return "parser"
+            case ["get_user"]:
+                return "authenticator"
+            case ["__stats"]:
+                return "stats"
+            case ["__reset"]:
+                return "reset"
+            case [_, _, "posts"]:
+                return "graph_posts"
+            case [_, _, "comments"]:
+                return "graph_comments"
+            case [_]:
+                return "graph_batch"
+            case ["2", "users", "me"]:
+                return "x_me"
+            case ["2", "users", _, "tweets"]:
+                return "x_tweets"
+            case _:
+                return "unknown"
+
+    def _user(self, authorization: str) -> Tuple[int, Dict[str, Any]]:
+        token = authorization.removeprefix("Bearer ").strip()
+        parts = token.split("-")
+        if len(parts) != 3 or parts[0] != "bench":
+            return 401, {"error": "unknown token"}
+        _, provider, number = parts
+        return 200, {"claims": {"provider": provider, "social_id": number, "social_token": f"tok-{number}",
+                                "name": f"Bench User {number}", "email": f"user{number}@bench.local",
+                                "exp": int(time.time()) + 3600}}
+
+    def _platform(self, route: str, parts: List[str], query: Dict[str, str], headers: Dict[str, str],
+                  base: str) -> Tuple[int, Dict[str, Any]]:
+        match(route):
+            case "graph_posts":
+                return 200, self._graph_page(parts[1], int(query.get("after", 0)),
+                                             int(query.get("limit", self._config.page_size)), base)
+            case "graph_comments":
+                return 200, self._comment_page(parts[1], int(query.get("after", 0)), query.get("filter") == "stream", base)
+            case "x_me":
+                return 200, {"data": {"id": headers.get("authorization", "").rsplit("-", 1)[-1]}}
+            case _:
+                token = query.get("pagination_token", "")
+                page = int(token[1:]) if token.startswith("p") else 0
+                return 200, self._tweet_page(parts[2], page, int(query.get("max_results", self._config.page_size)))
+
+    def _batch_item(self, item: Dict[str, Any], headers: Dict[str, str], base: str) -> Dict[str, Any]:
+        """One entry of a Graph batch response; throttles are reported per item, as Graph does (code 613)."""
+        self._stats["requests"]["graph_batch_item"] = self._stats["requests"].get("graph_batch_item", 0) + 1
+        if self._random.random() < self._config.throttle_rate:
+            self._stats["throttled"] += 1
+            body: Any = {"error": {"message": "Calls to this api have exceeded the rate limit.", "code": 613}}
+            return {"code": 400, "body": json.dumps(body)}
+        url = urlsplit("/v23.0/" + item.get("relative_url", "").lstrip("/"))
+        parts = url.path.strip("/").split("/")
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        route = self._route(parts)
+        if route not in ("graph_posts", "graph_comments"):
+            return {"code": 404, "body": json.dumps({"error": {"message": "unsupported in batch", "code": 100}})}
+        status, body = self._platform(route, parts, query, headers, base)
+        return {"code": status, "body": json.dumps(body, separators=(",", ":"))}
+
+    # ---------- Payloads ----------
+    def _graph_page(self, user_id: str, page: int, limit: int, base: str) -> Dict[str, Any]:
+        start = page * limit
+        posts = [self._graph_post(user_id, n, base) for n in range(start, start + limit)]
+        data: Dict[str, Any] = {"data": posts, "paging": {"cursors": {"before": str(page), "after": str(page + 1)}}}
+        if page + 1 < self._config.pages:
+            data["paging"]["next"] = f"{base}/v23.0/{user_id}/posts?limit={limit}&after={page + 1}"
+        return data
+
+    def _graph_post(self, user_id: str, n: int, base: str) -> Dict[str, Any]:
+        post_id = f"{user_id}_{n}"
+        total_comments = self._config.comments * (1 + self._config.comment_pages)
+        comments: Dict[str, Any] = {
+            "data": self._comments(post_id, 0, stream=False),
+            "summary": {"order": "ranked", "total_count": total_comments, "can_comment": True},
+        }
+        if self._config.comment_pages:
+            comments["paging"] = {"cursors": {"after": "1"}, "next": f"{base}/v23.0/{post_id}/comments?after=1"}
+        return {
+            "id": post_id,
+            "message": self._texts[n % _TEXT_VARIANTS],
+            "created_time": (_BASE_TIME - timedelta(minutes=n)).strftime("%Y-%m-%dT%H:%M:%S+0000"),
+            "permalink_url": f"https://www.facebook.com/{user_id}/posts/{n}",
+            "attachments": {"data": [{
+                "media_type": "photo",
+                "url": f"https://www.facebook.com/photo/?fbid={n}",
+                "media": {"image": {"height": 720, "width": 1280, "src": f"https://scontent.example/{post_id}.jpg"}},
+            }]},
+            "reactions": {"data": [], "summary": {"total_count": n % 97, "viewer_reaction": "NONE"}},
+            "comments": comments,
+        }
+
+    def _comment_page(self, post_id: str, page: int, stream: bool, base: str) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"data": self._comments(post_id, page, stream), "paging": {"cursors": {"after": str(page + 1)}}}
+        if page < self._config.comment_pages:
+            data["paging"]["next"] = f"{base}/v23.0/{post_id}/comments?after={page + 1}"
+        return data
+
+    def _comments(self, post_id: str, page: int, stream: bool) -> List[Dict[str, Any]]:
+        """Every fourth comment is a reply to the one before it; only the `stream` filter returns replies."""
+        first = page * self._config.comments
+        comments = []
+        for k in range(first, first + self._config.comments):
+            comment = {
+                "id": f"{post_id}_{k}",
+                "from": {"id": str(1000 + k), "name": f"Commenter {k}"},
+                "message": self._texts[k % _TEXT_VARIANTS][:80],
+                "created_time": (_BASE_TIME + timedelta(seconds=k)).strftime("%Y-%m-%dT%H:%M:%S+0000"),
+                "like_count": k % 7,
+                "comment_count": 1 if k % 4 == 2 else 0,
+                "reactions": {"data": [], "summary": {"total_count": k % 7, "viewer_reaction": "NONE"}},
+            }
+            if k % 4 == 3:
+                if not stream:
+                    continue
+                comment["parent"] = {"id": f"{post_id}_{k - 1}"}
+            comments.append(comment)
+        return comments
+
+    def _tweet_page(self, user_id: str, page: int, limit: int) -> Dict[str, Any]:
+        top = (int(user_id) + 1) * 10_000_000 if user_id.isdigit() else 10_000_000
+        start = page * limit
+        tweets = [
+            {
+                "id": str(top - n),
+                "text": self._texts[n % _TEXT_VARIANTS],
+                "created_at": (_BASE_TIME - timedelta(minutes=n)).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+                "public_metrics": {"retweet_count": n % 11, "reply_count": n % 5, "like_count": n % 97,
+                                   "quote_count": n % 3, "bookmark_count": n % 13, "impression_count": 100 + n},
+                "edit_history_tweet_ids": [str(top - n)],
+            }
+            for n in range(start, start + limit)
+        ]
+        meta: Dict[str, Any] = {"result_count": len(tweets), "newest_id": tweets[0]["id"], "oldest_id": tweets[-1]["id"]}
+        if page + 1 < self._config.pages:
+            meta["next_token"] = f"p{page + 1}"
+        return {"data": tweets, "meta": meta}
+
+    # ---------- Helpers ----------
+    def _text(self, size: int) -> str:
+        words: List[str] = []
+        length = 0
+        while length < size:
+            word = self._random.choice(_WORDS)
+            words.append(word)
+            length += len(word) + 1
+        return " ".join(words)[:size]
+
+    async def _sleep(self, latency_ms: float, jitter_ms: float) -> None:
+        delay = latency_ms + (self._random.uniform(-jitter_ms, jitter_ms) if jitter_ms else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000.0)
+
+    @staticmethod
+    async def _body(receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                return b"".join(chunks)
+
+    def _reset(self) -> None:
+        self._stats = {"requests": {}, "throttled": 0, "parser_bytes": 0}
+
+    @staticmethod
+    async def _respond(send, status: int, body: Any, headers: Optional[List[Tuple[bytes, bytes]]] = None) -> None:
+        content = json.dumps(body, separators=(",", ":")).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(content)).encode())]
+                       + (headers or []),
+        })
+        await send({"type": "http.response.body", "body": content})
+
+
+def serve(config: MockConfig, host: str, port: int) -> None:
+    import uvicorn
+
+    uvicorn.run(MockApis(config), host=host, port=port, log_level="warning", access_log=False, lifespan="on")
+
+
+def start_mock_server(config: MockConfig, port: int, host: str = "127.0.0.1") -> subprocess.Popen:
+    """Runs the mock APIs in a separate process, so they never compete with the measured process's CPU."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks", "mock", "--host", host, "--port", str(port), *config.to_args()],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    wait_until_ready(f"http://{host}:{port}/__stats", process)
+    return process
+
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited with code {process.returncode} before becoming ready")
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f"{url} did not become ready within {timeout:.0f}s")
@@ -0,0 +1,525 @@
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import json
+import math
+import os
+import platform
+import queue
+import resource
+import shutil
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import httpx
+from .MockServer import MockConfig, start_mock_server, wait_until_ready
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+SCHEMA_VERSION = 1
+
+MODES = ("orchestrator", "http")
+SERVERS = ("prefork", "uvicorn")
+
+
+@dataclass
+class Scenario:
+    """Everything that shapes a run. Two result files are only comparable when their scenarios match."""
+    modes: List[str] = field(default_factory=lambda: list(MODES))
+    providers: List[str] = field(default_factory=lambda: ["facebook", "twitter"])
+    concurrency: List[int] = field(default_factory=lambda: [1, 8, 32])
+    runs: int = 64  # measured account scrapes per concurrency level (raised to the level when lower)
+    rate_limits: bool = False  # keep the service's real per-platform rate limits instead of lifting them
+    log_level: str = "WARNING"
+    poll_interval: float = 0.01  # how often the HTTP driver polls /jobs/{id}
+    mock: MockConfig = field(default_factory=MockConfig)
+
+
+@dataclass
+class StartupScenario:
+    """Cold start and memory of the production server at each worker count."""
+    servers: List[str] = field(default_factory=lambda: list(SERVERS))
+    workers: List[int] = field(default_factory=lambda: [1, 2, 4])
+    repeat: int = 3  # starts per level; medians are reported
+
+
+# ---------- Suite ----------
+def run_suite(scenario: Scenario, output: Optional[str] = None) -> str:
+    """Runs every mode at every concurrency level and writes one JSON result file; returns its path."""
+    mock_port = _free_port()
+    mock = start_mock_server(scenario.mock, mock_port)
+    results = []
+    try:
+        for mode in scenario.modes:
+            for concurrency in scenario.concurrency:
+                runs = max(scenario.runs, concurrency)
+                print(f"[Benchmark] {mode} x{concurrency} ({runs} runs)...", file=sys.stderr)
+                with tempfile.TemporaryDirectory(prefix="scrapper-bench-") as workdir:
+                    env = _service_env(scenario, f"http://127.0.0.1:{mock_port}", workdir, concurrency)
+                    _mock_call(mock_port, "POST", "/__reset")
+                    match(mode):
+                        case "orchestrator":
+                            result = _run_worker(scenario, env, concurrency, runs)
+                        case "http":
+                            result = _run_http(scenario, env, concurrency, runs)
+                        case _:
+                            raise ValueError(f"Unknown mode: {mode}")
+                    mock_stats = _mock_call(mock_port, "GET", "/__stats")
+                result.update(mode=mode, concurrency=concurrency,
+                              throttled=mock_stats["throttled"], parser_bytes=mock_stats["parser_bytes"])
+                results.append(result)
+                print(f"[Benchmark]   {_summary_line(result)}", file=sys.stderr)
+    finally:
+        mock.terminate()
+        mock.wait()
+    return _write_results("throughput", asdict(scenario), results, output)
+
+
+def _write_results(kind: str, scenario: Dict[str, Any], results: List[Dict[str, Any]], output: Optional[str]) -> str:
+    document = {
+        "schema": SCHEMA_VERSION,
+        "kind": kind,
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "scenario": scenario,
+        "results": results,
+    }
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        name = (document["commit"] or "unknown")[:12] + ("-dirty" if document["dirty"] else "")
+        suffix = "" if kind == "throughput" else f"-{kind}"
+        output = os.path.join(RESULTS_DIR, f"{name}{suffix}.json")
+    with open(output, "w") as f:
+        json.dump(document, f, indent=2)
+    return output
+
+
+def _service_env(scenario: Scenario, mock_url: str, workdir: str, concurrency: int) -> Dict[str, str]:
+    """Environment for the measured process: every dependency points at the mock, every store lives in `workdir`."""
+    env = dict(os.environ)
+    env.update({
+        "SOCIAL_AUTHENTICATOR_URL": mock_url,
+        "PARSER_URL": mock_url,
+        "FACEBOOK_GRAPH_URL": f"{mock_url}/v23.0",
+        "TWITTER_API_URL": f"{mock_url}/2",
+        "CHECKPOINT_DB_PATH": os.path.join(workdir, "checkpoints.db"),
+        "OUTBOX_DB_PATH": os.path.join(workdir, "outbox.db"),
+        "DEDUP_DB_PATH": os.path.join(workdir, "dedup.db"),
+        "SCHEDULE_DB_PATH": os.path.join(workdir, "schedules.db"),
+        "SERVER_LEADER_LOCK_PATH": os.path.join(workdir, "leader.lock"),
+        "SCHEDULER_ENABLED": "false",
+        "JOB_WORKERS": str(max(concurrency, int(env.get("JOB_WORKERS", "50")))),
+        "FACEBOOK_PAGE_SIZE": str(scenario.mock.page_size),
+        "LOG_LEVEL": scenario.log_level,
+        "PYTHONPATH": REPO_ROOT,
+    })
+    if not scenario.rate_limits:
+        for bucket in ("FACEBOOK_PLATFORM", "FACEBOOK_APP", "FACEBOOK_USER", "TWITTER_PLATFORM", "TWITTER_APP",
+                       "TWITTER_USER", "AUTHENTICATOR_PLATFORM"):
+            env[f"{bucket}_RPS"] = "1000000"
+            env[f"{bucket}_BURST"] = "1000000"
+    return env
+
+
+def _tokens(providers: List[str], count: int, offset: int = 0) -> List[str]:
+    """One distinct account per run, so every scrape starts cold (no checkpoint, nothing deduplicated)."""
+    return [f"bench-{providers[i % len(providers)]}-{offset + i}" for i in range(count)]
+
+
+# ---------- Orchestrator Mode ----------
+def _run_worker(scenario: Scenario, env: Dict[str, str], concurrency: int, runs: int) -> Dict[str, Any]:
+    """Runs the level in a fresh interpreter, so peak RSS and CPU time belong to this level alone."""
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks", "worker", "--concurrency", str(concurrency), "--runs", str(runs),
+         "--providers", ",".join(scenario.providers)],
+        cwd=REPO_ROOT, env=env, stdout=subprocess.PIPE, check=True,
+    )
+    return json.loads(completed.stdout.decode().strip().splitlines()[-1])
+
+
+def run_worker(providers: List[str], concurrency: int, runs: int) -> Dict[str, Any]:
+    """Entry point of the worker process: drives Orchestrator.run_async for `runs` accounts at `concurrency`."""
+    from Orchestrator import Orchestrator
+    from utils.HttpClient import close_async_clients
+
+    async def scrape(token: str) -> int:
+        orchestrator = await Orchestrator.Orchestrator.create(token=token)
+        timings = await orchestrator.run_async(incremental=False)
+        return sum(t["items"] for t in timings)
+
+    async def main() -> Dict[str, Any]:
+        # One warm-up account outside the measurement: imports, pools and SQLite files are set up here.
+        await scrape(_tokens(providers, 1, offset=runs)[0])
+        limit = asyncio.Semaphore(concurrency)
+        latencies: List[float] = []
+        errors = 0
+        posts = 0
+
+        async def one(token: str) -> None:
+            nonlocal errors, posts
+            async with limit:
+                started = time.perf_counter()
+                try:
+                    items = await scrape(token)
+                except Exception:
+                    errors += 1
+                    return
+                latencies.append(time.perf_counter() - started)
+                posts += items
+
+        cpu_started, started = time.process_time(), time.perf_counter()
+        await asyncio.gather(*(one(token) for token in _tokens(providers, runs)))
+        elapsed, cpu = time.perf_counter() - started, time.process_time() - cpu_started
+        await close_async_clients()
+        return _measurements(latencies, errors, posts, elapsed, cpu, _own_peak_rss_mb())
+
+    return asyncio.run(main())
+
+
+# ---------- HTTP Mode ----------
+def _run_http(scenario: Scenario, env: Dict[str, str], concurrency: int, runs: int) -> Dict[str, Any]:
+    """Starts the service under uvicorn and drives POST /scrape + GET /jobs/{id} from this process."""
+    port = _free_port()
+    service = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning", "--no-access-log"],
+        cwd=REPO_ROOT, env=env,
+    )
+    try:
+        base = f"http://127.0.0.1:{port}"
+        wait_until_ready(f"{base}/health", service)
+        return asyncio.run(_drive_http(base, service.pid, scenario, concurrency, runs))
+    finally:
+        service.terminate()
+        service.wait()
+
+
+async def _drive_http(base: str, pid: int, scenario: Scenario, concurrency: int, runs: int) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency * 2)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=300) as client:
+
+        async def scrape(token: str) -> Tuple[float, float, int]:
+            started = time.perf_counter()
+            response = await client.post("/scrape", json={"app_token": token, "full_refresh": True})
+            response.raise_for_status()
+            submitted = time.perf_counter() - started
+            job_id = response.json()["job_id"]
+            while True:
+                job = (await client.get(f"/jobs/{job_id}")).json()["job"]
+                if job["status"] in ("succeeded", "failed"):
+                    break
+                await asyncio.sleep(scenario.poll_interval)
+            if job["status"] != "succeeded":
+                raise RuntimeError(job["error"])
+            return time.perf_counter() - started, submitted, sum(t["items"] for t in job["timings"])
+
+        await scrape(_tokens(scenario.providers, 1, offset=runs)[0])
+        limit = asyncio.Semaphore(concurrency)
+        latencies: List[float] = []
+        submit_latencies: List[float] = []
+        errors = 0
+        posts = 0
+
+        async def one(token: str) -> None:
+            nonlocal errors, posts
+            async with limit:
+                try:
+                    latency, submitted, items = await scrape(token)
+                except Exception:
+                    errors += 1
+                    return
+                latencies.append(latency)
+                submit_latencies.append(submitted)
+                posts += items
+
+        cpu_started, started = _process_cpu_seconds(pid), time.perf_counter()
+        await asyncio.gather(*(one(token) for token in _tokens(scenario.providers, runs)))
+        elapsed = time.perf_counter() - started
+        cpu_finished = _process_cpu_seconds(pid)
+
+    cpu = cpu_finished - cpu_started if cpu_started is not None and cpu_finished is not None else None
+    result = _measurements(latencies, errors, posts, elapsed, cpu, _process_peak_rss_mb(pid))
+    result["submit_latency_ms"] = _percentiles(submit_latencies)
+    return result
+
+
+# ---------- Startup ----------
+def run_startup(scenario: StartupScenario, output: Optional[str] = None) -> str:
+    """
+    Starts the production server `repeat` times per server and worker count, and writes one JSON result
+    file; returns its path. `prefork` is serve.py, `uvicorn` is `uvicorn --workers` (one import per worker).
+    """
+    results = []
+    with tempfile.TemporaryDirectory(prefix="scrapper-bench-") as workdir:
+        env = _startup_env(workdir)
+        import_seconds = statistics.median(_import_seconds(env) for _ in range(scenario.repeat))
+        print(f"[Benchmark] import main: {import_seconds * 1000:.0f} ms", file=sys.stderr)
+        for server in scenario.servers:
+            for workers in scenario.workers:
+                print(f"[Benchmark] {server} x{workers} ({scenario.repeat} starts)...", file=sys.stderr)
+                samples = [_start_server(server, workers, env) for _ in range(scenario.repeat)]
+                result = {key: _median([sample[key] for sample in samples]) for key in samples[0]}
+                result.update(mode=server, workers=workers, import_seconds=round(import_seconds, 3))
+                results.append(result)
+                print(f"[Benchmark]   {_startup_line(result)}", file=sys.stderr)
+    return _write_results("startup", asdict(scenario), results, output)
+
+
+def _startup_env(workdir: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        "CHECKPOINT_DB_PATH": os.path.join(workdir, "checkpoints.db"),
+        "OUTBOX_DB_PATH": os.path.join(workdir, "outbox.db"),
+        "DEDUP_DB_PATH": os.path.join(workdir, "dedup.db"),
+        "SCHEDULE_DB_PATH": os.path.join(workdir, "schedules.db"),
+        "SERVER_LEADER_LOCK_PATH": os.path.join(workdir, "leader.lock"),
+        "SERVER_HOST": "127.0.0.1",
+        # Nothing polls /jobs here, so the per-worker in-memory queue is fine.
+        "SERVER_REQUIRE_SHARED_QUEUE": "false",
+        # Readiness is read from uvicorn's "Application startup complete." lines.
+        "LOG_LEVEL": "INFO",
+        "PYTHONPATH": REPO_ROOT,
+    })
+    env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+    return env
+
+
+def _import_seconds(env: Dict[str, str]) -> float:
+    code = "import time; started = time.perf_counter(); import main; print(time.perf_counter() - started)"
+    completed = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, env=env, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL, check=True)
+    return float(completed.stdout.decode().strip().splitlines()[-1])
+
+
+def _start_server(server: str, workers: int, env: Dict[str, str], timeout: float = 60.0) -> Dict[str, Any]:
+    """One cold start: seconds until every worker finished its lifespan startup, then per-process memory."""
+    port = _free_port()
+    env = dict(env, SERVER_WORKERS=str(workers), SERVER_PORT=str(port))
+    match(server):
+        case "prefork":
+            command = [sys.executable, "serve.py"]
+        case "uvicorn":
+            command = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+                       "--workers", str(workers), "--no-access-log"]
+        case _:
+            raise ValueError(f"Unknown server: {server}")
+
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    lines: "queue.Queue[str]" = queue.Queue()
+    threading.Thread(target=_drain, args=(process.stderr, lines), daemon=True).start()
+    try:
+        ready = 0
+        deadline = time.monotonic() + timeout
+        while ready < workers:
+            if process.poll() is not None:
+                raise RuntimeError(f"{server} exited with code {process.returncode} before becoming ready")
+            try:
+                line = lines.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                raise RuntimeError(f"{server} x{workers} did not become ready within {timeout:.0f}s")
+            if "Application startup complete." in line:
+                ready += 1
+        ready_seconds = time.perf_counter() - started
+        httpx.get(f"http://127.0.0.1:{port}/health", timeout=5).raise_for_status()
+
+        worker_pids = [pid for pid in _children(process.pid) if "resource_tracker" not in _cmdline(pid)]
+        master = _memory_mb(process.pid)
+        # `uvicorn --workers 1` serves from the process it was started as.
+        worker_memory = [_memory_mb(pid) for pid in worker_pids] or [master]
+        return {
+            "ready_seconds": round(ready_seconds, 3),
+            "master_rss_mb": master["rss"] if worker_pids else None,
+            "worker_rss_mb": round(statistics.mean(m["rss"] for m in worker_memory), 1),
+            "worker_pss_mb": round(statistics.mean(m["pss"] for m in worker_memory), 1),
+            "worker_uss_mb": round(statistics.mean(m["uss"] for m in worker_memory), 1),
+            "total_pss_mb": round(sum(m["pss"] for m in worker_memory) + (master["pss"] if worker_pids else 0), 1),
+        }
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def _drain(stream, lines: "queue.Queue[str]") -> None:
+    # Keeps reading after startup too, so a full pipe never blocks the server.
+    for line in stream:
+        lines.put(line.decode(errors="replace"))
+
+
+def _children(pid: int) -> List[int]:
+    children = []
+    for task in os.listdir(f"/proc/{pid}/task"):
+        with open(f"/proc/{pid}/task/{task}/children") as f:
+            children.extend(int(child) for child in f.read().split())
+    return children
+
+
+def _cmdline(pid: int) -> str:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read().replace(b"\0", b" ").decode(errors="replace")
+    except OSError:
+        return ""
+
+
+def _memory_mb(pid: int) -> Dict[str, float]:
+    """RSS, PSS (shared pages split between their users) and USS (pages only this process holds)."""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if rest.strip().endswith("kB"):
+                values[name] = int(rest.split()[0]) / 1024
+    return {"rss": round(values["Rss"], 1), "pss": round(values["Pss"], 1),
+            "uss": round(values["Private_Clean"] + values["Private_Dirty"], 1)}
+
+
+def _median(values: List[Any]) -> Any:
+    present = [value for value in values if value is not None]
+    return round(statistics.median(present), 3) if present else None
+
+
+def _startup_line(result: Dict[str, Any]) -> str:
+    return (f"ready in {result['ready_seconds'] * 1000:.0f} ms, per worker rss {result['worker_rss_mb']} MB / "
+            f"pss {result['worker_pss_mb']} MB / uss {result['worker_uss_mb']} MB, total pss {result['total_pss_mb']} MB")
+
+
+# ---------- Measurements ----------
+def _measurements(latencies: List[float], errors: int, posts: int, elapsed: float, cpu: Optional[float],
+                  peak_rss_mb: Optional[float]) -> Dict[str, Any]:
+    return {
+        "runs": len(latencies),
+        "errors": errors,
+        "posts": posts,
+        "seconds": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "posts_per_second": round(posts / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": _percentiles(latencies),
+        "peak_rss_mb": peak_rss_mb,
+        "cpu_ms_per_post": round(cpu * 1000 / posts, 4) if cpu is not None and posts else None,
+    }
+
+
+def _percentiles(samples: List[float]) -> Dict[str, Optional[float]]:
+    """Nearest-rank p50/p95/p99 and max, in milliseconds."""
+    ordered = sorted(samples)
+
+    def rank(p: float) -> Optional[float]:
+        if not ordered:
+            return None
+        return round(ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)] * 1000, 2)
+
+    return {"p50": rank(50), "p95": rank(95), "p99": rank(99), "max": rank(100)}
+
+
+def _own_peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _process_peak_rss_mb(pid: int) -> Optional[float]:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def _process_cpu_seconds(pid: int) -> Optional[float]:
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    # utime and stime are fields 14 and 15 of /proc/<pid>/stat (11 and 12 after the command name).
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+# ---------- Comparison ----------
+THROUGHPUT_METRICS = [("rps", lambda r: r["rps"]), ("p50 ms", lambda r: r["latency_ms"]["p50"]),
+                      ("p95 ms", lambda r: r["latency_ms"]["p95"]), ("p99 ms", lambda r: r["latency_ms"]["p99"]),
+                      ("rss MB", lambda r: r["peak_rss_mb"]), ("cpu ms/post", lambda r: r["cpu_ms_per_post"])]
+STARTUP_METRICS = [("ready s", lambda r: r["ready_seconds"]), ("import s", lambda r: r["import_seconds"]),
+                   ("worker pss MB", lambda r: r["worker_pss_mb"]), ("worker uss MB", lambda r: r["worker_uss_mb"]),
+                   ("total pss MB", lambda r: r["total_pss_mb"])]
+
+def compare(baseline_path: str, candidate_path: str) -> str:
+    """Side-by-side table of two result files, with the relative change of every metric."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    with open(candidate_path) as f:
+        candidate = json.load(f)
+
+    lines = [f"baseline  {baseline['commit'][:12]}{' (dirty)' if baseline['dirty'] else ''}  {baseline['created_at']}",
+             f"candidate {candidate['commit'][:12]}{' (dirty)' if candidate['dirty'] else ''}  {candidate['created_at']}"]
+    differing = sorted(key for key in set(baseline["scenario"]) | set(candidate["scenario"])
+                       if baseline["scenario"].get(key) != candidate["scenario"].get(key))
+    if differing:
+        lines.append(f"WARNING: scenarios differ in {', '.join(differing)}; numbers are not comparable")
+    if baseline["machine"] != candidate["machine"]:
+        lines.append("WARNING: results come from different machines or Python versions")
+
+    kind = candidate.get("kind", "throughput")
+    if baseline.get("kind", "throughput") != kind:
+        lines.append(f"ERROR: cannot compare a {baseline.get('kind', 'throughput')} result with a {kind} result")
+        return "\n".join(lines)
+    metrics, level = (STARTUP_METRICS, "workers") if kind == "startup" else (THROUGHPUT_METRICS, "concurrency")
+    by_key = {(r["mode"], r[level]): r for r in baseline["results"]}
+    lines.append("")
+    lines.append(f"{'level':<18}" + "".join(f"{name:>28}" for name, _ in metrics))
+    for result in candidate["results"]:
+        key = (result["mode"], result[level])
+        before = by_key.get(key)
+        cells = []
+        for _, metric in metrics:
+            new = metric(result)
+            old = metric(before) if before else None
+            change = f"{(new - old) / old * 100:+.1f}%" if old and new is not None else "n/a"
+            cells.append(f"{_fmt(old):>10} -> {_fmt(new):<9} {change:>6}")
+        lines.append(f"{key[0] + ' x' + str(key[1]):<18}" + "".join(f"{cell:>28}" for cell in cells))
+    return "\n".join(lines)
+
+
+def _fmt(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:g}"
+
+
+def _summary_line(result: Dict[str, Any]) -> str:
+    latency = result["latency_ms"]
+    return (f"{result['rps']} runs/s, {result['posts_per_second']} posts/s, p50 {latency['p50']} ms, "
+            f"p95 {latency['p95']} ms, p99 {latency['p99']} ms, rss {result['peak_rss_mb']} MB, "
+            f"cpu {result['cpu_ms_per_post']} ms/post, {result['errors']} errors, {result['throttled']} throttled")
+
+
+# ---------- Helpers ----------
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _mock_call(port: int, method: str, path: str) -> Dict[str, Any]:
+    return httpx.request(method, f"http://127.0.0.1:{port}{path}", timeout=10).json()
+
+
+def _git(*args: str) -> str:
+    if shutil.which("git") is None:
+        return ""
+    completed = subprocess.run(["git", *args], cwd=REPO_ROOT, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    return completed.stdout.decode().strip()
@@ -0,0 +1,2 @@
+from .MockServer import MockApis, MockConfig, start_mock_server
+from .Runner import Scenario, StartupScenario, run_suite, run_startup, compare
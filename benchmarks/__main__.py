@@ -0,0 +1,76 @@
+from dataclasses import fields
+import argparse
+import json
+import sys
+from .MockServer import MockConfig, serve
+from .Runner import MODES, SERVERS, Scenario, StartupScenario, compare, run_startup, run_suite, run_worker
+
+
+def _csv(cast):
+    return lambda value: [cast(item) for item in value.split(",") if item]
+
+
+def _add_mock_options(parser: argparse.ArgumentParser) -> None:
+    for option in fields(MockConfig):
+        parser.add_argument(f"--{option.name.replace('_', '-')}", type=type(option.default), default=option.default)
+
+
+def _mock_config(args: argparse.Namespace) -> MockConfig:
+    return MockConfig(**{option.name: getattr(args, option.name) for option in fields(MockConfig)})
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Offline throughput benchmarks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the suite against the mock APIs and write a result file")
+    run.add_argument("--modes", type=_csv(str), default=list(MODES), help="orchestrator,http")
+    run.add_argument("--providers", type=_csv(str), default=["facebook", "twitter"])
+    run.add_argument("--concurrency", type=_csv(int), default=[1, 8, 32])
+    run.add_argument("--runs", type=int, default=64, help="measured account scrapes per concurrency level")
+    run.add_argument("--rate-limits", action="store_true", help="keep the service's real rate limits")
+    run.add_argument("--log-level", default="WARNING")
+    run.add_argument("--output", help="result file (default: benchmarks/results/<commit>.json)")
+    _add_mock_options(run)
+
+    startup = commands.add_parser("startup", help="measure cold start and per-worker memory of the production server")
+    startup.add_argument("--servers", type=_csv(str), default=list(SERVERS), help="prefork,uvicorn")
+    startup.add_argument("--workers", type=_csv(int), default=[1, 2, 4])
+    startup.add_argument("--repeat", type=int, default=3, help="starts per level (medians are reported)")
+    startup.add_argument("--output", help="result file (default: benchmarks/results/<commit>-startup.json)")
+
+    diff = commands.add_parser("compare", help="compare two result files")
+    diff.add_argument("baseline")
+    diff.add_argument("candidate")
+
+    mock = commands.add_parser("mock", help="serve the mock APIs in the foreground")
+    mock.add_argument("--host", default="127.0.0.1")
+    mock.add_argument("--port", type=int, default=9100)
+    _add_mock_options(mock)
+
+    worker = commands.add_parser("worker")  # internal: one orchestrator-mode level, result as JSON on stdout
+    worker.add_argument("--providers", type=_csv(str), required=True)
+    worker.add_argument("--concurrency", type=int, required=True)
+    worker.add_argument("--runs", type=int, required=True)
+
+    args = parser.parse_args(argv)
+    match(args.command):
+        case "run":
+            scenario = Scenario(modes=args.modes, providers=args.providers, concurrency=args.concurrency,
+                                runs=args.runs, rate_limits=args.rate_limits, log_level=args.log_level,
+                                mock=_mock_config(args))
+            print(run_suite(scenario, args.output))
+        case "startup":
+            scenario = StartupScenario(servers=args.servers, workers=args.workers, repeat=args.repeat)
+            print(run_startup(scenario, args.output))
+        case "compare":
+            print(compare(args.baseline, args.candidate))
+        case "mock":
+            serve(_mock_config(args), args.host, args.port)
+        case "worker":
+            print(json.dumps(run_worker(args.providers, args.concurrency, args.runs)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,200 @@
 # config.py
 from dotenv import load_dotenv
+from types import MappingProxyType, ModuleType
 import os
+import sys
 
 load_dotenv()  # Loads variables from .env into environment
 
+
+def _freeze(value):
+    """Read-only view of a nested setting: dicts become mappingproxies, lists become tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
 APP_ID = os.getenv("FACEBOOK_APP_ID", "")
 APP_SECRET = os.getenv("FACEBOOK_APP_SECRET", "")
 SCOPE = os.getenv("SCOPE", "")
 PARSER_URL = os.getenv("PARSER_URL", "")
 SOCIAL_AUTHENTICATOR_URL = os.getenv("SOCIAL_AUTHENTICATOR_URL", "")
+FACEBOOK_GRAPH_URL = os.getenv("FACEBOOK_GRAPH_URL", "https://graph.facebook.com/v23.0")
+TWITTER_API_URL = os.getenv("TWITTER_API_URL", "https://api.x.com/2")
+
+# Job queue
+JOB_QUEUE_BACKEND = os.getenv("JOB_QUEUE_BACKEND", "memory")  # "memory" or "redis"
+JOB_QUEUE_MAX_SIZE = int(os.getenv("JOB_QUEUE_MAX_SIZE", "1000"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "50"))
+JOB_RESULT_TTL = int(os.getenv("JOB_RESULT_TTL", "86400"))  # seconds a finished job stays queryable
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Facebook pagination
+FACEBOOK_PAGE_SIZE = int(os.getenv("FACEBOOK_PAGE_SIZE", "25"))
+FACEBOOK_COMMENTS_PAGE_SIZE = int(os.getenv("FACEBOOK_COMMENTS_PAGE_SIZE", "25"))
+FACEBOOK_MAX_COMMENT_PAGES = int(os.getenv("FACEBOOK_MAX_COMMENT_PAGES", "10"))
+FACEBOOK_PAGE_TIMEOUT = float(os.getenv("FACEBOOK_PAGE_TIMEOUT", "60"))
+# Comment expansion: posts with more comments (or replies) than the embedded page get their full comment
+# stream fetched through Graph batch requests.
+FACEBOOK_COMMENTS_EXPAND_PAGE_SIZE = int(os.getenv("FACEBOOK_COMMENTS_EXPAND_PAGE_SIZE", "100"))
+FACEBOOK_BATCH_SIZE = min(int(os.getenv("FACEBOOK_BATCH_SIZE", "50")), 50)  # Graph accepts at most 50 per batch
+FACEBOOK_BATCH_CONCURRENCY = int(os.getenv("FACEBOOK_BATCH_CONCURRENCY", "4"))
+
+# Parser push
+PARSER_CHUNK_SIZE = int(os.getenv("PARSER_CHUNK_SIZE", "50"))  # posts per pushed batch
+PARSER_MAX_CHUNK_BYTES = int(os.getenv("PARSER_MAX_CHUNK_BYTES", str(1024 * 1024)))  # uncompressed JSON per request
+PARSER_COMPRESSION = os.getenv("PARSER_COMPRESSION", "gzip")  # "gzip", "zstd" or "none"
+PARSER_MAX_RETRIES = int(os.getenv("PARSER_MAX_RETRIES", "3"))
+PARSER_TIMEOUT = float(os.getenv("PARSER_TIMEOUT", "240"))
+
+# Incremental scraping
+CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", "data/checkpoints.db")
+
+# Twitter backfill
+# The user timeline endpoint rejects start_time values before 2010-11-06T00:00:01Z
+TWITTER_BACKFILL_START = os.getenv("TWITTER_BACKFILL_START", "2010-11-06T00:00:01Z")
+TWITTER_BACKFILL_WINDOWS = int(os.getenv("TWITTER_BACKFILL_WINDOWS", "8"))
+TWITTER_BACKFILL_CONCURRENCY = int(os.getenv("TWITTER_BACKFILL_CONCURRENCY", "4"))
+
+# Rate limiting: (requests per second, burst) per platform for the platform-wide, per-app and per-user buckets
+def _rate(name: str, rps: float, burst: int):
+    return float(os.getenv(f"{name}_RPS", rps)), int(os.getenv(f"{name}_BURST", burst))
+
+RATE_LIMITS = _freeze({
+    "facebook": {
+        "platform": _rate("FACEBOOK_PLATFORM", 50, 50),
+        "app": _rate("FACEBOOK_APP", 20, 40),
+        "user": _rate("FACEBOOK_USER", 2, 10),
+    },
+    "twitter": {
+        "platform": _rate("TWITTER_PLATFORM", 50, 50),
+        "app": _rate("TWITTER_APP", 10, 20),
+        "user": _rate("TWITTER_USER", 1, 10),  # user timeline: 900 requests / 15 min
+    },
+    "authenticator": {
+        "platform": _rate("AUTHENTICATOR_PLATFORM", 100, 200),
+    },
+})
+RATE_LIMIT_MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "5"))
+RATE_LIMIT_BACKOFF_BASE = float(os.getenv("RATE_LIMIT_BACKOFF_BASE", "1.0"))
+RATE_LIMIT_BACKOFF_MAX = float(os.getenv("RATE_LIMIT_BACKOFF_MAX", "60"))
+RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "900"))  # longest server-requested pause honoured inline
+
+# Authenticator lookup cache
+AUTH_CACHE_BACKEND = os.getenv("AUTH_CACHE_BACKEND", "memory")  # "memory" or "redis"
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "300"))
+AUTH_CACHE_MAX_SIZE = int(os.getenv("AUTH_CACHE_MAX_SIZE", "10000"))
+
+# HTTP client pools (one pool per host)
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+HTTP_POOL_TIMEOUT = float(os.getenv("HTTP_POOL_TIMEOUT", "10"))  # wait for a free pooled connection
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+# Per-host max connections, e.g. "graph.facebook.com=200,api.x.com=100"
+HTTP_POOL_SIZES = _freeze({
+    host.strip(): int(size)
+    for host, _, size in (item.partition("=") for item in os.getenv("HTTP_POOL_SIZES", "").split(","))
+    if host.strip() and size.strip()
+})
+
+# Parser outbox (durable spool between fetching and the parser push)
+OUTBOX_ENABLED = os.getenv("OUTBOX_ENABLED", "true").lower() == "true"
+OUTBOX_DB_PATH = os.getenv("OUTBOX_DB_PATH", "data/outbox.db")
+OUTBOX_DRAIN_INTERVAL = float(os.getenv("OUTBOX_DRAIN_INTERVAL", "5"))
+OUTBOX_DRAIN_BATCH = int(os.getenv("OUTBOX_DRAIN_BATCH", "20"))
+OUTBOX_BACKOFF_MAX = float(os.getenv("OUTBOX_BACKOFF_MAX", "900"))
+# Delivery attempts after which a still-failing chunk is parked as dead (0: retry until it is delivered)
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "0"))
+OUTBOX_COMPACT_INTERVAL = float(os.getenv("OUTBOX_COMPACT_INTERVAL", "3600"))
+
+# Batch scraping (POST /scrape/batch)
+BATCH_MAX_TOKENS = int(os.getenv("BATCH_MAX_TOKENS", "5000"))
+BATCH_RESOLVE_CONCURRENCY = int(os.getenv("BATCH_RESOLVE_CONCURRENCY", "50"))  # concurrent authenticator lookups
+# Accounts scraped at once per provider, so one platform's backlog cannot starve the others
+BATCH_CONCURRENCY = _freeze({
+    "facebook": int(os.getenv("BATCH_CONCURRENCY_FACEBOOK", "20")),
+    "twitter": int(os.getenv("BATCH_CONCURRENCY_TWITTER", "10")),
+    "instagram": int(os.getenv("BATCH_CONCURRENCY_INSTAGRAM", "10")),
+})
+BATCH_CONCURRENCY_DEFAULT = int(os.getenv("BATCH_CONCURRENCY_DEFAULT", "5"))
+BATCH_PROGRESS_INTERVAL = float(os.getenv("BATCH_PROGRESS_INTERVAL", "1"))  # seconds between saved progress updates
+
+# Cross-run deduplication (only posts whose content hash changed are pushed again)
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+DEDUP_DB_PATH = os.getenv("DEDUP_DB_PATH", "data/dedup.db")
+DEDUP_CACHE_SIZE = int(os.getenv("DEDUP_CACHE_SIZE", "100000"))  # (platform, post id) hashes kept in memory
+
+# Scheduler (periodic incremental scrapes per account)
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+SCHEDULE_DB_PATH = os.getenv("SCHEDULE_DB_PATH", "data/schedules.db")
+SCHEDULE_DEFAULT_INTERVAL = float(os.getenv("SCHEDULE_DEFAULT_INTERVAL", "3600"))
+SCHEDULE_MIN_INTERVAL = float(os.getenv("SCHEDULE_MIN_INTERVAL", "300"))  # floor for very active accounts
+SCHEDULE_MAX_INTERVAL = float(os.getenv("SCHEDULE_MAX_INTERVAL", "86400"))  # ceiling for dormant accounts
+SCHEDULE_JITTER = float(os.getenv("SCHEDULE_JITTER", "0.1"))  # ± fraction applied to every interval
+SCHEDULE_TICK = float(os.getenv("SCHEDULE_TICK", "5"))
+SCHEDULE_BATCH = int(os.getenv("SCHEDULE_BATCH", "100"))  # due schedules claimed per tick
+SCHEDULE_STARTUP_SPREAD = float(os.getenv("SCHEDULE_STARTUP_SPREAD", "300"))  # overdue runs are spread over this on start
+SCHEDULE_LEASE = float(os.getenv("SCHEDULE_LEASE", "3600"))  # a dispatched run not reported back by then is retried
+# Scheduled runs dispatched per minute per provider, paced evenly instead of in bursts
+SCHEDULE_DISPATCH_PER_MINUTE = _freeze({
+    "facebook": float(os.getenv("SCHEDULE_FACEBOOK_PER_MINUTE", "60")),
+    "twitter": float(os.getenv("SCHEDULE_TWITTER_PER_MINUTE", "30")),
+    "instagram": float(os.getenv("SCHEDULE_INSTAGRAM_PER_MINUTE", "30")),
+})
+SCHEDULE_DISPATCH_PER_MINUTE_DEFAULT = float(os.getenv("SCHEDULE_DEFAULT_PER_MINUTE", "30"))
+
+# Logging
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # "json" or "text"
+
+# Circuit breakers and bulkheads, one per downstream dependency
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))  # consecutive failures that open it
+BREAKER_RECOVERY_TIMEOUT = float(os.getenv("BREAKER_RECOVERY_TIMEOUT", "30"))  # seconds open before a trial call
+BREAKER_HALF_OPEN_CALLS = int(os.getenv("BREAKER_HALF_OPEN_CALLS", "1"))  # trial calls let through while half-open
+# Concurrent in-flight calls per dependency; callers wait at most BULKHEAD_MAX_WAIT for a slot
+BULKHEAD_LIMITS = _freeze({
+    "authenticator": int(os.getenv("BULKHEAD_AUTHENTICATOR", "50")),
+    "facebook": int(os.getenv("BULKHEAD_FACEBOOK", "100")),
+    "twitter": int(os.getenv("BULKHEAD_TWITTER", "50")),
+    "parser": int(os.getenv("BULKHEAD_PARSER", "20")),
+})
+BULKHEAD_DEFAULT = int(os.getenv("BULKHEAD_DEFAULT", "20"))
+BULKHEAD_MAX_WAIT = float(os.getenv("BULKHEAD_MAX_WAIT", "10"))
+# Dependencies whose open breaker makes /health return 503. Only the internal services: every replica shares the
+# same external platforms, so failing readiness on their outage would take the whole fleet out of rotation. The
+# platforms' breakers are still reported in the /health body.
+HEALTH_CRITICAL_DEPENDENCIES = tuple(
+    name.strip() for name in os.getenv("HEALTH_CRITICAL_DEPENDENCIES", "authenticator,parser").split(",")
+    if name.strip()
+)
+
+# Production server (serve.py): the app is imported once, then SERVER_WORKERS processes are forked from it
+SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
+SERVER_WORKERS = max(int(os.getenv("SERVER_WORKERS", "1")), 1)
+SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", "2048"))
+SERVER_GRACEFUL_TIMEOUT = float(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30"))  # seconds workers get to finish on shutdown
+SERVER_ACCESS_LOG = os.getenv("SERVER_ACCESS_LOG", "false").lower() == "true"
+# Several workers need a shared job queue (JOB_QUEUE_BACKEND=redis): with the in-memory one, GET /jobs/{id}
+# only finds jobs queued on the worker that happens to answer.
+SERVER_REQUIRE_SHARED_QUEUE = os.getenv("SERVER_REQUIRE_SHARED_QUEUE", "true").lower() == "true"
+# Only the worker holding this lock runs the scheduler loop and the outbox drainer
+SERVER_LEADER_LOCK_PATH = os.getenv("SERVER_LEADER_LOCK_PATH", "data/leader.lock")
+
+
+# Settings are read once per process (before serve.py forks, once in total) and are read-only afterwards:
+# assigning one at runtime would silently diverge between workers, so it raises instead.
+class _FrozenConfig(ModuleType):
+    def __setattr__(self, name, value):
+        raise AttributeError(f"config.Config.{name} is read-only; set it in the environment or .env instead")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"config.Config.{name} is read-only")
+
+
+sys.modules[__name__].__class__ = _FrozenConfig
@@ -7,4 +7,23 @@ class AuthenticationError(Exception):
 class ScraperError(Exception):
     def __init__(self, message="Scraping failed"):
         self.message = message
-        super().__init__(self.message)        
\ No newline at end of file
+        super().__init__(self.message)        
+
+
+class QueueFullError(Exception):
+    def __init__(self, message="Job queue is full"):
+        self.message = message
+        super().__init__(self.message)
+
+
+class ParserPushError(ScraperError):
+    def __init__(self, message="Pushing data to the parser failed", report=None):
+        self.report = report or {}
+        super().__init__(message)
+
+
+class DependencyUnavailableError(Exception):
+    def __init__(self, message="Dependency unavailable", retry_after=None):
+        self.retry_after = retry_after
+        self.message = message
+        super().__init__(self.message)
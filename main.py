@@ -1,13 +1,81 @@
-from pydantic import BaseModel, model_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import Optional, List
-from Orchestrator import Orchestrator
-from Scrapper import Scrapper
+from datetime import datetime, timezone
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
+import asyncio
+from fastapi.responses import JSONResponse, Response
 from fastapi.requests import Request
-from exceptions.exceptions import AuthenticationError, ScraperError
+from exceptions.exceptions import AuthenticationError, ScraperError, QueueFullError, DependencyUnavailableError
+from utils.HttpClient import open_async_clients, close_async_clients
+from JobQueue import JobManager, BACKFILL, build_backend
+from utils.StorageGateway import get_storage_gateway
+from utils.ParserClient import parser_client
+from utils.OutboxDrainer import OutboxDrainer
+from Scheduler import Scheduler, ScheduleStore
+from utils.CircuitBreaker import dependency_health
+from utils.LeaderLock import LeaderLock
+from utils.Logging import correlation_id, new_correlation_id
+from utils.Metrics import JOB_QUEUE_DEPTH, render
+from config.Config import (
+    JOB_WORKERS,
+    PARSER_URL,
+    SOCIAL_AUTHENTICATOR_URL,
+    FACEBOOK_GRAPH_URL,
+    TWITTER_API_URL,
+    OUTBOX_ENABLED,
+    BATCH_MAX_TOKENS,
+    SCHEDULER_ENABLED,
+    SCHEDULE_DB_PATH,
+    SCHEDULE_MIN_INTERVAL,
+    SCHEDULE_MAX_INTERVAL,
+    HEALTH_CRITICAL_DEPENDENCIES,
+    SERVER_LEADER_LOCK_PATH,
+)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await open_async_clients(PARSER_URL, SOCIAL_AUTHENTICATOR_URL, FACEBOOK_GRAPH_URL, TWITTER_API_URL)
+    # With several server workers, only one runs the background loops; every worker serves the schedule API.
+    app.state.leader_lock = LeaderLock(SERVER_LEADER_LOCK_PATH)
+    leader = app.state.leader_lock.acquire()
+    app.state.job_manager = JobManager(backend=build_backend(), workers=JOB_WORKERS)
+    app.state.outbox_drainer = OutboxDrainer(get_storage_gateway(), parser_client) if OUTBOX_ENABLED and leader else None
+    app.state.scheduler = Scheduler(ScheduleStore(SCHEDULE_DB_PATH), app.state.job_manager) if SCHEDULER_ENABLED else None
+    await app.state.job_manager.start()
+    if app.state.outbox_drainer is not None:
+        await app.state.outbox_drainer.start()
+    if app.state.scheduler is not None and leader:
+        await app.state.scheduler.start()
+    yield
+    if app.state.scheduler is not None:
+        await app.state.scheduler.stop()
+    await app.state.job_manager.stop()
+    if app.state.outbox_drainer is not None:
+        await app.state.outbox_drainer.stop()
+    await close_async_clients()
+    app.state.leader_lock.release()
+
+app = FastAPI(lifespan=lifespan)
+
+@app.middleware("http")
+async def correlation_middleware(request: Request, call_next):
+    """Tags every log line of the request, and of the jobs it queues, with X-Request-ID (or a fresh id)."""
+    request_id = request.headers.get("X-Request-ID") or new_correlation_id()
+    context = correlation_id.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        correlation_id.reset(context)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+def _to_rfc3339(value: Optional[datetime]) -> Optional[str]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 # exception handlers
 @app.exception_handler(AuthenticationError)
@@ -24,9 +92,26 @@ async def scraper_exception_handler(request: Request, exc: ScraperError):
         content={"status": "error", "error_type": "ScraperError", "message": exc.message},
     )    
 
+@app.exception_handler(QueueFullError)
+async def queue_full_exception_handler(request: Request, exc: QueueFullError):
+    return JSONResponse(
+        status_code=429,
+        content={"status": "error", "error_type": "QueueFullError", "message": exc.message},
+    )
+
+@app.exception_handler(DependencyUnavailableError)
+async def dependency_unavailable_exception_handler(request: Request, exc: DependencyUnavailableError):
+    headers = {"Retry-After": str(max(1, round(exc.retry_after)))} if exc.retry_after is not None else None
+    return JSONResponse(
+        status_code=503,
+        content={"status": "error", "error_type": "DependencyUnavailableError", "message": exc.message},
+        headers=headers,
+    )
+
 # Request body schema
 class TokenRequest(BaseModel):
     app_token: str
+    full_refresh: bool = False  # ignore the stored checkpoint and refetch the latest posts
 
     @model_validator(mode="after")
     def at_least_one_token(self):
@@ -34,16 +119,116 @@ class TokenRequest(BaseModel):
             raise ValueError("At least one token must be provided")
         return self
 
+class BatchTokenRequest(BaseModel):
+    app_tokens: List[str] = Field(min_length=1, max_length=BATCH_MAX_TOKENS)
+    full_refresh: bool = False
+
+    @field_validator("app_tokens")
+    @classmethod
+    def unique_tokens(cls, tokens: List[str]):
+        if any(not token for token in tokens):
+            raise ValueError("Tokens must not be empty")
+        if len(set(tokens)) != len(tokens):
+            raise ValueError("Tokens must be unique")
+        return tokens
+
+class BackfillRequest(BaseModel):
+    app_token: str = Field(min_length=1)
+    start_time: Optional[datetime] = None  # defaults to the start of the platform's history
+    end_time: Optional[datetime] = None  # defaults to now
+    windows: Optional[int] = Field(default=None, ge=1, le=64)  # time slices fetched concurrently
+
+class ScheduleRequest(BaseModel):
+    app_token: str = Field(min_length=1)
+    interval_seconds: Optional[float] = Field(default=None, ge=SCHEDULE_MIN_INTERVAL, le=SCHEDULE_MAX_INTERVAL)
+
+def _scheduler_disabled() -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"status": "error", "error_type": "SchedulerDisabled", "message": "Scheduler is disabled (SCHEDULER_ENABLED=false)"},
+    )
+
 @app.get("/health")
 def health_check():
-    return {"status": "success", "message": "service running"}
+    dependencies = dependency_health()
+    open_circuits = [name for name, state in dependencies.items() if state.get("state") == "open"]
+    degraded = [name for name in open_circuits if name in HEALTH_CRITICAL_DEPENDENCIES]
+    if degraded:
+        # 503 lets the load balancer route around this replica until the breakers recover.
+        return JSONResponse(
+            status_code=503,
+            content={"status": "degraded", "message": f"circuit open: {', '.join(degraded)}",
+                     "open_circuits": open_circuits, "dependencies": dependencies},
+        )
+    # An open platform breaker (facebook, twitter) is an upstream outage, not this replica's: stay ready, report it.
+    return {"status": "success", "message": "service running", "open_circuits": open_circuits, "dependencies": dependencies}
 
-@app.post("/scrape")
-def run_scrapper(tokens: TokenRequest):
-    orchestrator = Orchestrator.Orchestrator(token=tokens.app_token)
+@app.get("/outbox")
+async def outbox_status():
+    if not OUTBOX_ENABLED:
+        return {"status": "success", "enabled": False}
+    stats = await asyncio.to_thread(get_storage_gateway().stats)
+    return {"status": "success", "enabled": True, **stats}
 
-    try:
-        orchestrator.run()
-        return {"status": "success"}
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
+@app.get("/metrics")
+async def metrics(request: Request):
+    JOB_QUEUE_DEPTH.set(await request.app.state.job_manager.depth())
+    content, content_type = render()
+    return Response(content=content, media_type=content_type)
+
+@app.post("/scrape", status_code=202)
+async def run_scrapper(tokens: TokenRequest, request: Request):
+    job = await request.app.state.job_manager.submit(token=tokens.app_token, incremental=not tokens.full_refresh)
+    return {"status": "queued", "job_id": job.id}
+
+@app.post("/scrape/batch", status_code=202)
+async def run_batch_scrapper(body: BatchTokenRequest, request: Request):
+    """Scrapes many accounts in one job; poll /jobs/{job_id} for per-token results as they complete."""
+    job = await request.app.state.job_manager.submit_batch(tokens=body.app_tokens, incremental=not body.full_refresh)
+    return {"status": "queued", "job_id": job.id, "accounts": len(body.app_tokens)}
+
+@app.post("/backfill", status_code=202)
+async def run_backfill(body: BackfillRequest, request: Request):
+    job = await request.app.state.job_manager.submit(
+        token=body.app_token,
+        kind=BACKFILL,
+        start_time=_to_rfc3339(body.start_time),
+        end_time=_to_rfc3339(body.end_time),
+        windows=body.windows,
+    )
+    return {"status": "queued", "job_id": job.id}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str, request: Request):
+    job = await request.app.state.job_manager.get(job_id)
+    if job is None:
+        return JSONResponse(
+            status_code=404,
+            content={"status": "error", "error_type": "JobNotFound", "message": f"No job with id {job_id}"},
+        )
+    return {"status": "success", "job": job.to_public_dict()}
+
+@app.post("/schedules", status_code=201)
+async def create_schedule(body: ScheduleRequest, request: Request):
+    """Adds an account to the scheduler; the interval is a baseline that adapts to the account's activity."""
+    if request.app.state.scheduler is None:
+        return _scheduler_disabled()
+    schedule = await request.app.state.scheduler.add(body.app_token, interval=body.interval_seconds)
+    return {"status": "success", "schedule": schedule}
+
+@app.get("/schedules")
+async def list_schedules(request: Request):
+    if request.app.state.scheduler is None:
+        return _scheduler_disabled()
+    return {"status": "success", "schedules": await request.app.state.scheduler.list()}
+
+@app.delete("/schedules/{schedule_id}")
+async def delete_schedule(schedule_id: str, request: Request):
+    if request.app.state.scheduler is None:
+        return _scheduler_disabled()
+    if not await request.app.state.scheduler.remove(schedule_id):
+        return JSONResponse(
+            status_code=404,
+            content={"status": "error", "error_type": "ScheduleNotFound", "message": f"No schedule with id {schedule_id}"},
+        )
+    return {"status": "success"}
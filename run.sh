@@ -1,4 +1,8 @@
 #!/bin/sh
 
-# Run FastAPI with Uvicorn using uv
-uv run uvicorn main:app --reload --host 0.0.0.0 --port 8000
+# Development: `./run.sh` runs FastAPI under Uvicorn with auto-reload.
+# Production: `./run.sh prod` imports the app once and pre-forks SERVER_WORKERS workers (see serve.py).
+case "$1" in
+  prod) exec uv run python serve.py ;;
+  *) exec uv run uvicorn main:app --reload --host 0.0.0.0 --port 8000 ;;
+esac
@@ -0,0 +1,214 @@
+"""
+Production entry point: `python serve.py` (or `./run.sh prod`).
+
+The master process imports the application once, binds the listening socket, then forks SERVER_WORKERS
+uvicorn workers that accept on that shared socket. Workers start in milliseconds, since there is nothing
+left to import, and share the master's loaded code and config pages copy-on-write. The master only
+supervises: it restarts workers that die and forwards SIGTERM/SIGINT for a graceful shutdown.
+"""
+from typing import Dict, Optional, Tuple
+import gc
+import glob
+import importlib
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import time
+import uvicorn
+
+from config.Config import (
+    SERVER_HOST,
+    SERVER_PORT,
+    SERVER_WORKERS,
+    SERVER_BACKLOG,
+    SERVER_GRACEFUL_TIMEOUT,
+    SERVER_ACCESS_LOG,
+    SERVER_REQUIRE_SHARED_QUEUE,
+    JOB_QUEUE_BACKEND,
+    LOG_LEVEL,
+)
+
+RESTART_BACKOFF = 1.0  # pause before replacing a worker that died within its first seconds
+MIN_WORKER_LIFETIME = 5.0
+# Imported by the libraries on first use (httpx builds its transports with httpcore); importing them in the
+# master spares every worker the import.
+PRELOAD_MODULES = ("httpcore",)
+
+
+def main() -> int:
+    started = time.perf_counter()
+    metrics_dir = _prepare_metrics_dir()
+    try:
+        return _serve(started)
+    finally:
+        if metrics_dir is not None:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+def _prepare_metrics_dir() -> Optional[str]:
+    """
+    Points prometheus_client at a directory shared by the workers; must run before anything imports it.
+    Returns the directory when this process created it (and so removes it on exit).
+    """
+    if SERVER_WORKERS <= 1:
+        return None
+    metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if metrics_dir:
+        # Files left by a previous run would be merged into this run's counters.
+        for path in glob.glob(os.path.join(metrics_dir, "*.db")):
+            os.remove(path)
+        return None
+    metrics_dir = tempfile.mkdtemp(prefix="scrapper-metrics-")
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = metrics_dir
+    return metrics_dir
+
+
+def _serve(started: float) -> int:
+    from utils.Logging import get_logger
+
+    logger = get_logger("Server")
+    if SERVER_WORKERS > 1 and JOB_QUEUE_BACKEND == "memory" and SERVER_REQUIRE_SHARED_QUEUE:
+        logger.error("SERVER_WORKERS > 1 needs a shared job queue: set JOB_QUEUE_BACKEND=redis "
+                     "(or SERVER_REQUIRE_SHARED_QUEUE=false if nothing polls /jobs)",
+                     extra={"workers": SERVER_WORKERS, "job_queue_backend": JOB_QUEUE_BACKEND})
+        return 2
+
+    from main import app
+    from utils.HttpClient import ssl_context
+
+    config = uvicorn.Config(app, log_level=LOG_LEVEL.lower(), access_log=SERVER_ACCESS_LOG, lifespan="on",
+                            timeout_graceful_shutdown=SERVER_GRACEFUL_TIMEOUT)
+    config.load()  # protocol classes and middleware are built here once, not in every worker
+    ssl_context()  # likewise the CA bundle the outbound HTTP pools verify with
+    for module in PRELOAD_MODULES:
+        importlib.import_module(module)
+
+    sock = socket.socket(socket.AF_INET6 if ":" in SERVER_HOST else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((SERVER_HOST, SERVER_PORT))
+    sock.listen(SERVER_BACKLOG)
+    sock.set_inheritable(True)
+
+    # Objects created so far live for the whole process; keeping the collector off them keeps their pages shared.
+    gc.collect()
+    gc.freeze()
+    logger.info("Application loaded", extra={"seconds": round(time.perf_counter() - started, 3),
+                                             "workers": SERVER_WORKERS, "host": SERVER_HOST, "port": SERVER_PORT})
+
+    try:
+        return _Supervisor(config, sock, logger).run()
+    finally:
+        sock.close()
+
+
+# ---------- Worker ----------
+class _WorkerServer(uvicorn.Server):
+    """The uvicorn server of one forked worker; logs how long the worker took to become ready."""
+
+    def __init__(self, config: uvicorn.Config, index: int, forked_at: float, logger):
+        super().__init__(config)
+        self._index = index
+        self._forked_at = forked_at
+        self._logger = logger
+
+    async def startup(self, sockets=None) -> None:
+        await super().startup(sockets=sockets)
+        if not self.should_exit:
+            self._logger.info("Worker ready", extra={"worker": self._index, "pid": os.getpid(),
+                                                     "startup_seconds": round(time.monotonic() - self._forked_at, 3)})
+
+
+# ---------- Supervisor ----------
+class _Supervisor:
+    """Forks the workers, replaces the ones that die and stops them all on SIGTERM/SIGINT."""
+
+    def __init__(self, config: uvicorn.Config, sock: socket.socket, logger):
+        self._config = config
+        self._sock = sock
+        self._logger = logger
+        self._workers: Dict[int, Tuple[int, float]] = {}  # pid -> (index, forked_at)
+        self._stopping = False
+        self._deadline: Optional[float] = None
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        for index in range(SERVER_WORKERS):
+            self._spawn(index)
+
+        while self._workers:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                if self._deadline is not None and time.monotonic() > self._deadline:
+                    self._logger.warning("Workers did not stop in time, killing them",
+                                         extra={"workers": len(self._workers)})
+                    self._signal_workers(signal.SIGKILL)
+                    self._deadline = None
+                time.sleep(0.2)
+                continue
+            if pid not in self._workers:
+                continue
+            index, forked_at = self._workers.pop(pid)
+            _mark_process_dead(pid)
+            if self._stopping:
+                continue
+            lifetime = time.monotonic() - forked_at
+            self._logger.warning("Worker exited, restarting", extra={"worker": index, "pid": pid,
+                                                                     "exit_status": os.waitstatus_to_exitcode(status),
+                                                                     "lifetime_seconds": round(lifetime, 1)})
+            if lifetime < MIN_WORKER_LIFETIME:
+                time.sleep(RESTART_BACKOFF)
+            if not self._stopping:
+                self._spawn(index)
+        self._logger.info("Stopped")
+        return 0
+
+    def _spawn(self, index: int) -> None:
+        forked_at = time.monotonic()
+        pid = os.fork()
+        if pid == 0:
+            # Own process group: a Ctrl-C in the terminal reaches only the master, which then stops the
+            # workers gracefully instead of every process handling the signal at once.
+            os.setpgid(0, 0)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            code = 0
+            try:
+                _WorkerServer(self._config, index, forked_at, self._logger).run(sockets=[self._sock])
+            except SystemExit as e:
+                # uvicorn exits this way when the lifespan startup fails; it has already logged why.
+                code = e.code if isinstance(e.code, int) else 1
+            except BaseException:
+                self._logger.exception("Worker crashed", extra={"worker": index})
+                code = 1
+            finally:
+                os._exit(code)
+        self._workers[pid] = (index, forked_at)
+
+    def _stop(self, signum, frame) -> None:
+        if self._stopping:
+            return
+        self._stopping = True
+        self._deadline = time.monotonic() + SERVER_GRACEFUL_TIMEOUT + 5
+        self._logger.info("Shutting down", extra={"signal": signal.Signals(signum).name, "workers": len(self._workers)})
+        self._signal_workers(signal.SIGTERM)
+
+    def _signal_workers(self, signum: int) -> None:
+        for pid in list(self._workers):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+
+def _mark_process_dead(pid: int) -> None:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(pid)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+import os
+import sys
+import tempfile
+
+# Settings are read once, at the first import of config.Config: point every store at a scratch
+# directory before any test module imports the service.
+_DATA_DIR = tempfile.mkdtemp(prefix="scrapper-tests-")
+for _name, _file in (("CHECKPOINT_DB_PATH", "checkpoints.db"), ("OUTBOX_DB_PATH", "outbox.db"),
+                     ("DEDUP_DB_PATH", "dedup.db"), ("SCHEDULE_DB_PATH", "schedules.db"),
+                     ("SERVER_LEADER_LOCK_PATH", "leader.lock")):
+    os.environ.setdefault(_name, os.path.join(_DATA_DIR, _file))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,122 @@
+import asyncio
+import httpx
+import pytest
+from exceptions.exceptions import DependencyUnavailableError
+from utils.CircuitBreaker import CircuitBreaker, Dependency, CLOSED, HALF_OPEN, OPEN
+
+
+def _breaker(half_open_calls: int = 1) -> CircuitBreaker:
+    return CircuitBreaker("test", failure_threshold=3, recovery_timeout=30, half_open_calls=half_open_calls)
+
+
+def _cool_down(breaker: CircuitBreaker, seconds: float = 30) -> None:
+    # Ages the current state instead of sleeping through the recovery timeout.
+    breaker._changed_at -= seconds
+
+
+def _open(breaker: CircuitBreaker) -> None:
+    for _ in range(3):
+        breaker.record_failure()
+
+
+def test_opens_after_threshold_consecutive_failures():
+    breaker = _breaker()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN and breaker.is_open
+    assert not breaker.allow()
+    assert breaker.retry_in() == pytest.approx(30, abs=0.1)
+
+
+def test_success_resets_the_failure_count():
+    breaker = _breaker()
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_half_open_after_the_recovery_timeout_lets_one_trial_through():
+    breaker = _breaker()
+    _open(breaker)
+    _cool_down(breaker)
+    assert breaker.state == HALF_OPEN and not breaker.is_open
+
+    assert breaker.allow()
+    assert not breaker.allow()  # the single trial slot is taken
+
+
+def test_successful_trial_closes_the_breaker():
+    breaker = _breaker()
+    _open(breaker)
+    _cool_down(breaker)
+    assert breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert all(breaker.allow() for _ in range(5))
+
+
+def test_failed_trial_reopens_for_a_full_timeout():
+    breaker = _breaker()
+    _open(breaker)
+    _cool_down(breaker)
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.retry_in() == pytest.approx(30, abs=0.1)
+
+
+def test_half_open_trial_limit():
+    breaker = _breaker(half_open_calls=2)
+    _open(breaker)
+    _cool_down(breaker)
+    assert [breaker.allow() for _ in range(3)] == [True, True, False]
+
+
+def test_trials_that_never_report_back_are_released_after_another_timeout():
+    breaker = _breaker()
+    _open(breaker)
+    _cool_down(breaker)
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    _cool_down(breaker)
+    assert breaker.allow()
+
+
+def test_guard_refuses_while_open_and_counts_transport_errors():
+    dependency = Dependency("test-dependency", limit=2)
+
+    async def call(error: Exception = None) -> None:
+        async with dependency.guard():
+            if error is not None:
+                raise error
+
+    async def scenario():
+        for _ in range(dependency.breaker._failure_threshold):
+            with pytest.raises(httpx.ConnectTimeout):
+                await call(httpx.ConnectTimeout("timed out"))
+        with pytest.raises(DependencyUnavailableError) as refused:
+            await call()
+        return refused.value
+
+    refused = asyncio.run(scenario())
+    assert dependency.breaker.state == OPEN
+    assert refused.retry_after > 0
+
+
+def test_observe_counts_only_server_errors_as_failures():
+    dependency = Dependency("test-dependency", limit=2)
+    for _ in range(dependency.breaker._failure_threshold - 1):
+        dependency.observe(503)
+    dependency.observe(404)
+    dependency.observe(503)
+    assert dependency.breaker.state == CLOSED
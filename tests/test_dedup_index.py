@@ -0,0 +1,105 @@
+import asyncio
+import sys
+import pytest
+from SocialMediaScrapper.FacebookScrapper import FacebookScrapper
+from SocialMediaScrapper.Post import Post
+from utils.DedupIndex import DedupIndex, NEW, UPDATED, UNCHANGED
+
+
+class CountingConnection:
+    """Wraps the index's SQLite connection to count the statements that reach the disk."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.executed = 0
+
+    def execute(self, *args):
+        self.executed += 1
+        return self._conn.execute(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = DedupIndex(str(tmp_path / "dedup.db"), cache_size=3)
+    yield index
+    index.close()
+
+
+def test_classify_tells_new_unchanged_and_updated_posts(index):
+    index.record("twitter", [("1", b"a"), ("2", b"b")])
+
+    assert index.classify("twitter", [("1", b"a"), ("2", b"changed"), ("3", b"c")]) == [UNCHANGED, UPDATED, NEW]
+
+
+def test_hashes_are_kept_per_platform(index):
+    index.record("twitter", [("1", b"a")])
+
+    assert index.classify("facebook", [("1", b"a")]) == [NEW]
+
+
+def test_recorded_hashes_survive_a_restart(tmp_path):
+    path = str(tmp_path / "dedup.db")
+    first = DedupIndex(path, cache_size=10)
+    first.record("twitter", [("1", b"a")])
+    first.close()
+
+    second = DedupIndex(path, cache_size=10)
+    assert second.classify("twitter", [("1", b"a"), ("1", b"b")]) == [UNCHANGED, UPDATED]
+    second.close()
+
+
+def test_lookups_larger_than_one_sqlite_query(tmp_path):
+    path = str(tmp_path / "dedup.db")
+    entries = [(str(i), b"h") for i in range(1200)]
+    first = DedupIndex(path, cache_size=10)
+    first.record("twitter", entries)
+    first.close()
+
+    second = DedupIndex(path, cache_size=10)  # a cold cache sends every id to SQLite
+    assert set(second.classify("twitter", entries)) == {UNCHANGED}
+    second.close()
+
+
+def test_lru_front_serves_recent_keys_and_evicts_the_oldest(index):
+    index.record("twitter", [("1", b"a"), ("2", b"b"), ("3", b"c")])
+    index.classify("twitter", [("1", b"a")])  # 1 is now the most recently used
+    index.record("twitter", [("4", b"d")])
+
+    assert list(index._cache) == [("twitter", "3"), ("twitter", "1"), ("twitter", "4")]
+
+    index._conn = connection = CountingConnection(index._conn)
+    assert index.classify("twitter", [("1", b"a"), ("4", b"d")]) == [UNCHANGED, UNCHANGED]
+    assert connection.executed == 0
+    # The evicted key is still known, from SQLite.
+    assert index.classify("twitter", [("2", b"b")]) == [UNCHANGED]
+    assert connection.executed == 1
+
+
+def test_push_skips_unchanged_posts_and_flags_updates(index, monkeypatch):
+    pushes = []
+
+    class FakeParserClient:
+        async def push(self, platform, posts, token, meta_for=None):
+            pushes.append(posts)
+            return {"batch_id": "b", "items": len(posts), "chunks": [], "spooled": 0, "bytes": 0, "sent_bytes": 0}
+
+    monkeypatch.setattr(sys.modules["SocialMediaScrapper.SocialMediaScrapperBase"], "get_dedup_index", lambda: index)
+    monkeypatch.setattr(sys.modules["SocialMediaScrapper.FacebookScrapper"], "parser_client", FakeParserClient())
+    scrapper = FacebookScrapper(app_token="app", client_token="token", social_id="42", name="n", email="e")
+
+    def posts(likes_of_second: int):
+        return [Post.from_facebook({"id": "1", "message": "first"}),
+                Post.from_facebook({"id": "2", "message": "second",
+                                    "reactions": {"summary": {"total_count": likes_of_second}}})]
+
+    first = asyncio.run(scrapper.parse_data_async(posts(1)))
+    second = asyncio.run(scrapper.parse_data_async(posts(2)))
+    third = asyncio.run(scrapper.parse_data_async(posts(2)))
+
+    assert [post["id"] for post in pushes[0]] == ["1", "2"] and first["skipped"] == 0
+    assert [(post["id"], post.get("is_update")) for post in pushes[1]] == [("2", True)]
+    assert (second["skipped"], second["updated"]) == (1, 1)
+    assert len(pushes) == 2 and third["skipped"] == 2
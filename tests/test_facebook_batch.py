@@ -0,0 +1,165 @@
+import asyncio
+import json
+import sys
+from urllib.parse import parse_qs, urlsplit
+import httpx
+import pytest
+from exceptions.exceptions import AuthenticationError
+from SocialMediaScrapper.FacebookScrapper import FacebookScrapper
+
+facebook_module = sys.modules["SocialMediaScrapper.FacebookScrapper"]
+
+
+class FakeGraph:
+    """
+    Graph batch endpoint stub serving `comments[post_id]` two per page. `failures[post_id]` lists batch items
+    (or None for an item Graph drops) returned for that post before it starts answering normally.
+    """
+
+    PAGE_SIZE = 2
+
+    def __init__(self, comments, failures=None):
+        self.comments = comments
+        self.failures = {post_id: list(items) for post_id, items in (failures or {}).items()}
+        self.batches = []
+
+    async def __call__(self, method, url, cost=1, **kwargs):
+        batch = json.loads(kwargs["data"]["batch"])
+        assert method == "POST" and cost == len(batch)
+        self.batches.append([item["relative_url"] for item in batch])
+        items = [self._answer(item["relative_url"]) for item in batch]
+        while items and items[-1] is None:
+            items.pop()  # Graph truncates the batch when it gives up on the trailing requests
+        return httpx.Response(200, json=items, request=httpx.Request(method, url))
+
+    def _answer(self, relative_url):
+        parts = urlsplit(relative_url)
+        post_id = parts.path.split("/")[0]
+        if self.failures.get(post_id):
+            return self.failures[post_id].pop(0)
+        start = int(parse_qs(parts.query).get("after", ["0"])[0])
+        end = start + self.PAGE_SIZE
+        body = {"data": self.comments[post_id][start:end], "paging": {"cursors": {"after": str(end)}}}
+        if end < len(self.comments[post_id]):
+            body["paging"]["next"] = f"https://graph/{post_id}/comments?after={end}"
+        return {"code": 200, "body": json.dumps(body)}
+
+
+def _error(code, error_code=None):
+    return {"code": code, "body": json.dumps({"error": {"code": error_code or code, "message": "failed"}})}
+
+
+def _post(post_id, embedded, total):
+    return {"id": post_id, "comments": {"data": embedded, "summary": {"total_count": total}}}
+
+
+def _comments(post_id, count):
+    return [{"id": f"{post_id}-c{i}", "message": f"comment {i}"} for i in range(count)]
+
+
+@pytest.fixture
+def scrapper(monkeypatch):
+    monkeypatch.setattr(facebook_module, "RATE_LIMIT_BACKOFF_BASE", 0)
+    scrapper = FacebookScrapper(app_token="app", client_token="token", social_id="42", name="n", email="e")
+    scrapper._platform_max_cost = lambda: 50
+    return scrapper
+
+
+def _expand(scrapper, graph, posts):
+    scrapper._platform_request = graph
+    asyncio.run(scrapper._expand_comments(posts))
+
+
+# ---------- Merging ----------
+def test_expansion_merges_every_page_into_its_post(scrapper):
+    stream = _comments("1", 5)
+    embedded_only = {"id": "1-old", "message": "no longer in the stream"}
+    posts = [_post("1", [stream[0], embedded_only], total=6), _post("2", _comments("2", 1), total=1),
+             _post("3", [], total=3)]
+    graph = FakeGraph({"1": stream, "3": _comments("3", 3)})
+
+    _expand(scrapper, graph, posts)
+
+    assert posts[0]["comments"]["data"] == stream + [embedded_only]
+    assert posts[1]["comments"]["data"] == _comments("2", 1)  # complete: never requested
+    assert posts[2]["comments"]["data"] == _comments("3", 3)
+    # One batch per round, each carrying the next page of every unfinished post.
+    assert [[url.split("/")[0] for url in batch] for batch in graph.batches] == [["1", "3"], ["1", "3"], ["1"]]
+
+
+def test_embedded_comments_with_replies_are_expanded(scrapper):
+    stream = _comments("1", 2) + [{"id": "1-r", "message": "reply", "parent": {"id": "1-c0"}}]
+    posts = [_post("1", [dict(stream[0], comment_count=1)], total=2)]
+
+    _expand(scrapper, FakeGraph({"1": stream}), posts)
+
+    assert [comment["id"] for comment in posts[0]["comments"]["data"]] == ["1-c0", "1-c1", "1-r"]
+
+
+# ---------- Retries ----------
+def test_retryable_item_statuses_are_retried(scrapper):
+    posts = [_post(post_id, [], total=2) for post_id in ("1", "2", "3", "4")]
+    graph = FakeGraph({post_id: _comments(post_id, 2) for post_id in ("1", "2", "3", "4")},
+                      failures={"1": [_error(500), _error(503)], "2": [_error(400, error_code=4)],
+                                "3": [_error(429)], "4": [None]})
+
+    _expand(scrapper, graph, posts)
+
+    for post in posts:
+        assert post["comments"]["data"] == _comments(post["id"], 2)
+    assert len(graph.batches) == 3
+
+
+def test_permanent_item_failure_keeps_the_embedded_page(scrapper, monkeypatch):
+    monkeypatch.setattr(facebook_module, "RATE_LIMIT_MAX_RETRIES", 2)
+    posts = [_post("1", _comments("1", 1), total=4), _post("2", [], total=2), _post("3", [], total=2)]
+    graph = FakeGraph({"1": _comments("1", 4), "2": _comments("2", 2), "3": _comments("3", 2)},
+                      failures={"1": [_error(400, error_code=100)], "3": [_error(503)] * 3})
+
+    _expand(scrapper, graph, posts)
+
+    assert posts[0]["comments"]["data"] == _comments("1", 1)
+    assert posts[1]["comments"]["data"] == _comments("2", 2)
+    assert posts[2]["comments"]["data"] == []  # out of retries
+    assert sum(url.startswith("3/") for batch in graph.batches for url in batch) == 3
+
+
+# ---------- Batch sizing ----------
+def test_batches_never_exceed_the_rate_limit_burst(scrapper, monkeypatch):
+    monkeypatch.setattr(facebook_module, "FACEBOOK_BATCH_SIZE", 50)
+    scrapper._platform_max_cost = lambda: 3
+    posts = [_post(str(i), [], total=1) for i in range(7)]
+    graph = FakeGraph({str(i): _comments(str(i), 1) for i in range(7)})
+
+    _expand(scrapper, graph, posts)
+
+    assert sorted(len(batch) for batch in graph.batches) == [1, 3, 3]
+    assert all(len(post["comments"]["data"]) == 1 for post in posts)
+
+
+def test_batches_never_exceed_the_configured_size(scrapper, monkeypatch):
+    monkeypatch.setattr(facebook_module, "FACEBOOK_BATCH_SIZE", 2)
+    posts = [_post(str(i), [], total=1) for i in range(5)]
+
+    graph = FakeGraph({str(i): _comments(str(i), 1) for i in range(5)})
+    _expand(scrapper, graph, posts)
+
+    assert sorted(len(batch) for batch in graph.batches) == [1, 2, 2]
+
+
+# ---------- Token errors ----------
+@pytest.mark.parametrize("item", [_error(401, error_code=102), _error(400, error_code=190)])
+def test_rejected_token_in_a_batch_item_raises(scrapper, item):
+    graph = FakeGraph({"1": _comments("1", 2), "2": _comments("2", 2)}, failures={"2": [item]})
+
+    with pytest.raises(AuthenticationError):
+        _expand(scrapper, graph, [_post("1", [], total=2), _post("2", [], total=2)])
+
+
+def test_rejected_token_on_the_batch_call_raises(scrapper):
+    async def graph(method, url, cost=1, **kwargs):
+        return httpx.Response(400, json={"error": {"code": 190, "message": "Session has expired"}},
+                              request=httpx.Request(method, url))
+
+    with pytest.raises(AuthenticationError):
+        _expand(scrapper, graph, [_post("1", [], total=2)])
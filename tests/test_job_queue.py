@@ -0,0 +1,39 @@
+import asyncio
+import time
+from JobQueue import Job, JobManager, InMemoryJobQueueBackend
+from JobQueue.Job import SUCCEEDED, FAILED
+from Orchestrator import Orchestrator
+
+
+def test_finished_jobs_are_evicted_once_their_ttl_passed():
+    async def scenario():
+        backend = InMemoryJobQueueBackend(max_size=10, result_ttl=60)
+        old = Job(token="", status=SUCCEEDED, finished_at=time.time() - 120)
+        recent = Job(token="", status=FAILED, finished_at=time.time())
+        queued = Job(token="app")
+        for job in (old, recent):
+            await backend.save(job)
+        await backend.enqueue(queued)
+        return [await backend.get(job.id) for job in (old, recent, queued)]
+
+    old, recent, queued = asyncio.run(scenario())
+    assert old is None
+    assert recent is not None and queued is not None
+
+
+def test_finished_job_no_longer_holds_its_app_token(monkeypatch):
+    async def create(token):
+        raise RuntimeError("authenticator down")
+
+    monkeypatch.setattr(Orchestrator.Orchestrator, "create", create)
+
+    async def scenario():
+        backend = InMemoryJobQueueBackend(max_size=10, result_ttl=60)
+        manager = JobManager(backend=backend, workers=1)
+        job = await manager.submit(token="app-token")
+        await manager._run_job(await backend.dequeue())
+        return await backend.get(job.id)
+
+    job = asyncio.run(scenario())
+    assert job.status == FAILED and job.error == "authenticator down"
+    assert job.token == "" and "app-token" not in str(job.to_dict())
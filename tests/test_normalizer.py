@@ -0,0 +1,94 @@
+import hashlib
+import struct
+import pytest
+from SocialMediaScrapper.Post import Post
+from utils.Normalizer import normalizer
+
+
+def _tweet(i: int, **metrics) -> Post:
+    return Post.from_twitter({"id": str(i), "text": f"tweet {i}", "created_at": "2024-10-16T12:00:00.000Z",
+                              "public_metrics": {"like_count": i, **metrics}})
+
+
+def _facebook_post() -> Post:
+    return Post.from_facebook({
+        "id": "1_2",
+        "created_time": "2024-10-16T12:00:00+0000",
+        "message": "hello",
+        "permalink_url": "https://facebook.com/1_2",
+        "attachments": {"data": [{"media_type": "photo", "url": "https://img"}]},
+        "reactions": {"data": [{"id": "9", "type": "LIKE"}], "summary": {"total_count": 7}},
+        "comments": {"data": [{"id": "c1", "message": "hi", "like_count": 2, "from": {"id": "5", "name": "Ann"}}],
+                     "summary": {"total_count": 1}},
+    })
+
+
+def test_metric_columns_are_coerced_once_per_batch():
+    columns = normalizer.columns("twitter", [_tweet(1, retweet_count="3"), _tweet(2, impression_count=None),
+                                             _tweet(3, reply_count=2 ** 70)])
+
+    assert columns.metrics["like_count"].typecode == "q"
+    assert list(columns.metrics["like_count"]) == [1, 2, 3]
+    assert list(columns.metrics["retweet_count"]) == [3, 0, 0]
+    assert list(columns.metrics["impression_count"]) == [0, 0, 0]
+    assert list(columns.metrics["reply_count"]) == [0, 0, 2 ** 63 - 1]
+
+
+def test_twitter_records_match_the_parser_schema():
+    records = normalizer.normalize("twitter", [_tweet(1), _tweet(2)], updated={"2"})
+
+    assert records[0] == {
+        "id": "1",
+        "text": "tweet 1",
+        "created_at": "2024-10-16T12:00:00.000Z",
+        "public_metrics": {"retweet_count": 0, "reply_count": 0, "like_count": 1, "quote_count": 0,
+                           "bookmark_count": 0, "impression_count": 0},
+        "edit_history_tweet_ids": ["1"],
+    }
+    assert "is_update" not in records[0] and records[1]["is_update"] is True
+
+
+def test_facebook_records_match_the_parser_schema():
+    (record,) = normalizer.normalize("facebook", [_facebook_post()])
+
+    assert record == {
+        "id": "1_2",
+        "created_time": "2024-10-16T12:00:00+0000",
+        "permalink_url": "https://facebook.com/1_2",
+        "attachments": {"data": [{"media_type": "photo", "url": "https://img"}]},
+        "reactions": {"data": [{"id": "9", "type": "LIKE"}], "summary": {"total_count": 7}},
+        "comments": {"data": [{"id": "c1", "from": {"name": "Ann", "id": "5"}, "message": "hi", "created_time": "",
+                               "like_count": 2}],
+                     "summary": {"total_count": 1}},
+    }
+
+
+def test_content_hashes_cover_text_and_every_metric():
+    columns = normalizer.columns("facebook", [_facebook_post()])
+
+    expected = hashlib.blake2b(b"hello", digest_size=16)
+    expected.update(struct.pack("<8q", 0, 0, 0, 0, 0, 0, 7, 1))
+    assert columns.content_hashes() == [expected.digest()]
+
+
+def test_take_selects_rows_across_every_column():
+    columns = normalizer.columns("twitter", [_tweet(i) for i in range(5)]).take([1, 3])
+
+    assert columns.ids == ["1", "3"]
+    assert list(columns.metrics["like_count"]) == [1, 3]
+    assert columns.objects["text"] == ["tweet 1", "tweet 3"]
+
+
+def test_arrow_table_has_typed_columns(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    columns = normalizer.columns("facebook", [_facebook_post()])
+    table = columns.to_arrow()
+
+    assert table.schema.field("reaction_count").type == pa.int64()
+    assert table.schema.field("created_at").type == pa.timestamp("ms", tz="UTC")
+    assert table.column("id").to_pylist() == ["1_2"]
+
+    columns.write_parquet(str(tmp_path / "posts.parquet"))
+    assert pq.read_table(str(tmp_path / "posts.parquet")).num_rows == 1
@@ -0,0 +1,151 @@
+import asyncio
+import sys
+import types
+import pytest
+from utils.CircuitBreaker import get_dependency
+from utils.OutboxDrainer import OutboxDrainer
+from utils.ParserClient import ParserClient
+from utils.StorageGateway import StorageGateway
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(sys.modules["utils.StorageGateway"], "time", types.SimpleNamespace(time=clock.time))
+    return clock
+
+
+@pytest.fixture
+def outbox(tmp_path, clock):
+    gateway = StorageGateway(str(tmp_path / "outbox.db"))
+    yield gateway
+    gateway.close()
+
+
+def _chunks(batch_id: str, count: int, items: int = 5):
+    return [{"index": i, "count": count, "items": items, "body": f'{{"batch":"{batch_id}","chunk":{i}}}'.encode()}
+            for i in range(count)]
+
+
+# ---------- Storage Gateway ----------
+def test_stored_chunks_stay_leased_to_the_sender(outbox, clock):
+    outbox.store("b1", "twitter", _chunks("b1", 2), lease=60)
+
+    assert outbox.claim_due(10, lease=60) == []
+    clock.now += 61
+    rows = outbox.claim_due(10, lease=60)
+    assert [(row["batch_id"], row["index"], row["count"]) for row in rows] == [("b1", 0, 2), ("b1", 1, 2)]
+    assert rows[0]["body"] == b'{"batch":"b1","chunk":0}'
+
+
+def test_claim_leases_rows_until_the_lease_expires(outbox, clock):
+    outbox.store("b1", "twitter", _chunks("b1", 1), lease=0)
+
+    assert len(outbox.claim_due(10, lease=30)) == 1
+    assert outbox.claim_due(10, lease=30) == []  # a second drainer must not send it too
+    clock.now += 31
+    assert len(outbox.claim_due(10, lease=30)) == 1  # the holder died: the row is handed out again
+
+
+def test_claim_takes_the_oldest_rows_first_up_to_the_limit(outbox):
+    outbox.store("b1", "twitter", _chunks("b1", 2), lease=0)
+    outbox.store("b2", "facebook", _chunks("b2", 1), lease=0)
+
+    assert [row["batch_id"] for row in outbox.claim_due(2, lease=30)] == ["b1", "b1"]
+    assert [row["batch_id"] for row in outbox.claim_due(2, lease=30)] == ["b2"]
+
+
+def test_ack_retry_and_bury_settle_a_row(outbox, clock):
+    acked, retried, buried = outbox.store("b1", "twitter", _chunks("b1", 3), lease=0)
+
+    outbox.ack(acked)
+    outbox.retry_later(retried, delay=120, error="HTTP 503")
+    outbox.bury(buried, error="HTTP 400")
+
+    assert outbox.claim_due(10, lease=30) == []
+    clock.now += 121
+    (row,) = outbox.claim_due(10, lease=30)
+    assert row["id"] == retried and row["attempts"] == 1
+    outbox.ack(retried)
+    clock.now += 10 ** 9
+    assert outbox.claim_due(10, lease=30) == []  # buried rows are never handed out again
+
+
+def test_stats_count_pending_and_dead_chunks(outbox, clock):
+    first, _ = outbox.store("b1", "twitter", _chunks("b1", 2, items=4), lease=0)
+    clock.now += 30
+    outbox.store("b2", "twitter", _chunks("b2", 1, items=7), lease=0)
+    outbox.bury(first, error="HTTP 400")
+
+    assert outbox.stats() == {"pending_chunks": 2, "pending_items": 11, "dead_chunks": 1, "oldest_age_seconds": 30.0}
+
+
+# ---------- Outbox Drainer ----------
+class FakeClient:
+    """Stands in for ParserClient.deliver_spooled, answering each chunk with a scripted result."""
+
+    settle = staticmethod(ParserClient.settle)
+
+    def __init__(self, results):
+        self.delivered = []
+        self._results = results
+
+    async def deliver_spooled(self, row):
+        self.delivered.append((row["batch_id"], row["index"]))
+        return dict(self._results[row["index"]])
+
+
+OK = {"status": "ok"}
+UNAVAILABLE = {"status": "failed", "error": "HTTP 503", "retryable": True}
+REJECTED = {"status": "failed", "error": "HTTP 400", "retryable": False}
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers(monkeypatch):
+    monkeypatch.setattr(sys.modules["utils.CircuitBreaker"], "_dependencies", {})
+
+
+def test_drainer_delivers_reschedules_and_buries(outbox, clock):
+    outbox.store("b1", "twitter", _chunks("b1", 3), lease=0)
+    client = FakeClient([OK, UNAVAILABLE, REJECTED])
+
+    delivered = asyncio.run(OutboxDrainer(outbox, client).drain_once())
+
+    assert delivered == 1
+    assert client.delivered == [("b1", 0), ("b1", 1), ("b1", 2)]
+    assert outbox.stats()["pending_chunks"] == 1 and outbox.stats()["dead_chunks"] == 1
+    clock.now += 10 ** 6
+    assert [(row["index"], row["attempts"]) for row in outbox.claim_due(10, lease=30)] == [(1, 1)]
+
+
+def test_drainer_buries_a_chunk_after_max_attempts(outbox, clock, monkeypatch):
+    monkeypatch.setattr(sys.modules["utils.ParserClient"], "OUTBOX_MAX_ATTEMPTS", 3)
+    (row_id,) = outbox.store("b1", "twitter", _chunks("b1", 1), lease=0)
+    outbox.retry_later(row_id, delay=0, error="HTTP 503")  # the inline push already failed once
+    drainer = OutboxDrainer(outbox, FakeClient([UNAVAILABLE]))
+
+    asyncio.run(drainer.drain_once())
+    assert outbox.stats()["dead_chunks"] == 0
+    clock.now += 10 ** 4
+    asyncio.run(drainer.drain_once())
+
+    assert outbox.stats() == {"pending_chunks": 0, "pending_items": 0, "dead_chunks": 1, "oldest_age_seconds": 0}
+
+
+def test_drainer_waits_while_the_parser_breaker_is_open(outbox):
+    outbox.store("b1", "twitter", _chunks("b1", 1), lease=0)
+    breaker = get_dependency("parser").breaker
+    for _ in range(breaker._failure_threshold):
+        breaker.record_failure()
+    client = FakeClient([OK])
+
+    assert asyncio.run(OutboxDrainer(outbox, client).drain_once()) == 0
+    assert client.delivered == [] and outbox.stats()["pending_chunks"] == 1
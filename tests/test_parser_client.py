@@ -0,0 +1,164 @@
+import asyncio
+import gzip
+import json
+import sys
+import httpx
+import pytest
+from exceptions.exceptions import ParserPushError
+from utils.ParserClient import ParserClient
+from utils.StorageGateway import StorageGateway
+
+parser_module = sys.modules["utils.ParserClient"]
+
+
+class FakeParser:
+    """Parser /parse-and-push stub answering with `statuses` in turn (the last one repeats)."""
+
+    def __init__(self, *statuses: int):
+        self.requests = []
+        self._statuses = list(statuses) or [200]
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        status = self._statuses[min(len(self.requests), len(self._statuses)) - 1]
+        return httpx.Response(status, json={"ok": status < 400})
+
+    def bodies(self):
+        return [json.loads(_decode(request)) for request in self.requests]
+
+
+def _decode(request: httpx.Request) -> bytes:
+    match(request.headers.get("content-encoding")):
+        case "gzip":
+            return gzip.decompress(request.content)
+        case "zstd":
+            import zstandard
+            return zstandard.ZstdDecompressor().decompress(request.content)
+        case _:
+            return request.content
+
+
+def _posts(count: int, text_size: int = 10):
+    return [{"id": str(i), "text": "x" * text_size} for i in range(count)]
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    gateway = StorageGateway(str(tmp_path / "outbox.db"))
+    yield gateway
+    gateway.close()
+
+
+@pytest.fixture
+def connect(monkeypatch, outbox):
+    """Routes the client's requests to a FakeParser, with fresh breakers, instant retries and a scratch outbox."""
+    monkeypatch.setattr(sys.modules["utils.CircuitBreaker"], "_dependencies", {})
+    monkeypatch.setattr(parser_module, "RATE_LIMIT_BACKOFF_BASE", 0)
+    monkeypatch.setattr(parser_module, "get_storage_gateway", lambda: outbox)
+
+    def connect(parser: FakeParser):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(parser))
+        monkeypatch.setattr(parser_module, "get_async_client", lambda url: client)
+
+    return connect
+
+
+def _client(compression: str = "gzip", max_chunk_bytes: int = 1024 * 1024, max_retries: int = 2,
+            outbox_enabled: bool = True) -> ParserClient:
+    return ParserClient(url="http://parser", max_chunk_bytes=max_chunk_bytes, compression=compression,
+                        max_retries=max_retries, outbox_enabled=outbox_enabled)
+
+
+# ---------- Chunking and envelope ----------
+def test_split_bounds_each_chunk_and_keeps_every_post_in_order():
+    posts = _posts(10, text_size=80)  # ~100 bytes of JSON each
+    chunks = _client(max_chunk_bytes=350)._split(posts)
+
+    assert [len(chunk_posts) for chunk_posts, _ in chunks] == [3, 3, 3, 1]
+    assert [post for chunk_posts, _ in chunks for post in chunk_posts] == posts
+    assert all(sum(len(item) + 1 for item in encoded) <= 350 for _, encoded in chunks)
+
+
+def test_post_larger_than_the_limit_travels_alone():
+    posts = [{"id": "small"}, {"id": "big", "text": "x" * 500}, {"id": "small-2"}]
+    chunks = _client(max_chunk_bytes=100)._split(posts)
+
+    assert [[post["id"] for post in chunk_posts] for chunk_posts, _ in chunks] == [["small"], ["big"], ["small-2"]]
+
+
+def test_envelope_is_the_parser_request_schema():
+    posts = _posts(2)
+    encoded = [json.dumps(post, separators=(",", ":")).encode() for post in posts]
+    body = ParserClient._envelope("twitter", encoded, {"result_count": 2}, "app-token")
+
+    assert json.loads(body) == {"platform": "twitter", "payload": {"data": posts, "meta": {"result_count": 2}},
+                                "token": "app-token"}
+    assert "meta" not in json.loads(ParserClient._envelope("twitter", encoded, None, "t"))["payload"]
+
+
+# ---------- Delivery ----------
+@pytest.mark.parametrize("compression", ["gzip", "zstd", "none"])
+def test_chunks_carry_idempotency_headers_and_encoding(connect, compression):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    parser = FakeParser(200)
+    connect(parser)
+    posts = _posts(6, text_size=80)
+
+    report = asyncio.run(_client(compression=compression, max_chunk_bytes=350).push(
+        "twitter", posts, "app-token", meta_for=lambda chunk: {"result_count": len(chunk)}))
+
+    assert [chunk["status"] for chunk in report["chunks"]] == ["ok", "ok"]
+    batch_id = report["batch_id"]
+    for index, request in enumerate(parser.requests):
+        assert request.headers["idempotency-key"] == f"{batch_id}:{index}"
+        assert request.headers["x-chunk-index"] == str(index)
+        assert request.headers["x-chunk-count"] == "2"
+        assert request.headers.get("content-encoding") == (None if compression == "none" else compression)
+    bodies = parser.bodies()
+    assert [post for body in bodies for post in body["payload"]["data"]] == posts
+    assert [body["payload"]["meta"] for body in bodies] == [{"result_count": 3}, {"result_count": 3}]
+    assert report["sent_bytes"] < report["bytes"] or compression == "none"
+
+
+def test_retryable_failure_is_retried_under_the_same_key(connect, outbox):
+    parser = FakeParser(503, 200)
+    connect(parser)
+
+    report = asyncio.run(_client().push("twitter", _posts(2), "t"))
+
+    (chunk,) = report["chunks"]
+    assert chunk["status"] == "ok" and chunk["attempts"] == 2
+    assert len({request.headers["idempotency-key"] for request in parser.requests}) == 1
+    assert outbox.stats()["pending_chunks"] == 0
+
+
+def test_chunk_failing_every_retry_is_spooled_to_the_outbox(connect, outbox):
+    parser = FakeParser(503)
+    connect(parser)
+
+    report = asyncio.run(_client(max_retries=2).push("twitter", _posts(2), "t"))
+
+    assert len(parser.requests) == 3
+    assert report["spooled"] == 1 and report["chunks"][0]["status"] == "spooled"
+    assert outbox.stats()["pending_chunks"] == 1
+
+
+def test_chunk_failing_without_an_outbox_raises(connect):
+    connect(FakeParser(503))
+
+    with pytest.raises(ParserPushError) as failed:
+        asyncio.run(_client(max_retries=1, outbox_enabled=False).push("twitter", _posts(2), "t"))
+
+    assert failed.value.report["chunks"][0]["retryable"] is True
+
+
+def test_permanent_rejection_raises_and_buries_the_chunk(connect, outbox):
+    parser = FakeParser(400)
+    connect(parser)
+
+    with pytest.raises(ParserPushError):
+        asyncio.run(_client().push("twitter", _posts(2), "t"))
+
+    assert len(parser.requests) == 1
+    assert outbox.stats()["dead_chunks"] == 1 and outbox.stats()["pending_chunks"] == 0
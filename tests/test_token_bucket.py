@@ -0,0 +1,107 @@
+import asyncio
+import sys
+import httpx
+import pytest
+from exceptions.exceptions import DependencyUnavailableError
+from utils.RateLimiter import RateLimiter, TokenBucket
+
+
+def test_requests_within_the_burst_go_out_at_once():
+    bucket = TokenBucket(rate=2, burst=10)
+    assert [bucket._reserve(0.0) for _ in range(10)] == [0.0] * 10
+    assert bucket._reserve(0.0) == pytest.approx(0.5)
+    assert bucket._reserve(0.0) == pytest.approx(1.0)
+
+
+def test_bucket_refills_at_its_rate():
+    bucket = TokenBucket(rate=2, burst=10)
+    for _ in range(10):
+        bucket._reserve(0.0)
+    # Ten tokens accrue again in 5 s.
+    assert [bucket._reserve(5.0) for _ in range(10)] == [0.0] * 10
+    assert bucket._reserve(5.0) == pytest.approx(0.5)
+
+
+def test_cost_above_burst_waits_only_for_the_excess():
+    bucket = TokenBucket(rate=2, burst=10)
+    # 50 tokens from a full bucket of 10: the extra 40 take 20 s to accrue.
+    assert bucket._reserve(0.0, cost=50) == pytest.approx(20.0)
+    # The next batch starts 25 s (50 tokens at 2/s) after the first, not 45 s.
+    assert bucket._reserve(0.0, cost=50) == pytest.approx(45.0)
+    assert bucket._reserve(20.0, cost=50) == pytest.approx(45.0 - 20.0 + 25.0)
+
+
+def test_sustained_batches_run_at_the_configured_rate():
+    bucket = TokenBucket(rate=2, burst=10)
+    now = 0.0
+    for _ in range(20):
+        now += bucket._reserve(now, cost=50)
+    # The last of 20 batches of 50 starts once 1000 tokens minus the burst of 10 have accrued at 2/s.
+    assert now == pytest.approx((1000 - 10) / 2)
+
+
+def test_pause_holds_every_request_until_it_ends():
+    bucket = TokenBucket(rate=2, burst=10)
+    bucket._paused_until = 30.0
+    assert bucket._reserve(0.0) == pytest.approx(30.0)
+    # The burst is available again once the pause ends, then requests are paced.
+    assert [bucket._reserve(30.0) for _ in range(9)] == [0.0] * 9
+    assert bucket._reserve(30.0) == pytest.approx(0.5)
+
+
+def test_pause_applies_to_costly_requests():
+    bucket = TokenBucket(rate=2, burst=10)
+    bucket._paused_until = 30.0
+    assert bucket._reserve(0.0, cost=20) == pytest.approx(35.0)
+
+
+def test_scaled_rate_spaces_requests_further_apart():
+    bucket = TokenBucket(rate=2, burst=1)
+    bucket.scale(0.5)
+    assert bucket._reserve(0.0) == 0.0
+    assert bucket._reserve(0.0) == pytest.approx(1.0)
+
+
+def test_max_cost_is_the_smallest_burst_of_the_buckets_in_play():
+    limiter = RateLimiter({"facebook": {"platform": (50, 50), "app": (20, 40), "user": (2, 10)}})
+    assert limiter.max_cost("facebook", app_key="app", user_key="user") == 10
+    assert limiter.max_cost("facebook", app_key="app") == 40
+
+
+def test_worker_share_divides_platform_and_app_limits_but_not_user_limits():
+    limiter = RateLimiter({"facebook": {"platform": (50, 50), "app": (20, 40), "user": (2, 10)}}, share=0.25)
+    buckets = limiter._buckets_for("facebook", "app", "user")
+    assert (buckets["platform"].rate, buckets["platform"].burst) == (12.5, 12)
+    assert (buckets["app"].rate, buckets["app"].burst) == (5.0, 10)
+    assert (buckets["user"].rate, buckets["user"].burst) == (2, 10)
+
+
+def test_throttle_longer_than_max_wait_fails_later_requests_fast(monkeypatch):
+    calls = []
+
+    async def http_request(method, url, **kwargs):
+        calls.append(url)
+        return httpx.Response(429, headers={"retry-after": "3600"}, request=httpx.Request(method, url))
+
+    monkeypatch.setattr(sys.modules["utils.RateLimiter"], "http_request", http_request)
+    limiter = RateLimiter({"twitter": {"user": (10, 10)}})
+
+    async def scenario():
+        throttled = await limiter.request("twitter", "GET", "https://api.x.com/2/tweets", user_key="u1")
+        with pytest.raises(DependencyUnavailableError) as refused:
+            await limiter.request("twitter", "GET", "https://api.x.com/2/tweets", user_key="u1")
+        return throttled, refused.value
+
+    throttled, refused = asyncio.run(scenario())
+    # The throttled call gives up at once instead of sleeping an hour; so does the next one, without calling out.
+    assert throttled.status_code == 429
+    assert len(calls) == 1
+    assert refused.retry_after == pytest.approx(3600, abs=5)
+
+
+def test_pause_within_max_wait_is_still_honoured_inline():
+    limiter = RateLimiter({"twitter": {"user": (10, 10)}})
+    bucket = limiter._buckets_for("twitter", None, "u1")["user"]
+    bucket.pause(5)
+    limiter._check_paused("twitter", {"user": bucket})
+    assert 0 < bucket.paused_for() <= 5
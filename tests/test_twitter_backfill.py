@@ -0,0 +1,53 @@
+import asyncio
+import json
+import pytest
+from SocialMediaScrapper.Post import Post
+from SocialMediaScrapper.TwitterScrapper import TwitterScrapper
+from utils.CheckpointStore import CheckpointStore
+
+
+@pytest.fixture
+def scrapper(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+    scrapper = TwitterScrapper(app_token="app", client_token="token", social_id="42", name="n", email="e",
+                               checkpoint_store=store)
+    scrapper.calls = []
+
+    async def fetch_page(params):
+        scrapper.calls.append(dict(params))
+        return [Post.from_twitter({"id": "7", "text": "tweet"})], {"newest_id": "7"}
+
+    async def parse_data_async(posts):
+        return {"items": len(posts)}
+
+    scrapper._fetch_page = fetch_page
+    scrapper.parse_data_async = parse_data_async
+    return scrapper
+
+
+def test_default_backfill_starts_at_the_earliest_time_the_api_accepts(scrapper):
+    asyncio.run(scrapper.backfill_async(end_time="2012-01-01T00:00:00Z", windows=2))
+
+    assert min(call["start_time"] for call in scrapper.calls) == "2010-11-06T00:00:01Z"
+
+
+def test_caller_start_time_is_clamped_to_the_earliest_time(scrapper):
+    asyncio.run(scrapper.backfill_async(start_time="2006-03-21T00:00:00Z", end_time="2012-01-01T00:00:00Z",
+                                        windows=1))
+
+    assert scrapper.calls[0]["start_time"] == "2010-11-06T00:00:01Z"
+
+
+def test_replacing_a_saved_plan_clears_its_window_cursors(scrapper):
+    store = scrapper._checkpoint_store
+    old_plan = {"start": "2011-01-01T00:00:00Z", "end": "2011-03-01T00:00:00Z", "windows": 2, "open_ended": False}
+    store.set("twitter", "42", json.dumps(old_plan), scrapper.PLAN_KEY)
+    old_keys = scrapper._window_keys(old_plan)
+    for key in old_keys:
+        store.set("twitter", "42", "cursor", key)
+
+    asyncio.run(scrapper.backfill_async(start_time="2012-01-01T00:00:00Z", end_time="2012-02-01T00:00:00Z",
+                                        windows=1))
+
+    assert all(store.get("twitter", "42", key) is None for key in old_keys)
+    assert store.get("twitter", "42", scrapper.PLAN_KEY) is None
@@ -0,0 +1,91 @@
+import asyncio
+import sys
+import pytest
+from SocialMediaScrapper.Post import Post
+from SocialMediaScrapper.TwitterScrapper import TwitterScrapper
+from exceptions.exceptions import ScraperError
+from utils.CheckpointStore import CheckpointStore
+
+
+def _tweets(newest: int, count: int):
+    return [Post.from_twitter({"id": str(i), "text": f"tweet {i}", "created_at": "2024-10-16T12:00:00.000Z"})
+            for i in range(newest, newest - count, -1)]
+
+
+class FakeTimeline:
+    """Two pages of tweets newer than the checkpoint: 1000..901, then 900..851."""
+
+    def __init__(self, fail_on_page: int = 0):
+        self.calls = []
+        self._fail_on_page = fail_on_page
+
+    async def __call__(self, params):
+        self.calls.append(dict(params))
+        if len(self.calls) == self._fail_on_page:
+            raise ScraperError("Twitter API request failed: 503")
+        if "pagination_token" not in params:
+            return _tweets(1000, 100), {"newest_id": "1000", "oldest_id": "901", "next_token": "page-2"}
+        return _tweets(900, 50), {"newest_id": "900", "oldest_id": "851"}
+
+
+@pytest.fixture
+def scrapper(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+    store.set("twitter", "42", "500")
+    scrapper = TwitterScrapper(app_token="app", client_token="token", social_id="42", name="n", email="e",
+                               checkpoint_store=store)
+    scrapper.pushed = []
+
+    async def parse_data_async(posts):
+        scrapper.pushed.extend(post.id for post in posts)
+        return {"items": len(posts)}
+
+    scrapper.parse_data_async = parse_data_async
+    return scrapper
+
+
+def test_incremental_fetch_follows_every_page_newer_than_the_checkpoint(scrapper):
+    timeline = FakeTimeline()
+    scrapper._fetch_page = timeline
+
+    stats = asyncio.run(scrapper.scrape_async(incremental=True))
+
+    assert [call.get("pagination_token") for call in timeline.calls] == [None, "page-2"]
+    assert all(call["since_id"] == "500" for call in timeline.calls)
+    assert stats["items"] == 150
+    assert scrapper.pushed == [str(i) for i in range(1000, 850, -1)]
+    assert scrapper._checkpoint_store.get("twitter", "42") == "1000"
+
+
+def test_checkpoint_stays_put_when_a_later_page_fails(scrapper):
+    scrapper._fetch_page = FakeTimeline(fail_on_page=2)
+
+    with pytest.raises(ScraperError):
+        asyncio.run(scrapper.scrape_async(incremental=True))
+
+    # The first page still reaches the parser, but the second was never fetched, so the next run must ask again.
+    assert scrapper.pushed == [str(i) for i in range(1000, 900, -1)]
+    assert scrapper._checkpoint_store.get("twitter", "42") == "500"
+
+
+def test_first_run_without_checkpoint_fetches_only_the_latest_page(scrapper):
+    scrapper._checkpoint_store.delete("twitter", "42", "newest")
+    timeline = FakeTimeline()
+    scrapper._fetch_page = timeline
+
+    asyncio.run(scrapper.scrape_async(incremental=True))
+
+    assert len(timeline.calls) == 1 and "since_id" not in timeline.calls[0]
+    assert scrapper._checkpoint_store.get("twitter", "42") == "1000"
+
+
+def test_partial_batch_is_pushed_when_a_later_page_fails(scrapper, monkeypatch):
+    monkeypatch.setattr(sys.modules["SocialMediaScrapper.SocialMediaScrapperBase"], "PARSER_CHUNK_SIZE", 30)
+    scrapper._fetch_page = FakeTimeline(fail_on_page=2)
+
+    with pytest.raises(ScraperError):
+        asyncio.run(scrapper.scrape_async(incremental=True))
+
+    # Three full chunks of 30 plus the trailing 10 of the first page.
+    assert scrapper.pushed == [str(i) for i in range(1000, 900, -1)]
+    assert scrapper._checkpoint_store.get("twitter", "42") == "500"
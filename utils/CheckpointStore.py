@@ -0,0 +1,72 @@
+from typing import Optional
+import os
+import sqlite3
+import threading
+import time
+from config.Config import CHECKPOINT_DB_PATH
+
+# ---------- Checkpoint Store ----------
+class CheckpointStore:
+    """
+    Persistent per-(provider, social_id) high-water marks, backed by SQLite.
+    `name` separates independent cursors of the same account (e.g. the incremental mark vs a backfill cursor).
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            " provider TEXT NOT NULL,"
+            " social_id TEXT NOT NULL,"
+            " name TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " PRIMARY KEY (provider, social_id, name))"
+        )
+        self._conn.commit()
+
+    def get(self, provider: str, social_id: str, name: str = "newest") -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM checkpoints WHERE provider = ? AND social_id = ? AND name = ?",
+                (provider, social_id, name),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, provider: str, social_id: str, value: str, name: str = "newest") -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO checkpoints (provider, social_id, name, value, updated_at) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (provider, social_id, name) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                (provider, social_id, name, value, time.time()),
+            )
+            self._conn.commit()
+
+    def delete(self, provider: str, social_id: str, name: str = "newest") -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM checkpoints WHERE provider = ? AND social_id = ? AND name = ?",
+                (provider, social_id, name),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_store: Optional[CheckpointStore] = None
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """Process-wide store at CHECKPOINT_DB_PATH, opened on first use."""
+    global _store
+    if _store is None:
+        _store = CheckpointStore(CHECKPOINT_DB_PATH)
+    return _store
@@ -0,0 +1,205 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+import asyncio
+import time
+import weakref
+import httpx
+from config.Config import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RECOVERY_TIMEOUT,
+    BREAKER_HALF_OPEN_CALLS,
+    BULKHEAD_LIMITS,
+    BULKHEAD_DEFAULT,
+    BULKHEAD_MAX_WAIT,
+)
+from exceptions.exceptions import DependencyUnavailableError
+from .Logging import get_logger
+from .Metrics import BREAKER_STATE, REJECTED
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+logger = get_logger("CircuitBreaker")
+
+
+# ---------- Circuit Breaker ----------
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and refuses calls for `recovery_timeout` seconds.
+    It then lets `half_open_calls` trial calls through: a success closes it, a failure opens it again.
+    State is plain data (no locks or loop-bound primitives), so one breaker serves every event loop.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, recovery_timeout: float, half_open_calls: int):
+        self.name = name
+        self._failure_threshold = max(failure_threshold, 1)
+        self._recovery_timeout = recovery_timeout
+        self._half_open_calls = max(half_open_calls, 1)
+        self._state = CLOSED
+        self._failures = 0
+        self._changed_at = time.monotonic()
+        self._trials = 0
+        BREAKER_STATE.labels(name).set(0)
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._changed_at >= self._recovery_timeout:
+            return HALF_OPEN
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """Open and still cooling down: calls would be refused without a trial."""
+        return self.state == OPEN
+
+    def retry_in(self) -> float:
+        if self._state != OPEN:
+            return 0.0
+        return max(0.0, self._recovery_timeout - (time.monotonic() - self._changed_at))
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; while half-open this claims one of the trial slots."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == OPEN:
+            return False
+        now = time.monotonic()
+        if self._state == OPEN:
+            self._transition(HALF_OPEN)
+        elif now - self._changed_at >= self._recovery_timeout:
+            # Trials that never reported back (e.g. cancelled) must not wedge the breaker half-open.
+            self._trials = 0
+            self._changed_at = now
+        if self._trials >= self._half_open_calls:
+            return False
+        self._trials += 1
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        if self._state != CLOSED:
+            self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self._failure_threshold):
+            self._transition(OPEN)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self._failures, "retry_in": round(self.retry_in(), 1)}
+
+    def _transition(self, state: str) -> None:
+        if state != self._state:
+            log = logger.warning if state == OPEN else logger.info
+            log("Circuit breaker state changed", extra={"dependency": self.name, "from": self._state, "to": state,
+                                                        "consecutive_failures": self._failures})
+        self._state = state
+        self._changed_at = time.monotonic()
+        self._trials = 0
+        BREAKER_STATE.labels(self.name).set(_STATE_VALUES[state])
+
+
+# ---------- Bulkhead ----------
+class Bulkhead:
+    """Caps a dependency's in-flight calls, so one slow service cannot tie up every worker."""
+
+    def __init__(self, name: str, limit: int, max_wait: float):
+        self.name = name
+        self.limit = max(limit, 1)
+        self._max_wait = max_wait
+        # asyncio primitives are bound to one event loop, so each loop gets its own semaphore.
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        semaphore = self._semaphore()
+        if semaphore.locked():
+            try:
+                await asyncio.wait_for(semaphore.acquire(), self._max_wait)
+            except asyncio.TimeoutError:
+                REJECTED.labels(self.name, "bulkhead").inc()
+                raise DependencyUnavailableError(
+                    f"{self.name} is saturated ({self.limit} calls in flight for {self._max_wait:.0f}s)"
+                )
+        else:
+            await semaphore.acquire()
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.limit)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+
+# ---------- Dependency ----------
+class Dependency:
+    """
+    Circuit breaker plus bulkhead for one downstream service (authenticator, facebook, twitter, parser).
+
+        async with dependency.guard():
+            response = await client.get(...)
+        dependency.observe(response.status_code)
+
+    `guard` raises DependencyUnavailableError instead of calling out while the breaker is open or the
+    bulkhead stays full, and counts transport errors (including timeouts) as failures. `observe` counts
+    5xx responses as failures; any other response proves the service is up.
+    """
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.breaker = CircuitBreaker(name, BREAKER_FAILURE_THRESHOLD, BREAKER_RECOVERY_TIMEOUT, BREAKER_HALF_OPEN_CALLS)
+        self.bulkhead = Bulkhead(name, limit, BULKHEAD_MAX_WAIT)
+
+    @asynccontextmanager
+    async def guard(self) -> AsyncIterator[None]:
+        if self.breaker.is_open:
+            raise self._refused()
+        async with self.bulkhead.slot():
+            if not self.breaker.allow():
+                raise self._refused()
+            try:
+                yield
+            except httpx.TransportError:
+                self.breaker.record_failure()
+                raise
+
+    def observe(self, status_code: int) -> None:
+        if status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def _refused(self) -> DependencyUnavailableError:
+        REJECTED.labels(self.name, "open").inc()
+        retry_in = self.breaker.retry_in()
+        return DependencyUnavailableError(f"{self.name} is unavailable (circuit open, retry in {retry_in:.0f}s)",
+                                          retry_after=retry_in)
+
+
+_dependencies: Dict[str, Dependency] = {}
+
+
+def get_dependency(name: str) -> Dependency:
+    """The process-wide Dependency for `name`, created on first use."""
+    dependency = _dependencies.get(name)
+    if dependency is None:
+        dependency = Dependency(name, BULKHEAD_LIMITS.get(name, BULKHEAD_DEFAULT))
+        _dependencies[name] = dependency
+    return dependency
+
+
+def dependency_health() -> Dict[str, Dict[str, Any]]:
+    """Breaker state of every known dependency (the configured ones plus any created since)."""
+    for name in BULKHEAD_LIMITS:
+        get_dependency(name)
+    return {name: dependency.breaker.snapshot() for name, dependency in _dependencies.items()}
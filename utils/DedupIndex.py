@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from typing import List, Dict, Optional, Sequence, Tuple
+import os
+import sqlite3
+import threading
+import time
+from config.Config import DEDUP_DB_PATH, DEDUP_CACHE_SIZE
+
+NEW = "new"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+
+# SQLite's default limit on host parameters is 999; stay well below it.
+_LOOKUP_BATCH = 500
+
+
+# ---------- Dedup Index ----------
+class DedupIndex:
+    """
+    Content hash of the last pushed version of every post, keyed by (platform, post id), backed by SQLite.
+    A bounded LRU of recently seen keys sits in front, so engagement-refresh runs over the same posts rarely
+    touch the disk. Hashes are only recorded after a push succeeded (or was spooled to the outbox), so a
+    failed push never hides a post from the next run.
+    """
+
+    def __init__(self, path: str, cache_size: int):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._cache_size = cache_size
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS post_hashes ("
+            " platform TEXT NOT NULL,"
+            " post_id TEXT NOT NULL,"
+            " hash BLOB NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " PRIMARY KEY (platform, post_id)) WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    def classify(self, platform: str, entries: Sequence[Tuple[str, bytes]]) -> List[str]:
+        """Returns NEW, UPDATED or UNCHANGED for each (post id, content hash), in order."""
+        with self._lock:
+            known: Dict[str, bytes] = {}
+            misses = []
+            for post_id, _ in entries:
+                cached = self._cache.get((platform, post_id))
+                if cached is not None:
+                    self._cache.move_to_end((platform, post_id))
+                    known[post_id] = cached
+                else:
+                    misses.append(post_id)
+
+            for i in range(0, len(misses), _LOOKUP_BATCH):
+                batch = misses[i:i + _LOOKUP_BATCH]
+                rows = self._conn.execute(
+                    f"SELECT post_id, hash FROM post_hashes WHERE platform = ? AND post_id IN ({','.join('?' * len(batch))})",
+                    (platform, *batch),
+                ).fetchall()
+                for post_id, digest in rows:
+                    known[post_id] = digest
+                    self._remember(platform, post_id, digest)
+
+        statuses = []
+        for post_id, digest in entries:
+            previous = known.get(post_id)
+            statuses.append(NEW if previous is None else UNCHANGED if previous == digest else UPDATED)
+        return statuses
+
+    def record(self, platform: str, entries: Sequence[Tuple[str, bytes]]) -> None:
+        """Stores the hashes of posts the parser has accepted."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO post_hashes (platform, post_id, hash, updated_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (platform, post_id) DO UPDATE SET hash = excluded.hash, updated_at = excluded.updated_at",
+                [(platform, post_id, digest, now) for post_id, digest in entries],
+            )
+            self._conn.commit()
+            for post_id, digest in entries:
+                self._remember(platform, post_id, digest)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _remember(self, platform: str, post_id: str, digest: bytes) -> None:
+        self._cache[(platform, post_id)] = digest
+        self._cache.move_to_end((platform, post_id))
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+
+_index: Optional[DedupIndex] = None
+
+
+def get_dedup_index() -> DedupIndex:
+    """Process-wide index at DEDUP_DB_PATH, opened on first use."""
+    global _index
+    if _index is None:
+        _index = DedupIndex(DEDUP_DB_PATH, DEDUP_CACHE_SIZE)
+    return _index
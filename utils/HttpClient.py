@@ -0,0 +1,128 @@
+import asyncio
+import ssl
+import weakref
+from typing import Any, Awaitable, Dict, Optional, TypeVar
+from urllib.parse import urlsplit
+import httpx
+from config.Config import (
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_POOL_TIMEOUT,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_POOL_SIZES,
+    HTTP2_ENABLED,
+)
+
+try:
+    import h2  # noqa: F401  (httpx negotiates HTTP/2 via ALPN only when h2 is installed)
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+T = TypeVar("T")
+
+_ssl_context: Optional[ssl.SSLContext] = None
+
+
+def http_timeout(read: Optional[float] = None) -> httpx.Timeout:
+    """Default connect/pool timeouts with an optional per-call read (and write) timeout."""
+    read = HTTP_READ_TIMEOUT if read is None else read
+    return httpx.Timeout(connect=HTTP_CONNECT_TIMEOUT, read=read, write=read, pool=HTTP_POOL_TIMEOUT)
+
+
+def ssl_context() -> ssl.SSLContext:
+    """
+    The process-wide TLS context every pool verifies with. Loading the CA bundle takes tens of
+    milliseconds, so it happens once (in the serve.py master, before the workers are forked).
+    """
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = httpx.create_ssl_context()
+    return _ssl_context
+
+
+# ---------- HTTP Client Manager ----------
+class HttpClientManager:
+    """
+    One keep-alive connection pool per host (graph.facebook.com, api.x.com, the parser, the authenticator),
+    so a slow host cannot exhaust the connections of the others. HTTP/2 is negotiated where the host offers it.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        parts = urlsplit(url)
+        host = parts.hostname or ""
+        key = f"{parts.scheme}://{parts.netloc}"
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            max_connections = HTTP_POOL_SIZES.get(host, HTTP_MAX_CONNECTIONS)
+            client = httpx.AsyncClient(
+                http2=HTTP2_ENABLED and _HTTP2_AVAILABLE and parts.scheme == "https",
+                verify=ssl_context(),
+                timeout=http_timeout(),
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=min(HTTP_MAX_KEEPALIVE, max_connections),
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                ),
+            )
+            self._clients[key] = client
+        return client
+
+    async def close(self) -> None:
+        clients, self._clients = list(self._clients.values()), {}
+        await asyncio.gather(*(client.aclose() for client in clients if not client.is_closed))
+
+
+# An httpx.AsyncClient must not be shared across event loops, so each loop gets its own manager.
+_managers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, HttpClientManager]" = weakref.WeakKeyDictionary()
+
+
+def _manager() -> HttpClientManager:
+    loop = asyncio.get_running_loop()
+    manager = _managers.get(loop)
+    if manager is None:
+        manager = HttpClientManager()
+        _managers[loop] = manager
+    return manager
+
+
+def get_async_client(url: str) -> httpx.AsyncClient:
+    """Return the pooled AsyncClient for `url`'s host on the running event loop, creating it on first use."""
+    return _manager().client_for(url)
+
+
+async def request(method: str, url: str, **kwargs) -> httpx.Response:
+    return await get_async_client(url).request(method, url, **kwargs)
+
+
+async def open_async_clients(*urls: str) -> None:
+    """Creates the pools for known hosts up front (called on app startup)."""
+    for url in urls:
+        if url:
+            get_async_client(url)
+
+
+async def close_async_clients() -> None:
+    """Close every pooled client of the running event loop."""
+    manager = _managers.pop(asyncio.get_running_loop(), None)
+    if manager is not None:
+        await manager.close()
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """
+    Runs a coroutine to completion from synchronous code.
+    The loop-bound clients are closed before the temporary loop goes away.
+    """
+    async def _runner() -> Any:
+        try:
+            return await coro
+        finally:
+            await close_async_clients()
+
+    return asyncio.run(_runner())
@@ -0,0 +1,47 @@
+from typing import Optional, TextIO
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, and serve.py never runs more than one worker there
+    fcntl = None
+
+# ---------- Leader Lock ----------
+class LeaderLock:
+    """
+    Non-blocking exclusive lock on a file, used to pick the one server worker that runs the
+    process-wide background loops (scheduler, outbox drainer). The OS releases the lock when its
+    holder exits, so a restarted worker can take over.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._file: Optional[TextIO] = None
+
+    def acquire(self) -> bool:
+        """Whether this process holds (or now took) the lock."""
+        if self._file is not None:
+            return True
+        if fcntl is None:
+            return True
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handle = open(self._path, "a+")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            handle.close()
+            return False
+        handle.seek(0)
+        handle.truncate()
+        handle.write(str(os.getpid()))
+        handle.flush()
+        self._file = handle
+        return True
+
+    def release(self) -> None:
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
@@ -0,0 +1,87 @@
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+import json
+import logging
+import sys
+import uuid
+from config.Config import LOG_LEVEL, LOG_FORMAT
+
+# Correlation id of the request or job being handled; copied into every log record emitted under it.
+correlation_id: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+
+ROOT_LOGGER = "scrapper"
+
+# Attributes every LogRecord has; anything else on a record came in through `extra=` and is logged as a field.
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "correlation_id"}
+
+
+def new_correlation_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+class _CorrelationFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.correlation_id = correlation_id.get()
+        return True
+
+
+def _fields(record: logging.LogRecord) -> dict:
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS}
+
+
+# ---------- Formatters ----------
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message, correlation id and any `extra=` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.correlation_id:
+            entry["correlation_id"] = record.correlation_id
+        entry.update(_fields(record))
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for local runs: `... INFO [FacebookScrapper] message key=value cid=...`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        name = record.name.rsplit(".", 1)[-1]
+        line = f"{self.formatTime(record)} {record.levelname:<7} [{name}] {record.getMessage()}"
+        fields = " ".join(f"{key}={value}" for key, value in _fields(record).items())
+        if fields:
+            line += f" {fields}"
+        if record.correlation_id:
+            line += f" cid={record.correlation_id}"
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+def configure_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT) -> None:
+    """Installs the stderr handler on the service's root logger (idempotent)."""
+    root = logging.getLogger(ROOT_LOGGER)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    handler = logging.StreamHandler(sys.stderr)
+    handler.addFilter(_CorrelationFilter())
+    handler.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+    root.addHandler(handler)
+    root.setLevel(level.upper())
+    root.propagate = False
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger for a component, e.g. get_logger("FacebookScrapper")."""
+    root = logging.getLogger(ROOT_LOGGER)
+    if not root.handlers:
+        configure_logging()
+    return root.getChild(name)
@@ -0,0 +1,56 @@
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+import os
+import time
+from prometheus_client import Counter, Gauge, Histogram, CollectorRegistry, CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client import multiprocess
+
+# ---------- Metrics ----------
+# Items/second and bytes/second are rates of the counters below (e.g. `rate(scrapper_items_total[5m])`).
+# Under serve.py with several workers, PROMETHEUS_MULTIPROC_DIR is set and every worker writes its values
+# there; /metrics on any worker then reports the sum over all of them.
+
+STAGE_SECONDS = Histogram(
+    "scrapper_stage_seconds",
+    "Duration of one pipeline stage call",
+    ["platform", "stage", "outcome"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+ITEMS = Counter("scrapper_items_total", "Posts handled, by pipeline stage", ["platform", "stage"])
+PUSHED_BYTES = Counter("scrapper_pushed_bytes_total", "Parser push volume before and after compression",
+                       ["platform", "encoding"])
+PUSH_CHUNKS = Counter("scrapper_push_chunks_total", "Parser chunks by final outcome", ["platform", "outcome"])
+RETRIES = Counter("scrapper_retries_total", "Retried outbound requests", ["platform", "reason"])
+THROTTLED = Counter("scrapper_throttled_total", "Throttle responses (HTTP 429 or Graph throttle codes)",
+                    ["platform", "kind"])
+JOBS = Counter("scrapper_jobs_total", "Finished jobs", ["kind", "outcome"])
+JOB_SECONDS = Histogram("scrapper_job_seconds", "Job run time", ["kind", "outcome"],
+                        buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600))
+JOB_QUEUE_DEPTH = Gauge("scrapper_job_queue_depth", "Jobs waiting for a worker", multiprocess_mode="mostrecent")
+BREAKER_STATE = Gauge("scrapper_breaker_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)", ["dependency"],
+                      multiprocess_mode="livemax")
+REJECTED = Counter("scrapper_dependency_rejected_total", "Calls refused without reaching a dependency",
+                   ["dependency", "reason"])
+
+
+@contextmanager
+def timed(stage: str, platform: str) -> Iterator[None]:
+    """Observes the block's duration in STAGE_SECONDS, with outcome "ok" or "error"."""
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        STAGE_SECONDS.labels(platform, stage, outcome).observe(time.perf_counter() - started)
+
+
+def render() -> Tuple[bytes, str]:
+    """The current metrics in the Prometheus text format, with its content type."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -1,7 +1,218 @@
-from typing import List, Dict, Any
+from array import array
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Set
+import hashlib
+import json
+import struct
+
+INT64_MIN, INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+
+PLATFORM_METRICS = {
+    "twitter": ("retweet_count", "reply_count", "like_count", "quote_count", "bookmark_count", "impression_count"),
+    "facebook": ("reaction_count", "comment_count"),
+}
+
+# Every metric, in the order content hashes pack them (metrics a platform lacks count as 0).
+HASHED_METRICS = PLATFORM_METRICS["twitter"] + PLATFORM_METRICS["facebook"]
+_HASH_METRICS = struct.Struct(f"<{len(HASHED_METRICS)}q")
+
+_TIME_FORMATS = {"twitter": "%Y-%m-%dT%H:%M:%S.%f%z", "facebook": "%Y-%m-%dT%H:%M:%S%z"}
+
+
+def int_column(values: List[Any]) -> array:
+    """
+    Coerces a whole column to int64 at once. Clean data (all ints) takes the fast path;
+    only a column holding strings, floats or nulls falls back to per-value coercion (bad values become 0).
+    """
+    try:
+        return array("q", values)
+    except (TypeError, OverflowError):
+        return array("q", [coerce_int(value) for value in values])
+
+
+def coerce_int(value: Any) -> int:
+    try:
+        return min(max(int(value), INT64_MIN), INT64_MAX)
+    except (TypeError, ValueError, OverflowError):
+        return 0
+
+
+# ---------- Post Columns ----------
+class PostColumns:
+    """
+    A batch of posts of one platform in columnar form: one list per field, with metrics as typed
+    int64 arrays. Nested structures (attachments, comments) are kept as lists of their parser payloads;
+    the reaction and comment pages the parser wants verbatim are kept as object columns.
+    """
+
+    def __init__(self, platform: str, ids: List[str], created: List[str],
+                 metrics: Dict[str, array], objects: Dict[str, List[Any]]):
+        self.platform = platform
+        self.ids = ids
+        self.created = created
+        self.metrics = metrics
+        self.objects = objects
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def take(self, indices: List[int]) -> "PostColumns":
+        """The rows at `indices`, as a new batch."""
+        return PostColumns(
+            platform=self.platform,
+            ids=[self.ids[i] for i in indices],
+            created=[self.created[i] for i in indices],
+            metrics={name: array("q", [values[i] for i in indices]) for name, values in self.metrics.items()},
+            objects={name: [values[i] for i in indices] for name, values in self.objects.items()},
+        )
+
+    def content_hashes(self) -> List[bytes]:
+        """Per row, a digest of what a refresh can change: the text and every metric (incl. comment and reaction totals)."""
+        zeros = array("q", bytes(8 * len(self)))
+        columns = [self.metrics.get(name, zeros) for name in HASHED_METRICS]
+        hashes = []
+        for text, values in zip(self.objects["text"], zip(*columns)):
+            digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16)
+            digest.update(_HASH_METRICS.pack(*values))
+            hashes.append(digest.digest())
+        return hashes
+
+    def to_records(self, updated: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Rows in the parser's /parse-and-push `payload.data` schema for this platform.
+        Rows whose id is in `updated` were pushed before and are flagged with `"is_update": true`.
+        """
+        match(self.platform):
+            case "twitter":
+                records = self._twitter_records()
+            case "facebook":
+                records = self._facebook_records()
+            case _:
+                raise ValueError(f"Unknown platform: {self.platform}")
+        if updated:
+            for record in records:
+                if record["id"] in updated:
+                    record["is_update"] = True
+        return records
+
+    def timestamps(self) -> List[Optional[int]]:
+        """Creation times as epoch milliseconds (None where the API sent an unparseable value)."""
+        fmt = _TIME_FORMATS[self.platform]
+        parsed: List[Optional[int]] = []
+        for value in self.created:
+            try:
+                parsed.append(int(datetime.strptime(value, fmt).timestamp() * 1000))
+            except (TypeError, ValueError):
+                parsed.append(None)
+        return parsed
+
+    def to_arrow(self):
+        """An Arrow table with typed columns; nested object columns are stored as JSON strings. Requires `pyarrow`."""
+        pa = _pyarrow()
+        columns = {
+            "id": pa.array(self.ids, type=pa.string()),
+            "created_at": pa.array(self.timestamps(), type=pa.timestamp("ms", tz="UTC")),
+        }
+        for name, values in self.metrics.items():
+            columns[name] = pa.array(values, type=pa.int64())
+        for name, values in self.objects.items():
+            if all(isinstance(value, str) for value in values):
+                columns[name] = pa.array(values, type=pa.string())
+            else:
+                columns[name] = pa.array([json.dumps(value, separators=(",", ":")) for value in values], type=pa.string())
+        return pa.table(columns)
+
+    def write_parquet(self, path: str) -> None:
+        table = self.to_arrow()
+        import pyarrow.parquet as pq
+        pq.write_table(table, path, compression="zstd")
+
+    # ---------- Private Helpers ----------
+    def _twitter_records(self) -> List[Dict[str, Any]]:
+        m = self.metrics
+        return [
+            {
+                "id": post_id,
+                "text": text,
+                "created_at": created,
+                "public_metrics": {
+                    "retweet_count": retweets,
+                    "reply_count": replies,
+                    "like_count": likes,
+                    "quote_count": quotes,
+                    "bookmark_count": bookmarks,
+                    "impression_count": impressions,
+                },
+                "edit_history_tweet_ids": edits or [post_id],
+            }
+            for post_id, text, created, edits, retweets, replies, likes, quotes, bookmarks, impressions in zip(
+                self.ids, self.objects["text"], self.created, self.objects["edit_history_tweet_ids"],
+                *(m[name] for name in PLATFORM_METRICS["twitter"]),
+            )
+        ]
+
+    def _facebook_records(self) -> List[Dict[str, Any]]:
+        o = self.objects
+        return [
+            {
+                "id": post_id,
+                "created_time": created,
+                "permalink_url": permalink,
+                "attachments": {"data": attachments},
+                "reactions": {"data": reactions or [], "summary": reactions_summary},
+                "comments": {"data": comments, "summary": comments_summary},
+            }
+            for post_id, created, permalink, attachments, reactions, reactions_summary, comments, comments_summary in zip(
+                self.ids, self.created, o["permalink_url"], o["attachments"],
+                o["reactions"], o["reactions_summary"], o["comments"], o["comments_summary"],
+            )
+        ]
+
 
 # ---------- Normalizer ----------
 class Normalizer:
-    def normalize(self, parsed_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        print("[Normalizer] Normalizing parsed data...")
-        return parsed_data
\ No newline at end of file
+    """
+    Turns batches of `SocialMediaScrapper.Post` records into PostColumns, one pass per field instead of
+    per post. Metrics are coerced to int64 here, once per column; the columns then serialize to the
+    parser's JSON schema (the push path) or to Arrow/Parquet.
+    """
+
+    def columns(self, platform: str, posts: List[Any]) -> PostColumns:
+        metric_names = PLATFORM_METRICS.get(platform)
+        if metric_names is None:
+            raise ValueError(f"Unknown platform: {platform}")
+
+        objects: Dict[str, List[Any]] = {"text": [post.text for post in posts]}
+        match(platform):
+            case "twitter":
+                objects["edit_history_tweet_ids"] = [post.edit_history_tweet_ids for post in posts]
+            case "facebook":
+                objects["permalink_url"] = [post.permalink_url for post in posts]
+                objects["attachments"] = [[a.to_payload() for a in post.attachments or ()] for post in posts]
+                objects["reactions"] = [post.reactions for post in posts]
+                objects["reactions_summary"] = [post.reactions_summary for post in posts]
+                objects["comments"] = [[c.to_payload() for c in post.comments or ()] for post in posts]
+                objects["comments_summary"] = [post.comments_summary for post in posts]
+
+        return PostColumns(
+            platform=platform,
+            ids=[post.id for post in posts],
+            created=[post.created for post in posts],
+            metrics={name: int_column([getattr(post.metrics, name) for post in posts]) for name in metric_names},
+            objects=objects,
+        )
+
+    def normalize(self, platform: str, posts: List[Any], updated: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+        """Posts → items of the parser's /parse-and-push `payload.data` (see PostColumns.to_records)."""
+        return self.columns(platform, posts).to_records(updated)
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Arrow/Parquet output requires the 'pyarrow' package (pip install pyarrow)")
+    return pyarrow
+
+
+normalizer = Normalizer()
@@ -0,0 +1,65 @@
+from typing import Optional
+import asyncio
+import time
+from config.Config import PARSER_TIMEOUT, OUTBOX_DRAIN_INTERVAL, OUTBOX_DRAIN_BATCH, OUTBOX_COMPACT_INTERVAL
+from .ParserClient import ParserClient
+from .StorageGateway import StorageGateway
+from .CircuitBreaker import get_dependency
+from .Logging import get_logger
+
+logger = get_logger("OutboxDrainer")
+
+# ---------- Outbox Drainer ----------
+class OutboxDrainer:
+    """Background task that redelivers spooled chunks to the parser and compacts the outbox."""
+
+    def __init__(self, outbox: StorageGateway, client: ParserClient):
+        self._outbox = outbox
+        self._client = client
+        self._task: Optional[asyncio.Task] = None
+        self._last_compaction = time.monotonic()
+
+    async def start(self) -> None:
+        logger.info("Starting")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def drain_once(self) -> int:
+        """Attempts every due chunk once; returns how many were delivered."""
+        if get_dependency("parser").breaker.is_open:
+            return 0
+        rows = await asyncio.to_thread(self._outbox.claim_due, OUTBOX_DRAIN_BATCH, PARSER_TIMEOUT + 60)
+        delivered = 0
+        for row in rows:
+            result = await self._client.deliver_spooled(row)
+            status = await self._client.settle(self._outbox, row["id"], result, attempts=row["attempts"] + 1)
+            if status == "ok":
+                delivered += 1
+            else:
+                logger.warning("Spooled chunk " + ("rescheduled" if status == "spooled" else "rejected"),
+                               extra={"batch_id": row["batch_id"], "chunk": row["index"] + 1, "count": row["count"],
+                                      "error": result.get("error")})
+        if delivered:
+            logger.info("Delivered spooled chunks", extra={"delivered": delivered, "claimed": len(rows)})
+        return delivered
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                delivered = await self.drain_once()
+                if time.monotonic() - self._last_compaction >= OUTBOX_COMPACT_INTERVAL:
+                    await asyncio.to_thread(self._outbox.compact)
+                    self._last_compaction = time.monotonic()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("Drain cycle failed", extra={"error": str(e)})
+                delivered = 0
+            # Keep going without pause while a backlog is being delivered.
+            if delivered < OUTBOX_DRAIN_BATCH:
+                await asyncio.sleep(OUTBOX_DRAIN_INTERVAL)
@@ -1,7 +1,10 @@
 from typing import List, Dict, Any
+from .Logging import get_logger
+
+logger = get_logger("Parser")
 
 # ---------- Parser ----------
 class Parser:
     def parse_data(self, raw_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        print("[Parser] Parsing raw data...")
+        logger.debug("Parsing raw data")
         return raw_data
\ No newline at end of file
@@ -0,0 +1,257 @@
+from typing import List, Dict, Any, Callable, Optional, Tuple
+import asyncio
+import gzip
+import json
+import random
+import time
+import uuid
+import httpx
+from config.Config import (
+    PARSER_URL,
+    PARSER_MAX_CHUNK_BYTES,
+    PARSER_COMPRESSION,
+    PARSER_MAX_RETRIES,
+    PARSER_TIMEOUT,
+    RATE_LIMIT_BACKOFF_BASE,
+    RATE_LIMIT_BACKOFF_MAX,
+    OUTBOX_ENABLED,
+    OUTBOX_DRAIN_INTERVAL,
+    OUTBOX_BACKOFF_MAX,
+    OUTBOX_MAX_ATTEMPTS,
+)
+from exceptions.exceptions import ParserPushError, DependencyUnavailableError
+from .CircuitBreaker import get_dependency
+from .HttpClient import get_async_client, http_timeout
+from .Logging import get_logger
+from .Metrics import PUSHED_BYTES, PUSH_CHUNKS, RETRIES, timed
+from .StorageGateway import StorageGateway, get_storage_gateway
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+logger = get_logger("ParserClient")
+
+
+def dumps(value: Any) -> bytes:
+    """Compact JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+# ---------- Parser Client ----------
+class ParserClient:
+    """
+    Pushes normalized posts to the parser's /parse-and-push endpoint.
+
+    A batch is split into chunks of at most PARSER_MAX_CHUNK_BYTES of JSON, each compressed and sent
+    with an `Idempotency-Key` of `<batch_id>:<chunk index>`, so retrying a chunk never double-ingests it.
+    While the parser's circuit breaker is open, chunks are not sent at all: they fail fast, retryable.
+    """
+
+    def __init__(self, url: str, max_chunk_bytes: int, compression: str, max_retries: int, outbox_enabled: bool):
+        self._url = f"{url.rstrip('/')}/parse-and-push"
+        self._outbox_enabled = outbox_enabled
+        self._max_chunk_bytes = max_chunk_bytes
+        self._max_retries = max_retries
+        if compression == "zstd" and zstandard is None:
+            logger.warning("zstandard is not installed, falling back to gzip")
+            compression = "gzip"
+        self._compression = compression
+
+    async def push(self, platform: str, posts: List[Dict[str, Any]], token: str,
+                   meta_for: Optional[Callable[[List[Dict[str, Any]]], Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Sends `posts` in size-bounded chunks and returns a per-chunk report.
+        `meta_for`, when given, builds the `payload.meta` object of each chunk from its posts.
+
+        With the outbox enabled, chunks are written to it before sending; a chunk that still fails after
+        retries stays there (status "spooled") for the OutboxDrainer. Raises ParserPushError (carrying the
+        report) when a chunk was rejected permanently, or failed with no outbox to fall back on.
+        """
+        with timed("push", platform):
+            return await self._push(platform, posts, token, meta_for)
+
+    async def deliver_spooled(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """One delivery attempt for a chunk claimed from the outbox, under its original idempotency key."""
+        return await self._push_chunk(row["batch_id"], row["platform"], row, max_retries=0)
+
+    @staticmethod
+    async def settle(outbox: StorageGateway, row_id: int, result: Dict[str, Any], attempts: int) -> str:
+        """
+        Acks a delivered chunk, parks a rejected one (or one still failing after OUTBOX_MAX_ATTEMPTS),
+        or schedules a retry. Returns the chunk's status.
+        """
+        if result["status"] == "ok":
+            await asyncio.to_thread(outbox.ack, row_id)
+            return "ok"
+        if result.get("retryable") and OUTBOX_MAX_ATTEMPTS and attempts >= OUTBOX_MAX_ATTEMPTS:
+            await asyncio.to_thread(outbox.bury, row_id, f"gave up after {attempts} attempts: {result.get('error')}")
+            return "failed"
+        if result.get("retryable"):
+            delay = min(OUTBOX_BACKOFF_MAX, OUTBOX_DRAIN_INTERVAL * (2 ** attempts)) * random.uniform(0.5, 1.0)
+            await asyncio.to_thread(outbox.retry_later, row_id, delay, result.get("error"))
+            return "spooled"
+        await asyncio.to_thread(outbox.bury, row_id, result.get("error"))
+        return "failed"
+
+    # ---------- Private Helpers ----------
+    async def _push(self, platform: str, posts: List[Dict[str, Any]], token: str,
+                    meta_for: Optional[Callable[[List[Dict[str, Any]]], Dict[str, Any]]]) -> Dict[str, Any]:
+        batch_id = uuid.uuid4().hex
+        split = self._split(posts)
+        chunks = [
+            {
+                "index": index,
+                "count": len(split),
+                "items": len(chunk_posts),
+                "body": self._envelope(platform, encoded, meta_for(chunk_posts) if meta_for else None, token),
+            }
+            for index, (chunk_posts, encoded) in enumerate(split)
+        ]
+
+        outbox = get_storage_gateway() if self._outbox_enabled else None
+        lease = PARSER_TIMEOUT * (self._max_retries + 1) + 60
+        row_ids = (await asyncio.to_thread(outbox.store, batch_id, platform, chunks, lease)
+                   if outbox is not None else [None] * len(chunks))
+
+        results = []
+        for chunk, row_id in zip(chunks, row_ids):
+            result = await self._push_chunk(batch_id, platform, chunk, self._max_retries)
+            if row_id is not None:
+                result["status"] = await self.settle(outbox, row_id, result, attempts=0)
+            results.append(result)
+
+        report = {
+            "batch_id": batch_id,
+            "items": len(posts),
+            "chunks": results,
+            "spooled": sum(1 for r in results if r["status"] == "spooled"),
+            "bytes": sum(r["bytes"] for r in results),
+            "sent_bytes": sum(r["sent_bytes"] for r in results),
+        }
+        failed = [r for r in results if r["status"] == "failed"]
+        if failed:
+            raise ParserPushError(f"{len(failed)}/{len(results)} chunks of batch {batch_id} failed: "
+                                  f"{failed[0].get('error')}", report=report)
+        if report["spooled"]:
+            logger.warning("Chunks spooled to the outbox", extra={"batch_id": batch_id, "spooled": report["spooled"]})
+        return report
+
+    def _split(self, posts: List[Dict[str, Any]]) -> List[Tuple[List[Dict[str, Any]], List[bytes]]]:
+        """Encodes each post once and groups them so no chunk's data exceeds max_chunk_bytes (unless a single post does)."""
+        chunks: List[Tuple[List[Dict[str, Any]], List[bytes]]] = []
+        chunk_posts: List[Dict[str, Any]] = []
+        encoded: List[bytes] = []
+        size = 0
+        for post in posts:
+            item = dumps(post)
+            if encoded and size + len(item) + 1 > self._max_chunk_bytes:
+                chunks.append((chunk_posts, encoded))
+                chunk_posts, encoded, size = [], [], 0
+            chunk_posts.append(post)
+            encoded.append(item)
+            size += len(item) + 1
+        if encoded or not chunks:
+            chunks.append((chunk_posts, encoded))
+        return chunks
+
+    @staticmethod
+    def _envelope(platform: str, encoded: List[bytes], meta: Optional[Dict[str, Any]], token: str) -> bytes:
+        """Builds the request body around the already-encoded posts instead of re-serializing them."""
+        tail = b"" if meta is None else b',"meta":' + dumps(meta)
+        return (
+            b'{"platform":' + dumps(platform)
+            + b',"payload":{"data":[' + b",".join(encoded) + b"]" + tail + b"}"
+            + b',"token":' + dumps(token) + b"}"
+        )
+
+    def _compress(self, body: bytes) -> Tuple[bytes, Optional[str]]:
+        match(self._compression):
+            case "gzip":
+                return gzip.compress(body, compresslevel=5), "gzip"
+            case "zstd":
+                return zstandard.ZstdCompressor(level=3).compress(body), "zstd"
+            case _:
+                return body, None
+
+    async def _push_chunk(self, batch_id: str, platform: str, chunk: Dict[str, Any], max_retries: int) -> Dict[str, Any]:
+        index, count, body = chunk["index"], chunk["count"], chunk["body"]
+        sent, encoding = self._compress(body)
+        headers = {
+            "Content-Type": "application/json",
+            "Idempotency-Key": f"{batch_id}:{index}",
+            "X-Batch-Id": batch_id,
+            "X-Chunk-Index": str(index),
+            "X-Chunk-Count": str(count),
+        }
+        if encoding:
+            headers["Content-Encoding"] = encoding
+
+        result: Dict[str, Any] = {"index": index, "items": chunk["items"], "bytes": len(body), "sent_bytes": len(sent)}
+        started = time.perf_counter()
+        dependency = get_dependency("parser")
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                async with dependency.guard():
+                    response = await get_async_client(self._url).post(
+                        self._url, content=sent, headers=headers, timeout=http_timeout(PARSER_TIMEOUT)
+                    )
+                dependency.observe(response.status_code)
+                if response.status_code not in RETRYABLE_STATUS or attempt > max_retries:
+                    response.raise_for_status()
+                    result.update(status="ok", status_code=response.status_code, response=_json_or_text(response))
+                    break
+                error = f"HTTP {response.status_code}"
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                result.update(status="failed", status_code=status, error=str(e), retryable=status in RETRYABLE_STATUS)
+                break
+            except DependencyUnavailableError as e:
+                result.update(status="failed", error=e.message, retryable=True)
+                break
+            except httpx.HTTPError as e:
+                error = str(e) or e.__class__.__name__
+                if attempt > max_retries:
+                    result.update(status="failed", error=error, retryable=True)
+                    break
+
+            delay = random.uniform(0, min(RATE_LIMIT_BACKOFF_MAX, RATE_LIMIT_BACKOFF_BASE * (2 ** (attempt - 1))))
+            RETRIES.labels(platform, "parser").inc()
+            logger.warning("Chunk push failed, retrying", extra={"batch_id": batch_id, "chunk": index + 1, "count": count,
+                                                                 "error": error, "delay": round(delay, 2)})
+            await asyncio.sleep(delay)
+
+        result.update(attempts=attempt, seconds=round(time.perf_counter() - started, 3))
+        PUSH_CHUNKS.labels(platform, result["status"]).inc()
+        if result["status"] == "ok":
+            PUSHED_BYTES.labels(platform, "raw").inc(len(body))
+            PUSHED_BYTES.labels(platform, "sent").inc(len(sent))
+        return result
+
+
+def _json_or_text(response: httpx.Response) -> Any:
+    try:
+        return response.json()
+    except ValueError:
+        return response.text
+
+
+parser_client = ParserClient(
+    url=PARSER_URL,
+    max_chunk_bytes=PARSER_MAX_CHUNK_BYTES,
+    compression=PARSER_COMPRESSION,
+    max_retries=PARSER_MAX_RETRIES,
+    outbox_enabled=OUTBOX_ENABLED,
+)
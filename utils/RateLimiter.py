@@ -0,0 +1,311 @@
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+import json
+import random
+import time
+import httpx
+from config.Config import (
+    RATE_LIMITS,
+    RATE_LIMIT_MAX_RETRIES,
+    RATE_LIMIT_BACKOFF_BASE,
+    RATE_LIMIT_BACKOFF_MAX,
+    RATE_LIMIT_MAX_WAIT,
+    SERVER_WORKERS,
+)
+from exceptions.exceptions import DependencyUnavailableError
+from .CircuitBreaker import get_dependency
+from .HttpClient import request as http_request
+from .Logging import get_logger
+from .Metrics import REJECTED, RETRIES, THROTTLED
+
+# Graph API error codes that mean "throttled" rather than "bad request".
+GRAPH_APP_THROTTLE_CODES = {4}
+GRAPH_USER_THROTTLE_CODES = {17, 32, 613} | set(range(80001, 80015))
+
+# Above this usage percentage (X-App-Usage / X-Business-Use-Case-Usage) the bucket slows down linearly.
+USAGE_SLOWDOWN_PCT = 75.0
+MIN_RATE_FRACTION = 0.05
+
+logger = get_logger("RateLimiter")
+
+
+# ---------- Token Bucket ----------
+class TokenBucket:
+    """
+    Token bucket in GCRA form: each acquire reserves the next free slot and sleeps until it.
+    Reservation happens without awaiting, so it is safe across coroutines and event loops.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.configured_rate = rate
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tat = 0.0  # theoretical arrival time of the next request
+        self._paused_until = 0.0
+
+    async def acquire(self, cost: int = 1) -> None:
+        wait = self._reserve(time.monotonic(), cost)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def paused_for(self) -> float:
+        """Seconds left in the current pause (0 when not paused)."""
+        return max(0.0, self._paused_until - time.monotonic())
+
+    def scale(self, fraction: float) -> None:
+        """Runs the bucket at `fraction` of its configured rate (1.0 restores it)."""
+        self.rate = self.configured_rate * min(1.0, max(fraction, MIN_RATE_FRACTION))
+
+    def _reserve(self, now: float, cost: int = 1) -> float:
+        # A request of `cost` tokens moves the TAT by cost intervals and may start once that new TAT
+        # is within `burst` intervals of now; a cost above the burst simply waits for the excess.
+        interval = 1.0 / self.rate
+        self._tat = max(self._tat, now, self._paused_until) + cost * interval
+        allowed_at = max(self._tat - self.burst * interval, self._paused_until)
+        return max(0.0, allowed_at - now)
+
+
+# ---------- Rate Limiter ----------
+class RateLimiter:
+    """
+    Per-platform, per-app and per-user token buckets shared by every scrapper in the process.
+    Buckets adapt to the quota headers each platform returns; throttled and 5xx responses are
+    retried with exponential backoff and full jitter.
+
+    Buckets are per process: with several server workers each one gets `share` of the platform
+    and app limits (SHARED_SCOPES), so together they stay within the configured rates. Per-user
+    limits are not divided: an account is scraped by one job, in one worker, at a time, so that
+    worker gets the user's whole quota.
+    """
+
+    MAX_BUCKETS = 10_000
+    SHARED_SCOPES = ("platform", "app")
+
+    def __init__(self, limits: Dict[str, Dict[str, Tuple[float, int]]], share: float = 1.0):
+        self._limits = {
+            platform: {scope: self._scaled(scope, rate, burst, share) for scope, (rate, burst) in scopes.items()}
+            for platform, scopes in limits.items()
+        }
+        self._buckets: "OrderedDict[Tuple[str, str, str], TokenBucket]" = OrderedDict()
+
+    async def request(self, platform: str, method: str, url: str, app_key: Optional[str] = None,
+                      user_key: Optional[str] = None, cost: int = 1, **kwargs) -> httpx.Response:
+        """
+        Sends a request through the platform's buckets. Returns the final response, which may
+        still be a 429/5xx once retries are exhausted; callers keep their raise_for_status().
+        `cost` is the number of API calls the request counts as (e.g. the size of a Graph batch).
+
+        Raises DependencyUnavailableError without calling out while the platform's circuit breaker is open,
+        or while one of its buckets is paused for longer than RATE_LIMIT_MAX_WAIT (e.g. a quota that only
+        regains access in an hour): that wait would otherwise hold a job worker for the whole pause.
+        """
+        buckets = self._buckets_for(platform, app_key, user_key)
+        dependency = get_dependency(platform)
+        attempt = 0
+        while True:
+            self._check_paused(platform, buckets)
+            for bucket in buckets.values():
+                await bucket.acquire(cost)
+
+            try:
+                async with dependency.guard():
+                    response = await http_request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if attempt >= RATE_LIMIT_MAX_RETRIES:
+                    raise
+                delay = self._backoff(attempt)
+                RETRIES.labels(platform, "transport").inc()
+                logger.warning("Transport error, retrying", extra={"platform": platform, "error": str(e),
+                                                                   "delay": round(delay, 2)})
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            dependency.observe(response.status_code)
+            self._observe_usage(platform, buckets, response)
+            throttle_wait = self._throttle_wait(platform, buckets, response, attempt)
+            if throttle_wait is not None:
+                THROTTLED.labels(platform, "429" if response.status_code == 429 else "graph").inc()
+
+            if throttle_wait is None and response.status_code < 500:
+                return response
+            if attempt >= RATE_LIMIT_MAX_RETRIES:
+                return response
+
+            if throttle_wait is not None:
+                if throttle_wait > RATE_LIMIT_MAX_WAIT:
+                    logger.warning("Throttled beyond the maximum wait, giving up",
+                                   extra={"platform": platform, "wait": round(throttle_wait, 1)})
+                    return response
+                RETRIES.labels(platform, "throttle").inc()
+                logger.info("Throttled, pausing", extra={"platform": platform, "wait": round(throttle_wait, 1)})
+            else:
+                delay = self._backoff(attempt)
+                RETRIES.labels(platform, "5xx").inc()
+                logger.warning("Server error, retrying", extra={"platform": platform, "status": response.status_code,
+                                                                "delay": round(delay, 2)})
+                await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _check_paused(platform: str, buckets: Dict[str, TokenBucket]) -> None:
+        for scope, bucket in buckets.items():
+            paused_for = bucket.paused_for()
+            if paused_for > RATE_LIMIT_MAX_WAIT:
+                REJECTED.labels(platform, "rate_limit").inc()
+                raise DependencyUnavailableError(
+                    f"{platform} {scope} rate limit exhausted (retry in {paused_for:.0f}s)", retry_after=paused_for
+                )
+
+    def max_cost(self, platform: str, app_key: Optional[str] = None, user_key: Optional[str] = None) -> int:
+        """The largest cost one request can have without waiting on a full bucket (the smallest burst)."""
+        buckets = self._buckets_for(platform, app_key, user_key)
+        return min((bucket.burst for bucket in buckets.values()), default=1_000_000)
+
+    @classmethod
+    def _scaled(cls, scope: str, rate: float, burst: int, share: float) -> Tuple[float, int]:
+        if scope not in cls.SHARED_SCOPES:
+            return rate, burst
+        return rate * share, max(1, int(burst * share))
+
+    # ---------- Bucket Registry ----------
+    def _buckets_for(self, platform: str, app_key: Optional[str], user_key: Optional[str]) -> Dict[str, TokenBucket]:
+        limits = self._limits.get(platform, {})
+        keys = {"platform": platform, "app": app_key, "user": user_key}
+        buckets = {}
+        for scope, key in keys.items():
+            if key is None or scope not in limits:
+                continue
+            buckets[scope] = self._bucket(platform, scope, key, *limits[scope])
+        return buckets
+
+    def _bucket(self, platform: str, scope: str, key: str, rate: float, burst: int) -> TokenBucket:
+        bucket_key = (platform, scope, key)
+        bucket = self._buckets.get(bucket_key)
+        if bucket is None:
+            bucket = TokenBucket(rate, burst)
+            self._buckets[bucket_key] = bucket
+            if len(self._buckets) > self.MAX_BUCKETS:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(bucket_key)
+        return bucket
+
+    # ---------- Adaptive Pacing ----------
+    def _observe_usage(self, platform: str, buckets: Dict[str, TokenBucket], response: httpx.Response) -> None:
+        headers = response.headers
+
+        # X: the remaining quota is spread evenly until the window resets.
+        remaining, reset = headers.get("x-rate-limit-remaining"), headers.get("x-rate-limit-reset")
+        if remaining is not None and reset is not None and "user" in buckets:
+            try:
+                remaining_calls, seconds_left = int(remaining), float(reset) - time.time()
+            except ValueError:
+                remaining_calls, seconds_left = None, 0
+            if remaining_calls is not None and seconds_left > 0:
+                bucket = buckets["user"]
+                if remaining_calls <= 0:
+                    bucket.pause(seconds_left)
+                else:
+                    bucket.scale(remaining_calls / seconds_left / bucket.configured_rate)
+
+        # Graph: usage headers are percentages of the app / business use-case quota.
+        app_usage = _json_header(headers.get("x-app-usage"))
+        if isinstance(app_usage, dict) and "app" in buckets:
+            self._apply_usage_pct(buckets["app"], _max_pct(app_usage))
+
+        buc_usage = _json_header(headers.get("x-business-use-case-usage"))
+        if isinstance(buc_usage, dict) and "user" in buckets:
+            entries = [entry for values in buc_usage.values() if isinstance(values, list) for entry in values]
+            if entries:
+                self._apply_usage_pct(buckets["user"], max(_max_pct(entry) for entry in entries))
+                regain_minutes = max(float(entry.get("estimated_time_to_regain_access") or 0) for entry in entries)
+                if regain_minutes > 0:
+                    buckets["user"].pause(regain_minutes * 60)
+
+    @staticmethod
+    def _apply_usage_pct(bucket: TokenBucket, pct: float) -> None:
+        if pct >= 100:
+            bucket.pause(RATE_LIMIT_BACKOFF_MAX)
+        if pct > USAGE_SLOWDOWN_PCT:
+            bucket.scale((100.0 - pct) / (100.0 - USAGE_SLOWDOWN_PCT))
+        else:
+            bucket.scale(1.0)
+
+    def _throttle_wait(self, platform: str, buckets: Dict[str, TokenBucket], response: httpx.Response,
+                       attempt: int) -> Optional[float]:
+        """Returns the pause applied when the response is a throttle, None otherwise."""
+        targets: List[TokenBucket] = []
+        wait: Optional[float] = None
+
+        if response.status_code == 429:
+            targets = [buckets.get("user") or buckets.get("app") or buckets.get("platform")]
+            wait = _retry_after(response.headers)
+        elif response.status_code >= 400 and platform == "facebook":
+            code = _graph_error_code(response)
+            if code in GRAPH_APP_THROTTLE_CODES:
+                targets = [buckets.get("app") or buckets.get("platform")]
+            elif code in GRAPH_USER_THROTTLE_CODES:
+                targets = [buckets.get("user") or buckets.get("platform")]
+
+        targets = [bucket for bucket in targets if bucket is not None]
+        if not targets:
+            return None
+
+        if wait is None:
+            # No server hint: never retry a throttle sooner than the base backoff.
+            wait = max(RATE_LIMIT_BACKOFF_BASE, self._backoff(attempt))
+        for bucket in targets:
+            bucket.pause(wait)
+        return wait
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(RATE_LIMIT_BACKOFF_MAX, RATE_LIMIT_BACKOFF_BASE * (2 ** attempt)))
+
+
+# ---------- Header Helpers ----------
+def _json_header(value: Optional[str]) -> Any:
+    if not value:
+        return None
+    try:
+        return json.loads(value)
+    except ValueError:
+        return None
+
+
+def _max_pct(usage: Dict[str, Any]) -> float:
+    values = [usage.get(key) for key in ("call_count", "total_cputime", "total_time")]
+    return max((float(v) for v in values if isinstance(v, (int, float))), default=0.0)
+
+
+def _retry_after(headers: httpx.Headers) -> Optional[float]:
+    reset = headers.get("x-rate-limit-reset")
+    if reset is not None:
+        try:
+            return max(0.0, float(reset) - time.time())
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if retry_after is not None:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+    return None
+
+
+def _graph_error_code(response: httpx.Response) -> Optional[int]:
+    try:
+        error = response.json().get("error", {})
+        return int(error.get("code"))
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+rate_limiter = RateLimiter(RATE_LIMITS, share=1.0 / SERVER_WORKERS)
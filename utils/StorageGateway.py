@@ -1,6 +1,132 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import os
+import sqlite3
+import threading
+import time
+from config.Config import OUTBOX_DB_PATH
 
 # ---------- Storage Gateway ----------
 class StorageGateway:
-    def store(self, normalized_data: List[Dict[str, Any]]) -> None:
-        print(f"[StorageGateway] Storing data: {normalized_data}")
\ No newline at end of file
+    """
+    Durable outbox for parser pushes, backed by SQLite in WAL mode.
+
+    Every chunk is written here before it is sent and deleted once the parser acknowledges it,
+    so a parser outage never loses data that was already fetched. `next_attempt_at` doubles as a
+    lease: a row is only handed to the drainer once nobody is sending it.
+    """
+
+    NEVER = 1e18  # next_attempt_at of chunks the parser rejected permanently
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " batch_id TEXT NOT NULL,"
+            " chunk_index INTEGER NOT NULL,"
+            " chunk_count INTEGER NOT NULL,"
+            " platform TEXT NOT NULL,"
+            " items INTEGER NOT NULL,"
+            " body BLOB NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " next_attempt_at REAL NOT NULL,"
+            " last_error TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS outbox_due ON outbox (next_attempt_at)")
+        self._conn.commit()
+
+    def store(self, batch_id: str, platform: str, chunks: List[Dict[str, Any]], lease: float) -> List[int]:
+        """
+        Appends the chunks of one batch (`index`, `count`, `items`, `body`) and returns their row ids.
+        The rows stay leased to the caller for `lease` seconds.
+        """
+        now = time.time()
+        ids = []
+        with self._lock:
+            for chunk in chunks:
+                cursor = self._conn.execute(
+                    "INSERT INTO outbox (batch_id, chunk_index, chunk_count, platform, items, body, created_at,"
+                    " next_attempt_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (batch_id, chunk["index"], chunk["count"], platform, chunk["items"], chunk["body"], now, now + lease),
+                )
+                ids.append(cursor.lastrowid)
+            self._conn.commit()
+        return ids
+
+    def claim_due(self, limit: int, lease: float) -> List[Dict[str, Any]]:
+        """Leases up to `limit` rows whose next attempt is due, oldest first."""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, batch_id, chunk_index, chunk_count, platform, items, body, attempts FROM outbox"
+                " WHERE next_attempt_at <= ? ORDER BY id LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE outbox SET next_attempt_at = ? WHERE id = ?", [(now + lease, row[0]) for row in rows]
+            )
+            self._conn.commit()
+        keys = ("id", "batch_id", "index", "count", "platform", "items", "body", "attempts")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def ack(self, row_id: int) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM outbox WHERE id = ?", (row_id,))
+            self._conn.commit()
+
+    def retry_later(self, row_id: int, delay: float, error: Optional[str]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET attempts = attempts + 1, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (time.time() + delay, error, row_id),
+            )
+            self._conn.commit()
+
+    def bury(self, row_id: int, error: Optional[str]) -> None:
+        """Parks a chunk the parser rejected permanently; it is kept for inspection but never retried."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET attempts = attempts + 1, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (self.NEVER, error, row_id),
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending, items, oldest = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(items), 0), MIN(created_at) FROM outbox WHERE next_attempt_at < ?",
+                (self.NEVER,),
+            ).fetchone()
+            dead = self._conn.execute("SELECT COUNT(*) FROM outbox WHERE next_attempt_at >= ?", (self.NEVER,)).fetchone()[0]
+        return {"pending_chunks": pending, "pending_items": items, "dead_chunks": dead,
+                "oldest_age_seconds": round(time.time() - oldest, 1) if oldest else 0}
+
+    def compact(self) -> None:
+        """Returns pages freed by acked rows to the filesystem and truncates the WAL."""
+        with self._lock:
+            self._conn.execute("PRAGMA incremental_vacuum")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_gateway: Optional[StorageGateway] = None
+
+
+def get_storage_gateway() -> StorageGateway:
+    """Process-wide outbox at OUTBOX_DB_PATH, opened on first use."""
+    global _gateway
+    if _gateway is None:
+        _gateway = StorageGateway(OUTBOX_DB_PATH)
+    return _gateway
@@ -0,0 +1,148 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Any, Awaitable, Callable, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import time
+from config.Config import AUTH_CACHE_BACKEND, AUTH_CACHE_TTL, AUTH_CACHE_MAX_SIZE, REDIS_URL
+
+# Entries whose social token expires within this many seconds are not served from cache.
+EXPIRY_MARGIN = 30
+
+
+# ----- Cache Backend Abstraction -----
+class UserDetailsCacheBackend(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Dict[str, Any], ttl: float) -> None: ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+
+# ---------- In-Memory Backend ----------
+class InMemoryUserDetailsCacheBackend(UserDetailsCacheBackend):
+    """TTL + LRU cache local to this process."""
+
+    def __init__(self, max_size: int):
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._max_size = max_size
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+# ---------- Redis Backend ----------
+class RedisUserDetailsCacheBackend(UserDetailsCacheBackend):
+    """Cache shared by several API replicas. Requires the optional `redis` package."""
+
+    KEY = "scrapper:user:{}"
+
+    def __init__(self, url: str):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError:
+            raise ImportError("AUTH_CACHE_BACKEND=redis requires the 'redis' package (pip install redis)")
+
+        self._redis = redis_asyncio.from_url(url, decode_responses=True)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = await self._redis.get(self.KEY.format(key))
+        return json.loads(raw) if raw else None
+
+    async def set(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        await self._redis.set(self.KEY.format(key), json.dumps(value), px=int(ttl * 1000))
+
+    async def delete(self, key: str) -> None:
+        await self._redis.delete(self.KEY.format(key))
+
+
+# ---------- User Details Cache ----------
+class UserDetailsCache:
+    """
+    Caches authenticator lookups by app token. Concurrent misses for the same token share a
+    single upstream call. Keys are token hashes, so raw app tokens never reach the backend.
+    """
+
+    def __init__(self, backend: UserDetailsCacheBackend, ttl: float):
+        self._backend = backend
+        self._ttl = ttl
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def get_or_fetch(self, app_token: str,
+                           fetch: Callable[[str], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        key = self._key(app_token)
+        cached = await self._backend.get(key)
+        if cached is not None and not self._expiring(cached):
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._load(key, app_token, fetch))
+            self._inflight[key] = task
+        # Shielded so one cancelled waiter does not cancel the lookup for everyone else.
+        return await asyncio.shield(task)
+
+    async def invalidate(self, app_token: str) -> None:
+        await self._backend.delete(self._key(app_token))
+
+    async def _load(self, key: str, app_token: str,
+                    fetch: Callable[[str], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        try:
+            details = await fetch(app_token)
+            ttl = self._ttl_for(details)
+            if ttl > 0:
+                await self._backend.set(key, details, ttl)
+            return details
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    def _ttl_for(self, details: Dict[str, Any]) -> float:
+        """Never outlives the social token: the TTL is capped by its `expires_at` claim when present."""
+        expires_at = details.get("expires_at")
+        if not isinstance(expires_at, (int, float)):
+            return self._ttl
+        return min(self._ttl, expires_at - time.time() - EXPIRY_MARGIN)
+
+    @staticmethod
+    def _expiring(details: Dict[str, Any]) -> bool:
+        expires_at = details.get("expires_at")
+        return isinstance(expires_at, (int, float)) and expires_at - time.time() <= EXPIRY_MARGIN
+
+    @staticmethod
+    def _key(app_token: str) -> str:
+        return hashlib.sha256(app_token.encode()).hexdigest()
+
+
+def build_user_details_backend() -> UserDetailsCacheBackend:
+    match(AUTH_CACHE_BACKEND):
+        case "memory":
+            return InMemoryUserDetailsCacheBackend(max_size=AUTH_CACHE_MAX_SIZE)
+        case "redis":
+            return RedisUserDetailsCacheBackend(url=REDIS_URL)
+        case _:
+            raise ValueError(f"Unknown AUTH_CACHE_BACKEND: {AUTH_CACHE_BACKEND}")
+
+
+user_details_cache = UserDetailsCache(backend=build_user_details_backend(), ttl=AUTH_CACHE_TTL)
@@ -1,3 +1,13 @@
 from .Parser import Parser
-from .Normalizer import Normalizer
-from .StorageGateway import StorageGateway
\ No newline at end of file
+from .Normalizer import Normalizer, PostColumns, normalizer
+from .StorageGateway import StorageGateway, get_storage_gateway
+from .HttpClient import HttpClientManager, get_async_client, open_async_clients, close_async_clients, run_sync, http_timeout, ssl_context
+from .CheckpointStore import CheckpointStore, get_checkpoint_store
+from .RateLimiter import RateLimiter, TokenBucket, rate_limiter
+from .UserDetailsCache import UserDetailsCache, user_details_cache
+from .ParserClient import ParserClient, parser_client
+from .OutboxDrainer import OutboxDrainer
+from .DedupIndex import DedupIndex, get_dedup_index
+from .Logging import configure_logging, get_logger, correlation_id
+from .CircuitBreaker import CircuitBreaker, Bulkhead, Dependency, get_dependency, dependency_health
+from .LeaderLock import LeaderLock